@@ -16,7 +16,9 @@ def create_app(config_class=Config):
     app.config.from_object(config_class)
 
     # Initialize extensions
-    mongo.init_app(app)
+    from app.utils.metrics import MongoCommandMetrics, init_metrics
+    metrics_enabled = app.config.get('METRICS_ENABLED', True)
+    mongo.init_app(app, event_listeners=[MongoCommandMetrics()] if metrics_enabled else [])
     jwt.init_app(app)
     mail.init_app(app)
 
@@ -25,7 +27,8 @@ def create_app(config_class=Config):
         app,
         supports_credentials=True,  # allows cookies or headers with auth
         resources={r"/api/*": {"origins": "http://localhost:3000"}},
-         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        expose_headers=["X-Next-Cursor"]
     )
 
     # === Register Blueprints ===
@@ -43,6 +46,10 @@ def create_app(config_class=Config):
     app.register_blueprint(notifications_bp, url_prefix="/api/notifications")
     app.register_blueprint(admin_bp, url_prefix="/api/admin")
 
+    # === Metrics (Prometheus /metrics, Server-Timing header) ===
+    if metrics_enabled:
+        init_metrics(app)
+
     # === Health Check Route ===
     @app.route("/")
     def home():
@@ -1,6 +1,7 @@
 # backend/app/models/application.py
 from bson.objectid import ObjectId
 from app import mongo
+from app.models.daily_stats import DailyStats
 from datetime import datetime
 
 class Application:
@@ -12,6 +13,7 @@ class Application:
         data['status'] = 'Applied'  # Initial status
         
         result = cls.collection.insert_one(data)
+        DailyStats.increment({'applications': 1}, data['applied_at'])
         return str(result.inserted_id)
     
     @classmethod
@@ -26,6 +28,16 @@ class Application:
     def find_by_job(cls, job_id):
         return list(cls.collection.find({'job_id': job_id}).sort('applied_at', -1))
     
+    @classmethod
+    def find_job_ids_by_jobseeker(cls, jobseeker_id):
+        cursor = cls.collection.find({'jobseeker_id': jobseeker_id}, {'job_id': 1})
+        return {application['job_id'] for application in cursor}
+    
+    @classmethod
+    def find_jobseeker_ids_by_job(cls, job_id):
+        cursor = cls.collection.find({'job_id': job_id}, {'jobseeker_id': 1})
+        return {application['jobseeker_id'] for application in cursor}
+    
     @classmethod
     def update_status(cls, application_id, status, notes=None):
         update_data = {
@@ -0,0 +1,99 @@
+# backend/app/models/daily_stats.py
+from pymongo import UpdateOne
+from app import mongo
+from datetime import datetime
+
+class DailyStats:
+    """Pre-aggregated platform counters read by the admin analytics.
+
+    One `day` document per UTC day (`_id` is the date, e.g. 2024-05-01) holds
+    the users registered per role, jobs posted, applications submitted and
+    high-match applications of that day. One `skill` document per skill holds
+    the number of jobseekers currently listing it.
+    """
+    collection = mongo.db.daily_stats
+
+    DAY_COUNTERS = ('jobs', 'applications', 'high_match_applications')
+
+    @staticmethod
+    def day_key(moment):
+        return moment.strftime('%Y-%m-%d')
+
+    @staticmethod
+    def normalize_skill(skill):
+        return str(skill).strip().lower()
+
+    @classmethod
+    def increment(cls, counters, moment=None):
+        """Atomically add to the counters of a day, e.g. {'users.jobseeker': 1}."""
+        moment = moment or datetime.utcnow()
+        day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        cls.collection.update_one(
+            {'_id': cls.day_key(day)},
+            {'$inc': counters, '$setOnInsert': {'kind': 'day', 'date': day}},
+            upsert=True
+        )
+
+    @classmethod
+    def update_skills(cls, added=(), removed=()):
+        """Apply the skill changes of one jobseeker profile to the skill counters."""
+        added = {cls.normalize_skill(skill) for skill in added} - {''}
+        removed = {cls.normalize_skill(skill) for skill in removed} - {''}
+        operations = [
+            UpdateOne(
+                {'_id': f'skill:{skill}'},
+                {'$inc': {'count': delta}, '$setOnInsert': {'kind': 'skill', 'skill': skill}},
+                upsert=True
+            )
+            for skills, delta in ((added - removed, 1), (removed - added, -1))
+            for skill in skills
+        ]
+        if operations:
+            cls.collection.bulk_write(operations, ordered=False)
+
+    @classmethod
+    def find_days(cls, start_date, end_date=None):
+        """Day documents from the day of `start_date` on, oldest first."""
+        query = {'_id': {'$gte': cls.day_key(start_date)}, 'kind': 'day'}
+        if end_date:
+            query['_id']['$lte'] = cls.day_key(end_date)
+        return list(cls.collection.find(query).sort('_id', 1))
+
+    @classmethod
+    def top_skills(cls, limit=10):
+        cursor = (cls.collection.find({'kind': 'skill', 'count': {'$gt': 0}}, {'skill': 1, 'count': 1})
+                  .sort('count', -1)
+                  .limit(limit))
+        return [{'skill': doc['skill'], 'count': doc['count']} for doc in cursor]
+
+    @classmethod
+    def replace_days(cls, days):
+        """Overwrite the counters of whole days, as computed by a compaction run."""
+        operations = [
+            UpdateOne(
+                {'_id': cls.day_key(day['date'])},
+                {'$set': {**day, 'kind': 'day', 'compacted_at': datetime.utcnow()}},
+                upsert=True
+            )
+            for day in days
+        ]
+        if operations:
+            cls.collection.bulk_write(operations, ordered=False)
+
+    @classmethod
+    def replace_skills(cls, skill_counts):
+        """Overwrite all skill counters; skills no longer listed anywhere are removed."""
+        operations = [
+            UpdateOne(
+                {'_id': f'skill:{skill}'},
+                {'$set': {'kind': 'skill', 'skill': skill, 'count': count}},
+                upsert=True
+            )
+            for skill, count in skill_counts.items()
+        ]
+        if operations:
+            cls.collection.bulk_write(operations, ordered=False)
+        cls.collection.delete_many({
+            'kind': 'skill',
+            '_id': {'$nin': [f'skill:{skill}' for skill in skill_counts]}
+        })
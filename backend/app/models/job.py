@@ -1,6 +1,11 @@
 # backend/app/models/job.py
+import re
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from app import mongo
+from app.models.daily_stats import DailyStats
+from app.utils.job_requirements import DERIVED_SOURCE_FIELDS, DERIVED_VERSION, derive_job_requirements
+from app.utils.pagination import after_cursor, sort_spec
 from datetime import datetime
 
 class Job:
@@ -12,24 +17,48 @@ class Job:
         data['created_at'] = datetime.utcnow()
         data['updated_at'] = datetime.utcnow()
         data['active'] = True
+        data['derived'] = derive_job_requirements(data)
         
         result = cls.collection.insert_one(data)
+        DailyStats.increment({'jobs': 1}, data['created_at'])
         return str(result.inserted_id)
     
     @classmethod
     def find_by_id(cls, job_id):
         return cls.collection.find_one({'_id': ObjectId(job_id)})
     
+    @classmethod
+    def find_by_ids(cls, job_ids, active_only=True):
+        query = {'_id': {'$in': [ObjectId(job_id) for job_id in job_ids]}}
+        if active_only:
+            query['active'] = True
+        return list(cls.collection.find(query))
+    
+    @classmethod
+    def iter_by_ids(cls, job_ids, batch_size=100):
+        # Lazy cursor; documents are fetched from the server batch by batch
+        query = {'_id': {'$in': [ObjectId(job_id) for job_id in job_ids]}, 'active': True}
+        return cls.collection.find(query).batch_size(batch_size)
+    
+    @classmethod
+    def find_recent_ids(cls, limit, exclude_ids=None):
+        query = {'active': True}
+        if exclude_ids:
+            query['_id'] = {'$nin': [ObjectId(job_id) for job_id in exclude_ids]}
+        cursor = cls.collection.find(query, {'_id': 1}).sort('created_at', -1).limit(limit)
+        return [str(job['_id']) for job in cursor]
+    
     @classmethod
     def find_by_employer(cls, employer_id):
         return list(cls.collection.find({'employer_id': employer_id}))
     
-    @classmethod
-    def find_all(cls, filters=None, limit=20, skip=0):
+    @staticmethod
+    def filter_query(filters=None):
+        """Active-job query for the location / skills / remote listing filters"""
         query = {'active': True}
         if filters:
             if 'location' in filters:
-                query['location'] = {'$regex': filters['location'], '$options': 'i'}
+                query['location'] = {'$regex': re.escape(filters['location']), '$options': 'i'}
             if 'skills' in filters:
                 query['$or'] = [
                     {'required_skills': {'$in': filters['skills']}},
@@ -37,17 +66,64 @@ class Job:
                 ]
             if 'remote' in filters:
                 query['remote'] = filters['remote']
-        
-        return list(cls.collection.find(query).sort('created_at', -1).skip(skip).limit(limit))
+        return query
+    
+    @classmethod
+    def find_all(cls, filters=None, limit=20, skip=0, cursor=None):
+        query = after_cursor(cls.filter_query(filters), cursor, 'created_at')
+        return list(cls.collection.find(query).sort(sort_spec('created_at')).skip(skip).limit(limit))
     
     @classmethod
     def update(cls, job_id, data):
+        # Returns the fields whose value changed (always including updated_at)
+        data.pop('derived', None)  # only ever written here
         data['updated_at'] = datetime.utcnow()
-        result = cls.collection.update_one(
-            {'_id': ObjectId(job_id)},
-            {'$set': data}
-        )
-        return result.modified_count > 0
+        while True:
+            query = {'_id': ObjectId(job_id)}
+            if set(data) & set(DERIVED_SOURCE_FIELDS):
+                # Requirements are derived from the updated document; the write
+                # only applies if no one changed a source field in between
+                current = cls.collection.find_one(query, {field: 1 for field in DERIVED_SOURCE_FIELDS})
+                if current is None:
+                    return []
+                sources = {field: current.get(field) for field in DERIVED_SOURCE_FIELDS}
+                query.update(sources)
+                data['derived'] = derive_job_requirements({**sources, **data})
+            
+            previous = cls.collection.find_one_and_update(
+                query,
+                {'$set': data},
+                projection={field: 1 for field in data},
+                return_document=ReturnDocument.BEFORE
+            )
+            if previous is not None:
+                return [field for field in data if previous.get(field) != data[field]]
+            if 'derived' not in data:
+                return []
+    
+    @classmethod
+    def find_stale_requirements(cls, batch_size=500):
+        # Jobs without derived requirements of the current version
+        query = {'derived.version': {'$ne': DERIVED_VERSION}}
+        return cls.collection.find(query, {field: 1 for field in DERIVED_SOURCE_FIELDS}).batch_size(batch_size)
+    
+    @classmethod
+    def backfill_requirements(cls, jobs):
+        """Store derived requirements on the given jobs; returns the number written.
+        
+        A job whose source fields changed since it was read is skipped; its
+        update already stored fresh requirements.
+        """
+        operations = [
+            UpdateOne(
+                {'_id': job['_id'], **{field: job.get(field) for field in DERIVED_SOURCE_FIELDS}},
+                {'$set': {'derived': derive_job_requirements(job)}}
+            )
+            for job in jobs
+        ]
+        if not operations:
+            return 0
+        return cls.collection.bulk_write(operations, ordered=False).modified_count
     
     @classmethod
     def delete(cls, job_id):
@@ -58,15 +134,25 @@ class Job:
         )
         return result.modified_count > 0
     
+    @staticmethod
+    def text_search_terms(query):
+        # Quotes and a leading '-' are $text operators (phrase / negation);
+        # user input is always searched as plain terms
+        terms = re.sub(r'["\\]', ' ', query).split()
+        return ' '.join(term.lstrip('-') for term in terms if term.lstrip('-'))
+    
     @classmethod
-    def search(cls, query, limit=20, skip=0):
-        search_query = {
-            'active': True,
-            '$or': [
-                {'title': {'$regex': query, '$options': 'i'}},
-                {'description': {'$regex': query, '$options': 'i'}},
-                {'required_skills': {'$in': [query]}}
-            ]
-        }
+    def search(cls, query, limit=20, skip=0, filters=None):
+        """Full-text search over the jobs text index, most relevant first"""
+        terms = cls.text_search_terms(query)
+        if not terms:
+            return []
+        
+        search_query = cls.filter_query(filters)
+        search_query['$text'] = {'$search': terms}
         
-        return list(cls.collection.find(search_query).sort('created_at', -1).skip(skip).limit(limit))
\ No newline at end of file
+        cursor = (cls.collection.find(search_query, {'relevance': {'$meta': 'textScore'}})
+                  .sort([('relevance', {'$meta': 'textScore'}), ('created_at', -1)])
+                  .skip(skip)
+                  .limit(limit))
+        return list(cursor)
\ No newline at end of file
@@ -1,6 +1,9 @@
 # backend/app/models/match.py
 from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from app import mongo
+from app.utils.pagination import after_cursor, sort_spec
 from datetime import datetime
 
 class Match:
@@ -23,19 +26,32 @@ class Match:
         })
     
     @classmethod
-    def find_by_user(cls, user_id, limit=20, skip=0):
-        return list(cls.collection.find({'user_id': user_id})
-                   .sort('overall_score', -1)
+    def find_by_user(cls, user_id, limit=20, skip=0, cursor=None):
+        return list(cls.collection.find(after_cursor({'user_id': user_id}, cursor, 'overall_score'))
+                   .sort(sort_spec('overall_score'))
                    .skip(skip)
                    .limit(limit))
     
     @classmethod
-    def find_by_job(cls, job_id, limit=20, skip=0):
-        return list(cls.collection.find({'job_id': job_id})
-                   .sort('overall_score', -1)
+    def find_by_job(cls, job_id, limit=20, skip=0, cursor=None):
+        return list(cls.collection.find(after_cursor({'job_id': job_id}, cursor, 'overall_score'))
+                   .sort(sort_spec('overall_score'))
                    .skip(skip)
                    .limit(limit))
     
+    @classmethod
+    def find_all_by_user(cls, user_id):
+        return list(cls.collection.find({'user_id': user_id}))
+    
+    @classmethod
+    def find_all_by_job(cls, job_id):
+        return list(cls.collection.find({'job_id': job_id}))
+    
+    @classmethod
+    def find_by_job_and_users(cls, job_id, user_ids):
+        cursor = cls.collection.find({'job_id': job_id, 'user_id': {'$in': list(user_ids)}})
+        return {match['user_id']: match for match in cursor}
+    
     @classmethod
     def update(cls, match_id, data):
         data['updated_at'] = datetime.utcnow()
@@ -45,6 +61,84 @@ class Match:
         )
         return result.modified_count > 0
     
+    @classmethod
+    def bulk_upsert(cls, matches):
+        """Persist many match results with a single unordered bulk_write.
+        
+        Each item needs user_id, job_id, overall_score and breakdown. Pairs none
+        of whose fields (raw `scores` included) changed are not written at all.
+        Returns a mapping of (user_id, job_id) to match id and the write counts.
+        """
+        counts = {'inserted': 0, 'modified': 0, 'unchanged': 0}
+        if not matches:
+            return {}, counts
+        
+        # Load the stored version of every pair with one query
+        existing = {}
+        fields = {field for match in matches for field in match}
+        cursor = cls.collection.find(
+            {
+                'user_id': {'$in': list({match['user_id'] for match in matches})},
+                'job_id': {'$in': list({match['job_id'] for match in matches})}
+            },
+            {field: 1 for field in fields}
+        )
+        for doc in cursor:
+            existing[(doc['user_id'], doc['job_id'])] = doc
+        
+        match_ids = {key: str(doc['_id']) for key, doc in existing.items()}
+        keys, operations = [], []
+        now = datetime.utcnow()
+        for match in matches:
+            key = (match['user_id'], match['job_id'])
+            stored = existing.get(key)
+            update = {key_name: value for key_name, value in match.items()
+                      if key_name not in ('user_id', 'job_id')}
+            if stored and all(stored.get(field) == value for field, value in update.items()):
+                counts['unchanged'] += 1
+                continue
+            
+            update['updated_at'] = now
+            keys.append(key)
+            operations.append(UpdateOne(
+                {'user_id': match['user_id'], 'job_id': match['job_id']},
+                {'$set': update, '$setOnInsert': {'created_at': now}},
+                upsert=True
+            ))
+        
+        if not operations:
+            return match_ids, counts
+        
+        try:
+            result = cls.collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            # A concurrent upsert can win the race on the (user_id, job_id) unique
+            # index; replaying those operations turns them into plain updates
+            details = e.details
+            duplicates = [error['index'] for error in details['writeErrors'] if error['code'] == 11000]
+            if len(duplicates) != len(details['writeErrors']):
+                raise
+            retry = cls.collection.bulk_write([operations[index] for index in duplicates], ordered=False)
+            details['nMatched'] += retry.matched_count
+            details['nModified'] += retry.modified_count
+        
+        for upserted in details['upserted']:
+            match_ids[keys[upserted['index']]] = str(upserted['_id'])
+        
+        counts['inserted'] = len(details['upserted'])
+        counts['modified'] = details['nModified']
+        counts['unchanged'] += details['nMatched'] - details['nModified']
+        
+        # Pairs inserted concurrently and resolved by the duplicate-key replay
+        for key in keys:
+            if key not in match_ids:
+                doc = cls.collection.find_one({'user_id': key[0], 'job_id': key[1]}, {'_id': 1})
+                if doc:
+                    match_ids[key] = str(doc['_id'])
+        
+        return match_ids, counts
+    
     @classmethod
     def delete(cls, match_id):
         result = cls.collection.delete_one({'_id': ObjectId(match_id)})
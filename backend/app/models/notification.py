@@ -1,49 +1,172 @@
 # backend/app/models/notification.py
+from collections import Counter
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from app import mongo
+from app.utils.pagination import after_cursor, sort_spec
+from app.services.notification_bus import NotificationBus
 from datetime import datetime
 
 class Notification:
     collection = mongo.db.notifications
+    # One {_id: recipient_id, unread: n} document per user, kept in step with
+    # every write below so the unread badge is a single key lookup. A missing
+    # counter is seeded from a recount before the write that would change it
+    counters = mongo.db.notification_counters
     
     @classmethod
     def create(cls, data):
-        data['created_at'] = datetime.utcnow()
+        return cls.create_many([data])[0]
+    
+    @classmethod
+    def create_many(cls, notifications):
+        """Insert a batch of notifications (e.g. a fan-out event) and bump the unread counters"""
+        if not notifications:
+            return []
+        
+        now = datetime.utcnow()
+        for data in notifications:
+            data['created_at'] = now
+            data.setdefault('read', False)
+        
+        unread = Counter(data['recipient_id'] for data in notifications if not data['read'])
+        cls._seed_counters(unread)
+        
+        result = cls.collection.insert_many(notifications, ordered=False)
+        
+        cls._add_unread(unread)
         
-        result = cls.collection.insert_one(data)
-        return str(result.inserted_id)
+        # Push to recipients connected to the notification stream
+        for data in notifications:
+            NotificationBus.publish(data['recipient_id'], dict(data))
+        
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
+    @classmethod
+    def _seed_counters(cls, recipient_ids):
+        # The recount happens before the caller's write: a concurrent writer
+        # seeds (or finds) the counter before its own write, so either its
+        # change is counted here or its increment lands on the seeded value
+        recipient_ids = list(recipient_ids)
+        if not recipient_ids:
+            return
+        seeded = {counter['_id'] for counter in cls.counters.find({'_id': {'$in': recipient_ids}}, {'_id': 1})}
+        missing = [recipient_id for recipient_id in recipient_ids if recipient_id not in seeded]
+        if not missing:
+            return
+        
+        pipeline = [
+            {'$match': {'recipient_id': {'$in': missing}, 'read': False}},
+            {'$group': {'_id': '$recipient_id', 'unread': {'$sum': 1}}}
+        ]
+        actual = {result['_id']: result['unread'] for result in cls.collection.aggregate(pipeline)}
+        now = datetime.utcnow()
+        cls.counters.bulk_write([
+            UpdateOne(
+                {'_id': recipient_id},
+                {'$setOnInsert': {'unread': actual.get(recipient_id, 0), 'updated_at': now}},
+                upsert=True
+            )
+            for recipient_id in missing
+        ], ordered=False)
+    
+    @classmethod
+    def _add_unread(cls, deltas):
+        operations = [
+            UpdateOne(
+                {'_id': recipient_id},
+                {'$inc': {'unread': delta}, '$set': {'updated_at': datetime.utcnow()}},
+                upsert=True
+            )
+            for recipient_id, delta in deltas.items() if delta
+        ]
+        if operations:
+            cls.counters.bulk_write(operations, ordered=False)
     
     @classmethod
     def find_by_id(cls, notification_id):
         return cls.collection.find_one({'_id': ObjectId(notification_id)})
     
     @classmethod
-    def find_by_recipient(cls, recipient_id, limit=20, skip=0, unread_only=False):
+    def find_by_recipient(cls, recipient_id, limit=20, skip=0, unread_only=False, cursor=None):
         query = {'recipient_id': recipient_id}
         if unread_only:
             query['read'] = False
         
-        return list(cls.collection.find(query)
-                   .sort('created_at', -1)
+        return list(cls.collection.find(after_cursor(query, cursor, 'created_at'))
+                   .sort(sort_spec('created_at'))
                    .skip(skip)
                    .limit(limit))
     
+    @classmethod
+    def find_after(cls, recipient_id, last_id, limit=100):
+        """Notifications created after `last_id`, oldest first (stream resume)"""
+        return list(cls.collection.find({'recipient_id': recipient_id, '_id': {'$gt': ObjectId(last_id)}})
+                   .sort('_id', 1)
+                   .limit(limit))
+    
     @classmethod
     def mark_as_read(cls, notification_id):
-        result = cls.collection.update_one(
+        notification = cls.collection.find_one({'_id': ObjectId(notification_id)}, {'recipient_id': 1})
+        if notification is None:
+            return False
+        cls._seed_counters([notification['recipient_id']])
+        
+        previous = cls.collection.find_one_and_update(
             {'_id': ObjectId(notification_id)},
-            {'$set': {'read': True, 'read_at': datetime.utcnow()}}
+            {'$set': {'read': True, 'read_at': datetime.utcnow()}},
+            projection={'recipient_id': 1, 'read': 1},
+            return_document=ReturnDocument.BEFORE
         )
-        return result.modified_count > 0
+        if previous is None:
+            return False
+        
+        # Only an unread -> read transition changes the counter
+        if not previous.get('read'):
+            cls._add_unread({previous['recipient_id']: -1})
+        return True
     
     @classmethod
     def mark_all_as_read(cls, recipient_id):
+        cls._seed_counters([recipient_id])
         result = cls.collection.update_many(
             {'recipient_id': recipient_id, 'read': False},
             {'$set': {'read': True, 'read_at': datetime.utcnow()}}
         )
+        cls._add_unread({recipient_id: -result.modified_count})
         return result.modified_count
     
     @classmethod
     def get_unread_count(cls, recipient_id):
-        return cls.collection.count_documents({'recipient_id': recipient_id, 'read': False})
\ No newline at end of file
+        counter = cls.counters.find_one({'_id': recipient_id}, {'unread': 1})
+        if counter is None:
+            # First lookup for this user: seed the counter from the notifications
+            cls._seed_counters([recipient_id])
+            counter = cls.counters.find_one({'_id': recipient_id}, {'unread': 1})
+        return max(0, counter['unread'])
+    
+    @classmethod
+    def reconcile_counters(cls):
+        """Recount every user's unread notifications and repair drifted counters.
+
+        Returns the number of counters that were corrected.
+        """
+        pipeline = [
+            {'$match': {'read': False}},
+            {'$group': {'_id': '$recipient_id', 'unread': {'$sum': 1}}}
+        ]
+        actual = {result['_id']: result['unread'] for result in cls.collection.aggregate(pipeline)}
+        stored = {counter['_id']: counter['unread'] for counter in cls.counters.find({}, {'unread': 1})}
+        
+        operations = [
+            UpdateOne(
+                {'_id': recipient_id},
+                {'$set': {'unread': actual.get(recipient_id, 0), 'updated_at': datetime.utcnow()}},
+                upsert=True
+            )
+            for recipient_id in set(actual) | set(stored)
+            if actual.get(recipient_id, 0) != stored.get(recipient_id)
+        ]
+        if operations:
+            cls.counters.bulk_write(operations, ordered=False)
+        return len(operations)
\ No newline at end of file
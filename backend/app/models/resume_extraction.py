@@ -0,0 +1,22 @@
+# backend/app/models/resume_extraction.py
+from app import mongo
+from datetime import datetime
+
+class ResumeExtraction:
+    """Text and skills parsed from a resume, keyed by the file's SHA-256.
+
+    Re-uploads of the same file (by anyone) reuse the stored result. Results
+    of an older parser version are ignored and extracted again.
+    """
+    collection = mongo.db.resume_extractions
+
+    @classmethod
+    def find(cls, sha256, version):
+        return cls.collection.find_one({'_id': sha256, 'version': version})
+
+    @classmethod
+    def save(cls, sha256, version, text, skills, error=None):
+        data = {'version': version, 'text': text, 'skills': skills,
+                'error': error, 'extracted_at': datetime.utcnow()}
+        cls.collection.update_one({'_id': sha256}, {'$set': data}, upsert=True)
+        return {'_id': sha256, **data}
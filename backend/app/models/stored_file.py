@@ -0,0 +1,82 @@
+# backend/app/models/stored_file.py
+import time
+import uuid
+from pymongo import ReturnDocument
+from app import mongo
+from datetime import datetime
+
+class StoredFile:
+    """Reference count and metadata of a content-addressed upload.
+
+    `_id` is the path relative to UPLOAD_FOLDER (e.g. resumes/ab/cd/<sha256>.pdf);
+    the file is removed from disk once the last reference is released. While
+    it is being removed the record carries a `deleting` mark, and a store of
+    the same content waits for it before putting the file back.
+    """
+    collection = mongo.db.stored_files
+
+    @classmethod
+    def add_reference(cls, path, metadata):
+        now = datetime.utcnow()
+        return cls.collection.find_one_and_update(
+            {'_id': path},
+            {'$inc': {'refcount': 1},
+             '$set': {'last_referenced_at': now},
+             '$setOnInsert': {**metadata, 'created_at': now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @classmethod
+    def retain(cls, path):
+        """Take one more reference on a stored file. False if it is not (or no longer) stored."""
+        result = cls.collection.update_one(
+            {'_id': path, 'refcount': {'$gt': 0}},
+            {'$inc': {'refcount': 1}, '$set': {'last_referenced_at': datetime.utcnow()}}
+        )
+        return result.matched_count == 1
+
+    @classmethod
+    def release(cls, path):
+        """Drop one reference.
+
+        Returns a deletion token when it was the last one: the caller removes
+        the file, then calls finish_delete with the token.
+        """
+        stored = cls.collection.find_one_and_update(
+            {'_id': path, 'refcount': {'$gt': 0}},
+            {'$inc': {'refcount': -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if not stored or stored['refcount'] > 0:
+            return None
+        # An upload of the same content in the meantime brings the count back up
+        token = uuid.uuid4().hex
+        result = cls.collection.update_one(
+            {'_id': path, 'refcount': 0, 'deleting': {'$exists': False}},
+            {'$set': {'deleting': token, 'deleting_at': datetime.utcnow()}}
+        )
+        return token if result.modified_count == 1 else None
+
+    @classmethod
+    def finish_delete(cls, path, token):
+        """Drop the record once the file is gone, unless the content was stored again."""
+        if cls.collection.delete_one({'_id': path, 'refcount': 0, 'deleting': token}).deleted_count:
+            return True
+        cls.collection.update_one({'_id': path, 'deleting': token}, {'$unset': {'deleting': '', 'deleting_at': ''}})
+        return False
+
+    @classmethod
+    def wait_until_deleted(cls, path, timeout=10, interval=0.05):
+        """Block while a concurrent delete of `path` is removing the file."""
+        deadline = time.monotonic() + timeout
+        while cls.collection.find_one({'_id': path, 'deleting': {'$exists': True}}, {'_id': 1}):
+            if time.monotonic() >= deadline:
+                # The deleting process died before finishing
+                cls.collection.update_one({'_id': path}, {'$unset': {'deleting': '', 'deleting_at': ''}})
+                return
+            time.sleep(interval)
+
+    @classmethod
+    def find(cls, path):
+        return cls.collection.find_one({'_id': path})
@@ -1,5 +1,8 @@
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from app import mongo
+from app.models.daily_stats import DailyStats
+from app.utils.profile_features import FEATURE_SOURCE_FIELDS, FEATURES_VERSION, derive_profile_features, matching_skills
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
@@ -19,6 +22,7 @@ class User:
             data['profile_complete'] = 0
             data['applications'] = []
             data['saved_jobs'] = []
+            data['features'] = derive_profile_features(data)
         elif data['role'] == 'employer':
             data['verified'] = False                     # Verification flag
             data['verification_token'] = None            # Token for email verification
@@ -26,6 +30,11 @@ class User:
             data['jobs'] = []
 
         result = cls.collection.insert_one(data)
+
+        DailyStats.increment({f"users.{data['role']}": 1}, data['created_at'])
+        if data['role'] == 'jobseeker':
+            DailyStats.update_skills(added=data.get('skills') or [])
+
         return str(result.inserted_id)
 
     @classmethod
@@ -38,6 +47,26 @@ class User:
         """Find user by ObjectId"""
         return cls.collection.find_one({'_id': ObjectId(user_id)})
 
+    @classmethod
+    def find_by_ids(cls, user_ids):
+        """Find several users with a single query"""
+        return list(cls.collection.find({'_id': {'$in': [ObjectId(user_id) for user_id in user_ids]}}))
+
+    @classmethod
+    def iter_by_ids(cls, user_ids, batch_size=100):
+        """Lazy cursor over several users, fetched from the server batch by batch"""
+        query = {'_id': {'$in': [ObjectId(user_id) for user_id in user_ids]}}
+        return cls.collection.find(query).batch_size(batch_size)
+
+    @classmethod
+    def find_recent_jobseeker_ids(cls, limit, exclude_ids=None):
+        """Ids of the most recently active jobseekers"""
+        query = {'role': 'jobseeker'}
+        if exclude_ids:
+            query['_id'] = {'$nin': [ObjectId(user_id) for user_id in exclude_ids]}
+        cursor = cls.collection.find(query, {'_id': 1}).sort('last_active', -1).limit(limit)
+        return [str(user['_id']) for user in cursor]
+
     @classmethod
     def verify_password(cls, user, password):
         """Check if provided password matches stored hash"""
@@ -45,16 +74,107 @@ class User:
 
     @classmethod
     def update_profile(cls, user_id, data):
-        """Update user profile, including password if provided"""
+        """Update user profile, including password if provided.
+
+        Returns the list of fields whose value changed (always including
+        last_active), or an empty list if the user does not exist.
+        """
         if 'password' in data:
             data['password_hash'] = generate_password_hash(data.pop('password'))
+        data.pop('features', None)  # only ever written by the model
 
         data['last_active'] = datetime.utcnow()
-        result = cls.collection.update_one(
+        previous = cls._update_with_features(user_id, data, {**{field: 1 for field in data}, 'role': 1})
+        if previous is None:
+            return []
+
+        if 'skills' in data and previous.get('role') == 'jobseeker':
+            DailyStats.update_skills(added=data['skills'] or [], removed=previous.get('skills') or [])
+
+        # Role / verification / suspension may have changed
+        from app.utils.identity import invalidate_user
+        invalidate_user(user_id)
+
+        return [field for field in data if previous.get(field) != data[field]]
+
+    @classmethod
+    def set_resume_extraction(cls, user_id, sha256, text, skills):
+        """Store the text and skills extracted from the user's resume.
+
+        Returns the list of fields whose value changed.
+        """
+        data = {'resume_sha256': sha256, 'resume_text': text, 'resume_skills': skills}
+        previous = cls._update_with_features(user_id, data, {field: 1 for field in data})
+        if previous is None:
+            return []
+        return [field for field in data if previous.get(field) != data[field]]
+
+    @classmethod
+    def set_resume(cls, user_id, resume_url):
+        """Point the profile at a new resume. Returns the previous resume_url."""
+        previous = cls.collection.find_one_and_update(
             {'_id': ObjectId(user_id)},
-            {'$set': data}
+            {'$set': {'resume_url': resume_url}},
+            projection={'resume_url': 1},
+            return_document=ReturnDocument.BEFORE
         )
-        return result.modified_count > 0
+        return previous.get('resume_url') if previous else None
+
+    @classmethod
+    def _update_with_features(cls, user_id, data, projection):
+        """$set `data` and keep the jobseeker's matching features in sync.
+
+        Features are derived from the updated document; the write only applies
+        if no one changed a source field in between. Returns the document
+        before the update, or None if the user does not exist.
+        """
+        while True:
+            query = {'_id': ObjectId(user_id)}
+            if set(data) & set(FEATURE_SOURCE_FIELDS):
+                current = cls.collection.find_one(query, {'role': 1, **{field: 1 for field in FEATURE_SOURCE_FIELDS}})
+                if current is None:
+                    return None
+                if current.get('role') == 'jobseeker':
+                    query.update({field: current.get(field) for field in FEATURE_SOURCE_FIELDS})
+                    data['features'] = derive_profile_features({**current, **data})
+
+            previous = cls.collection.find_one_and_update(
+                query,
+                {'$set': data},
+                projection=projection,
+                return_document=ReturnDocument.BEFORE
+            )
+            if previous is not None or 'features' not in data:
+                return previous
+
+    @classmethod
+    def find_stale_features(cls, batch_size=500):
+        """Jobseekers without matching features of the current version"""
+        query = {'role': 'jobseeker', 'features.version': {'$ne': FEATURES_VERSION}}
+        return cls.collection.find(query, {field: 1 for field in FEATURE_SOURCE_FIELDS}).batch_size(batch_size)
+
+    @classmethod
+    def backfill_features(cls, users):
+        """Store matching features on the given jobseekers; returns the number written.
+
+        A user whose source fields changed since it was read is skipped; its
+        update already stored fresh features.
+        """
+        operations = [
+            UpdateOne(
+                {'_id': user['_id'], **{field: user.get(field) for field in FEATURE_SOURCE_FIELDS}},
+                {'$set': {'features': derive_profile_features(user)}}
+            )
+            for user in users
+        ]
+        if not operations:
+            return 0
+        return cls.collection.bulk_write(operations, ordered=False).modified_count
+
+    @staticmethod
+    def matching_skills(user):
+        """Profile skills plus the skills extracted from the uploaded resume"""
+        return matching_skills(user)
 
     @classmethod
     def calculate_profile_completeness(cls, user_id):
@@ -75,7 +195,17 @@ class User:
         score = (completed_required / len(required_fields)) * 70
         score += (completed_optional / len(optional_fields)) * 30
 
-        # Update the profile_complete field
+        # Update the profile_complete field, refreshing stale matching features
+        # unless a source field changed since the user was read
+        features = derive_profile_features(user)
+        if user.get('features') != features:
+            result = cls.collection.update_one(
+                {'_id': user['_id'], **{field: user.get(field) for field in FEATURE_SOURCE_FIELDS}},
+                {'$set': {'profile_complete': int(score), 'features': features}}
+            )
+            if result.matched_count:
+                return int(score)
+
         cls.collection.update_one(
             {'_id': ObjectId(user_id)},
             {'$set': {'profile_complete': int(score)}}
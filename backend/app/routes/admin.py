@@ -6,6 +6,9 @@ from app.models.job import Job
 from app.models.application import Application
 from app.utils.decorators import admin_required
 from app.services.analytics_service import AnalyticsService
+from app.services.matching_service import MatchingService
+from app.services.enrichment_service import EnrichmentService
+from app.utils.pagination import after_cursor, is_valid_cursor, next_cursor, paginated_response, sort_spec
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -34,6 +37,9 @@ def get_users():
     skip = int(request.args.get('skip', 0))
     role = request.args.get('role')
     verified = request.args.get('verified')
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, '_id'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Build query
     query = {}
@@ -42,15 +48,17 @@ def get_users():
     if verified is not None:
         query['verified'] = verified.lower() == 'true'
     
-    # Get users
-    users = list(User.collection.find(query).skip(skip).limit(limit))
+    # Get users, oldest first
+    query = after_cursor(query, cursor, '_id', direction=1)
+    users = list(User.collection.find(query).sort(sort_spec('_id', 1)).skip(skip).limit(limit))
+    following = next_cursor(users, limit, '_id')
     
     # Format users for response
     for user in users:
         user['_id'] = str(user['_id'])
         user.pop('password_hash', None)
     
-    return jsonify(users), 200
+    return paginated_response(users, following), 200
 
 @admin_bp.route('/users/<user_id>/verify', methods=['POST'])
 @jwt_required()
@@ -97,23 +105,28 @@ def get_jobs():
     limit = int(request.args.get('limit', 20))
     skip = int(request.args.get('skip', 0))
     active = request.args.get('active')
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, '_id'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Build query
     query = {}
     if active is not None:
         query['active'] = active.lower() == 'true'
     
-    # Get jobs
-    jobs = list(Job.collection.find(query).skip(skip).limit(limit))
+    # Get jobs, oldest first
+    query = after_cursor(query, cursor, '_id', direction=1)
+    jobs = list(Job.collection.find(query).sort(sort_spec('_id', 1)).skip(skip).limit(limit))
+    following = next_cursor(jobs, limit, '_id')
     
     # Format jobs for response
+    companies = EnrichmentService.company_names(str(job['employer_id']) for job in jobs)
     for job in jobs:
         job['_id'] = str(job['_id'])
         job['employer_id'] = str(job['employer_id'])
-        employer = User.find_by_id(job['employer_id'])
-        job['company_name'] = employer['company_name'] if employer else 'Unknown'
+        job['company_name'] = companies.get(job['employer_id'], 'Unknown')
     
-    return jsonify(jobs), 200
+    return paginated_response(jobs, following), 200
 
 @admin_bp.route('/jobs/<job_id>/approve', methods=['POST'])
 @jwt_required()
@@ -125,11 +138,13 @@ def approve_job(job_id):
         return jsonify({'error': 'Job not found'}), 404
     
     # Update approval status
-    success = Job.update(job_id, {'active': True})
+    changed_fields = Job.update(job_id, {'active': True})
     
-    if not success:
+    if not changed_fields:
         return jsonify({'error': 'Failed to approve job'}), 500
     
+    MatchingService.job_changed(job_id, changed_fields)
+    
     return jsonify({'message': 'Job approved successfully'}), 200
 
 @admin_bp.route('/jobs/<job_id>/reject', methods=['POST'])
@@ -147,6 +162,8 @@ def reject_job(job_id):
     if not success:
         return jsonify({'error': 'Failed to reject job'}), 500
     
+    MatchingService.job_changed(job_id)
+    
     return jsonify({'message': 'Job rejected successfully'}), 200
 
 @admin_bp.route('/analytics', methods=['GET'])
@@ -2,6 +2,7 @@
 from flask import Blueprint, request, jsonify, send_from_directory, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 from bson import ObjectId
 import os
 from flask import send_file
@@ -9,9 +10,14 @@ from app.models.application import Application
 from app.models.job import Job
 from app.models.user import User
 from app.models.notification import Notification
+from app.models.match import Match
 from app.utils.decorators import employer_required, jobseeker_required
-from app.services.file_service import save_uploaded_file
-from ..services.matching_service import MatchingService
+from app.services.file_service import (
+    save_uploaded_file, retain_file, delete_file, resolve_upload_path, not_modified, send_upload
+)
+from app.services.match_queue import MatchQueue
+from app.services.enrichment_service import EnrichmentService
+from app.utils.identity import load_current_user
 
 applications_bp = Blueprint('applications', __name__)
 
@@ -32,13 +38,18 @@ def apply_to_job(job_id):
 
     cover_letter = request.form.get('cover_letter', '')
     resume_file = request.files.get('resume')
-    user = User.find_by_id(jobseeker_id)
+    user = load_current_user()
 
     if resume_file:
         resume_url = save_uploaded_file(resume_file, 'resumes')
         if not resume_url:
             return jsonify({'error': 'Failed to upload resume'}), 500
-        User.collection.update_one({'_id': ObjectId(jobseeker_id)}, {'$set': {'resume_url': resume_url}})
+        # The profile holds one reference on its resume; the replaced one is released
+        previous_resume = User.set_resume(jobseeker_id, resume_url)
+        if previous_resume:
+            delete_file(previous_resume)
+        # Text and skills are extracted by the match worker, not in this request
+        MatchQueue.enqueue_resume(jobseeker_id)
     else:
         if not user.get('resume_url'):
             return jsonify({'error': 'Resume file is required'}), 400
@@ -53,9 +64,14 @@ def apply_to_job(job_id):
     }
 
     application_id = Application.create(application_data)
+    # The application keeps its resume even after the profile moves on
+    retain_file(resume_url)
 
     User.collection.update_one({'_id': ObjectId(jobseeker_id)}, {'$push': {'applications': application_id}})
 
+    # Precompute the match score the employer will look at
+    MatchQueue.enqueue_pair(jobseeker_id, job_id)
+
     Notification.create({
         'recipient_id': job['employer_id'],
         'type': 'new_application',
@@ -78,11 +94,7 @@ def get_my_applications():
 
     for app in applications:
         app['_id'] = str(app['_id'])
-        job = Job.find_by_id(app['job_id'])
-        if job:
-            app['job_title'] = job['title']
-            employer = User.find_by_id(job['employer_id'])
-            app['company_name'] = employer.get('company_name', '') if employer else ''
+    EnrichmentService.enrich_applications_with_jobs(applications)
 
     return jsonify(applications), 200
 
@@ -103,12 +115,7 @@ def get_job_applications(job_id):
     applications = Application.find_by_job(job_id)
     for app in applications:
         app['_id'] = str(app['_id'])
-        jobseeker = User.find_by_id(app['jobseeker_id'])
-        if jobseeker:
-            app['jobseeker_name'] = jobseeker.get('name', '')
-            app['jobseeker_email'] = jobseeker.get('email', '')
-            app['jobseeker_location'] = jobseeker.get('location', '')
-            app['jobseeker_skills'] = jobseeker.get('skills', [])
+    EnrichmentService.enrich_applications_with_jobseekers(applications)
 
     return jsonify(applications), 200
 
@@ -166,11 +173,17 @@ def get_job_match(job_id):
     if not job or not job.get('active', True):
         return jsonify({'error': 'Job not found or inactive'}), 404
 
-    match_data = MatchingService.calculate_match(jobseeker_id, job_id)
-    if not match_data:
-        return jsonify({'error': 'No match data available'}), 404
+    # Serve the precomputed match; a missing one is left to the match worker
+    match = Match.find_by_user_job(jobseeker_id, job_id)
+    if not match:
+        MatchQueue.enqueue_pair(jobseeker_id, job_id)
+        return jsonify({'status': 'pending'}), 202
 
-    return jsonify(match_data), 200
+    return jsonify({
+        'match_id': str(match['_id']),
+        'overall_score': match['overall_score'],
+        'breakdown': match['breakdown']
+    }), 200
 
 
 @applications_bp.route('/matches/job/<job_id>/all', methods=['GET'])
@@ -184,19 +197,24 @@ def get_job_matches_for_employer(job_id):
         return jsonify({'error': 'Unauthorized or job not found'}), 403
 
     applications = Application.find_by_job(job_id)
+    stored_matches = Match.find_by_job_and_users(job_id, [app['jobseeker_id'] for app in applications])
+    jobseekers = EnrichmentService.jobseekers_by_id(app['jobseeker_id'] for app in applications)
     matches = []
 
     for app in applications:
-        match_data = MatchingService.calculate_match(app['jobseeker_id'], job_id)
-        if match_data:
-            user = User.find_by_id(app['jobseeker_id'])
-            matches.append({
-                'application_id': str(app['_id']),
-                'jobseeker_id': app['jobseeker_id'],
-                'jobseeker_name': user.get('name', '') if user else '',
-                'overall_score': match_data['overall_score'],
-                'breakdown': match_data['breakdown']
-            })
+        match_data = stored_matches.get(app['jobseeker_id'])
+        if not match_data:
+            # Scored by the match worker; listed without a score until then
+            MatchQueue.enqueue_pair(app['jobseeker_id'], job_id)
+        user = jobseekers.get(app['jobseeker_id'])
+        matches.append({
+            'application_id': str(app['_id']),
+            'jobseeker_id': app['jobseeker_id'],
+            'jobseeker_name': user.get('name', '') if user else '',
+            'overall_score': match_data['overall_score'] if match_data else None,
+            'breakdown': match_data['breakdown'] if match_data else None,
+            'pending': not match_data
+        })
 
     return jsonify(matches), 200
 
@@ -232,26 +250,26 @@ def get_application(application_id):
 @applications_bp.route('/resumes/<path:filename>', methods=['GET'])
 def download_resume(filename):
     try:
-        # Normalize filename (replace backslashes and get only basename)
-        safe_name = os.path.basename(filename.replace("\\", "/"))
-
-        # Resumes folder path
-        resume_folder = os.path.join(current_app.config.get('UPLOAD_FOLDER', ''), 'resumes')
-        file_path = os.path.join(resume_folder, safe_name)
-
-        # Ensure file_path is inside resume_folder
-        resume_folder_abs = os.path.abspath(resume_folder)
-        file_path_abs = os.path.abspath(file_path)
-        if not os.path.commonpath([file_path_abs, resume_folder_abs]) == resume_folder_abs:
+        # Content-addressed resumes live in shard directories under resumes/;
+        # the path must stay inside that folder
+        file_path_abs = resolve_upload_path('resumes', filename)
+        if file_path_abs is None:
             return jsonify({'error': 'Invalid file path'}), 400
 
-        # Check existence
+        # Check existence (a deleted resume must not be revalidated as unchanged)
         if not os.path.isfile(file_path_abs):
             return jsonify({'error': 'File not found'}), 404
 
-        # Serve file
-        return send_from_directory(resume_folder_abs, safe_name, as_attachment=True)
+        # Revalidation of an unchanged resume is answered from the name alone
+        cached = not_modified(file_path_abs)
+        if cached is not None:
+            return cached
+
+        # Serve file (ETag, Last-Modified, Range, optional X-Sendfile)
+        return send_upload(file_path_abs, as_attachment=True)
 
+    except RequestedRangeNotSatisfiable as e:
+        return e
     except Exception as e:
         current_app.logger.exception('Failed to download resume')
         return jsonify({'error': f'Failed to download resume: {str(e)}'}), 500
@@ -2,7 +2,9 @@ from flask import Blueprint, request, jsonify, redirect
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app.models.user import User
 from app.utils.validators import validate_email, validate_password
-from app.utils.email_utils import send_verification_email
+from app.utils.email_utils import queue_verification_email
+from app.services.matching_service import MatchingService
+from app.utils.identity import load_current_user, current_user_claims, invalidate_user
 import uuid
 from datetime import datetime, timedelta
 from bson import ObjectId
@@ -32,7 +34,7 @@ def register():
     user_id = User.create(data)
     new_user = User.find_by_id(user_id)
 
-    # If employer, generate verification token and send email
+    # If employer, generate verification token and queue the email
     if new_user['role'] == 'employer':
         token = str(uuid.uuid4())
         expiry = datetime.utcnow() + timedelta(hours=24)
@@ -40,7 +42,7 @@ def register():
             {'_id': new_user['_id']},
             {'$set': {'verification_token': token, 'verification_token_expiry': expiry}}
         )
-        send_verification_email(new_user['email'], token)
+        queue_verification_email(new_user['email'], token)
 
     # Create JWT tokens
     access_token = create_access_token(identity=user_id)
@@ -80,8 +82,7 @@ def login():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    user_id = get_jwt_identity()
-    user = User.find_by_id(user_id)
+    user = load_current_user()
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
@@ -98,13 +99,13 @@ def update_current_user():
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
-    success = User.update_profile(user_id, data)
-    if not success:
+    changed_fields = User.update_profile(user_id, data)
+    if not changed_fields:
         return jsonify({'error': 'Failed to update profile'}), 500
 
-    user = User.find_by_id(user_id)
-    if user['role'] == 'jobseeker':
+    if current_user_claims()['role'] == 'jobseeker':
         User.calculate_profile_completeness(user_id)
+        MatchingService.jobseeker_changed(user_id, changed_fields + ['profile_complete'])
 
     return jsonify({'message': 'Profile updated successfully'}), 200
 
@@ -134,6 +135,7 @@ def verify_employer(token):
 
     if result.modified_count != 1:
         return "Failed to verify employer. Try again.", 500
+    invalidate_user(user['_id'])
 
     # Redirect to frontend login page with success query
     frontend_url = f"http://localhost:3000/login?verified=true"
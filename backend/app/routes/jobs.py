@@ -4,6 +4,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.job import Job
 from app.models.user import User
 from app.utils.decorators import employer_required, admin_required
+from app.services.matching_service import MatchingService
+from app.services.job_search import JobSearch
+from app.utils.pagination import is_valid_cursor, next_cursor, paginated_response
 
 jobs_bp = Blueprint('jobs', __name__)
 
@@ -16,6 +19,9 @@ def get_jobs():
     remote = request.args.get('remote')
     skills = request.args.getlist('skills')
     search = request.args.get('search')
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, 'created_at'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Build filters
     filters = {}
@@ -26,18 +32,20 @@ def get_jobs():
     if skills:
         filters['skills'] = skills
     
-    # Get jobs
+    # Get jobs (search results are ranked by relevance and paged with skip only)
     if search:
-        jobs = Job.search(search, limit, skip)
+        jobs = JobSearch.search(search, filters, limit, skip)
+        following = None
     else:
-        jobs = Job.find_all(filters, limit, skip)
+        jobs = Job.find_all(filters, limit, skip, cursor)
+        following = next_cursor(jobs, limit, 'created_at')
     
     # Format jobs for response
     for job in jobs:
         job['_id'] = str(job['_id'])
         job['employer_id'] = str(job['employer_id'])
     
-    return jsonify(jobs), 200
+    return paginated_response(jobs, following), 200
 
 @jobs_bp.route('/<job_id>', methods=['GET'])
 def get_job(job_id):
@@ -70,6 +78,7 @@ def create_job():
     
     # Create job
     job_id = Job.create(data, user_id)
+    MatchingService.job_changed(job_id)
     
     # Add job to employer's jobs list
     User.collection.update_one(
@@ -101,11 +110,13 @@ def update_job(job_id):
         return jsonify({'error': 'Unauthorized to update this job'}), 403
     
     # Update job
-    success = Job.update(job_id, data)
+    changed_fields = Job.update(job_id, data)
     
-    if not success:
+    if not changed_fields:
         return jsonify({'error': 'Failed to update job'}), 500
     
+    MatchingService.job_changed(job_id, changed_fields)
+    
     return jsonify({'message': 'Job updated successfully'}), 200
 
 @jobs_bp.route('/<job_id>', methods=['DELETE'])
@@ -128,4 +139,6 @@ def delete_job(job_id):
     if not success:
         return jsonify({'error': 'Failed to delete job'}), 500
     
+    MatchingService.job_changed(job_id)
+    
     return jsonify({'message': 'Job deleted successfully'}), 200
\ No newline at end of file
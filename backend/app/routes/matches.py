@@ -5,7 +5,10 @@ from app.models.match import Match
 from app.models.job import Job
 from app.models.user import User
 from app.services.matching_service import MatchingService
+from app.services.enrichment_service import EnrichmentService
 from app.utils.decorators import jobseeker_required, employer_required
+from app.utils.identity import current_user_claims
+from app.utils.pagination import is_valid_cursor, next_cursor, paginated_response
 
 matches_bp = Blueprint('matches', __name__)
 
@@ -19,28 +22,25 @@ def get_matches():
     limit = int(request.args.get('limit', 20))
     skip = int(request.args.get('skip', 0))
     regenerate = request.args.get('regenerate', 'false').lower() == 'true'
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, 'overall_score'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Regenerate matches if requested
     if regenerate:
-        matches = MatchingService.generate_matches_for_jobseeker(jobseeker_id, limit + skip)
+        matches = MatchingService.generate_matches_for_jobseeker(jobseeker_id, limit, skip)
+        following = None
     else:
         # Get existing matches
-        matches_data = Match.find_by_user(jobseeker_id, limit, skip)
+        matches_data = Match.find_by_user(jobseeker_id, limit, skip, cursor)
+        following = next_cursor(matches_data, limit, 'overall_score')
         
         # Enrich with job details
-        matches = []
         for match in matches_data:
             match['_id'] = str(match['_id'])
-            job = Job.find_by_id(match['job_id'])
-            if job:
-                match['job_title'] = job['title']
-                match['company_name'] = User.find_by_id(job['employer_id'])['company_name']
-                match['location'] = job['location']
-                match['remote'] = job.get('remote', False)
-                match['salary_range'] = job.get('salary_range', [])
-                matches.append(match)
+        matches = EnrichmentService.enrich_matches_with_jobs(matches_data)
     
-    return jsonify(matches), 200
+    return paginated_response(matches, following), 200
 
 @matches_bp.route('/job/<job_id>', methods=['GET'])
 @jwt_required()
@@ -60,33 +60,33 @@ def get_job_matches(job_id):
     limit = int(request.args.get('limit', 20))
     skip = int(request.args.get('skip', 0))
     regenerate = request.args.get('regenerate', 'false').lower() == 'true'
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, 'overall_score'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Regenerate matches if requested
     if regenerate:
-        matches = MatchingService.generate_matches_for_job(job_id, limit + skip)
+        matches = MatchingService.generate_matches_for_job(job_id, limit, skip)
+        following = None
     else:
         # Get existing matches
-        matches_data = Match.find_by_job(job_id, limit, skip)
+        matches_data = Match.find_by_job(job_id, limit, skip, cursor)
+        following = next_cursor(matches_data, limit, 'overall_score')
         
         # Enrich with jobseeker details
-        matches = []
         for match in matches_data:
             match['_id'] = str(match['_id'])
-            jobseeker = User.find_by_id(match['user_id'])
-            if jobseeker:
-                match['jobseeker_name'] = jobseeker['name']
-                match['jobseeker_location'] = jobseeker.get('location', '')
-                match['jobseeker_skills'] = jobseeker.get('skills', [])
-                match['jobseeker_experience'] = jobseeker.get('experience', 0)
-                matches.append(match)
+        matches = EnrichmentService.enrich_matches_with_jobseekers(matches_data)
     
-    return jsonify(matches), 200
+    return paginated_response(matches, following), 200
 
 @matches_bp.route('/<match_id>', methods=['GET'])
 @jwt_required()
 def get_match(match_id):
     user_id = get_jwt_identity()
-    user = User.find_by_id(user_id)
+    user = current_user_claims()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
     
     # Get match
     match = Match.find_by_id(match_id)
@@ -1,7 +1,11 @@
 # backend/app/routes/notifications.py
-from flask import Blueprint, request, jsonify
+import time
+from bson import ObjectId
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.notification import Notification
+from app.services.notification_bus import NotificationBus
+from app.utils.pagination import is_valid_cursor, next_cursor, paginated_response
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -14,15 +18,19 @@ def get_notifications():
     limit = int(request.args.get('limit', 20))
     skip = int(request.args.get('skip', 0))
     unread_only = request.args.get('unread_only', 'false').lower() == 'true'
+    cursor = request.args.get('cursor')
+    if cursor and not is_valid_cursor(cursor, 'created_at'):
+        return jsonify({'error': 'Invalid cursor'}), 400
     
     # Get notifications
-    notifications = Notification.find_by_recipient(user_id, limit, skip, unread_only)
+    notifications = Notification.find_by_recipient(user_id, limit, skip, unread_only, cursor)
+    following = next_cursor(notifications, limit, 'created_at')
     
     # Format notifications for response
     for notification in notifications:
         notification['_id'] = str(notification['_id'])
     
-    return jsonify(notifications), 200
+    return paginated_response(notifications, following), 200
 
 @notifications_bp.route('/unread-count', methods=['GET'])
 @jwt_required()
@@ -33,6 +41,60 @@ def get_unread_count():
     
     return jsonify({'count': count}), 200
 
+def _sse_event(notification):
+    data = dict(notification)
+    data['_id'] = str(data['_id'])
+    return f"id: {data['_id']}\nevent: notification\ndata: {current_app.json.dumps(data)}\n\n"
+
+@notifications_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_notifications():
+    # Server-sent events. EventSource cannot send headers, so the access token
+    # may also be passed as ?jwt=...; a reconnecting client sends Last-Event-ID
+    # and first receives what it missed.
+    user_id = get_jwt_identity()
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id and not ObjectId.is_valid(last_event_id):
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+    
+    heartbeat = current_app.config.get('NOTIFICATION_STREAM_HEARTBEAT', 15)
+    max_age = current_app.config.get('NOTIFICATION_STREAM_MAX_AGE', 300)
+    bus = NotificationBus.backend()
+    # Subscribe before reading the backlog so nothing created in between is lost
+    subscription = bus.subscribe(user_id, current_app.config.get('NOTIFICATION_STREAM_QUEUE_SIZE', 100))
+    
+    def events():
+        last_id = ObjectId(last_event_id) if last_event_id else None
+        try:
+            yield 'retry: 3000\n\n'
+            
+            while last_id:
+                missed = Notification.find_after(user_id, last_id, limit=100)
+                for notification in missed:
+                    last_id = notification['_id']
+                    yield _sse_event(notification)
+                if len(missed) < 100:
+                    break
+            
+            # Streams are recycled after max_age; a client whose queue overflowed
+            # is disconnected and catches up from Last-Event-ID on reconnect
+            deadline = time.monotonic() + max_age
+            while not subscription.overflowed and time.monotonic() < deadline:
+                notification = subscription.get(timeout=heartbeat)
+                if notification is None:
+                    yield ': heartbeat\n\n'
+                elif last_id is None or notification['_id'] > last_id:
+                    last_id = notification['_id']
+                    yield _sse_event(notification)
+        finally:
+            bus.unsubscribe(subscription)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @notifications_bp.route('/<notification_id>/read', methods=['PUT'])
 @jwt_required()
 def mark_notification_as_read(notification_id):
@@ -3,11 +3,12 @@ from app.models.user import User
 from app.models.job import Job
 from app.models.application import Application
 from app.models.match import Match
+from app.models.daily_stats import DailyStats
 from datetime import datetime, timedelta
-from bson.objectid import ObjectId
-from collections import defaultdict
 
 class AnalyticsService:
+    HIGH_MATCH_SCORE = 70
+
     @classmethod
     def get_platform_analytics(cls, period='month'):
         # Calculate date range based on period
@@ -23,226 +24,209 @@ class AnalyticsService:
         else:
             start_date = now - timedelta(days=30)
         
-        # Get user growth
-        user_growth = cls._get_user_growth(start_date)
-        
-        # Get job posting trends
-        job_trends = cls._get_job_trends(start_date)
-        
-        # Get application trends
-        application_trends = cls._get_application_trends(start_date)
-        
-        # Get top skills
-        top_skills = cls._get_top_skills()
-        
-        # Get match success rate
-        match_success = cls._get_match_success_rate()
-        
-        # Get time to hire
-        time_to_hire = cls._get_time_to_hire()
+        # Everything except time to hire is read from the daily rollups
+        days = DailyStats.find_days(start_date)
         
         return {
-            'user_growth': user_growth,
-            'job_trends': job_trends,
-            'application_trends': application_trends,
-            'top_skills': top_skills,
-            'match_success_rate': match_success,
-            'time_to_hire': time_to_hire
+            'user_growth': cls._get_user_growth(days),
+            'job_trends': cls._get_daily_counts(days, 'jobs'),
+            'application_trends': cls._get_daily_counts(days, 'applications'),
+            # Counted by the compaction only, so the latest days lag until it runs
+            'high_match_trends': cls._get_daily_counts(days, 'high_match_applications'),
+            'top_skills': DailyStats.top_skills(),
+            'match_success_rate': cls._get_match_success_rate(start_date),
+            'time_to_hire': cls._get_time_to_hire(start_date)
         }
     
     @classmethod
-    def _get_user_growth(cls, start_date):
-        # Get user counts by role and date
-        pipeline = [
-            {
-                '$match': {
-                    'created_at': {'$gte': start_date}
-                }
-            },
-            {
-                '$group': {
-                    '_id': {
-                        'role': '$role',
-                        'date': {
-                            '$dateToString': {
-                                'format': '%Y-%m-%d',
-                                'date': '$created_at'
-                            }
-                        }
-                    },
-                    'count': {'$sum': 1}
-                }
-            },
-            {
-                '$sort': {'_id.date': 1}
-            }
-        ]
-        
-        results = list(User.collection.aggregate(pipeline))
-        
-        # Format results
-        jobseeker_data = []
-        employer_data = []
-        dates = set()
-        
-        for result in results:
-            date = result['_id']['date']
-            dates.add(date)
-            
-            if result['_id']['role'] == 'jobseeker':
-                jobseeker_data.append({'date': date, 'count': result['count']})
-            else:
-                employer_data.append({'date': date, 'count': result['count']})
-        
-        # Fill in missing dates with 0
-        all_dates = sorted(list(dates))
-        formatted_jobseeker = []
-        formatted_employer = []
-        
-        for date in all_dates:
-            jobseeker_count = next((item['count'] for item in jobseeker_data if item['date'] == date), 0)
-            employer_count = next((item['count'] for item in employer_data if item['date'] == date), 0)
-            
-            formatted_jobseeker.append({'date': date, 'count': jobseeker_count})
-            formatted_employer.append({'date': date, 'count': employer_count})
+    def _get_user_growth(cls, days):
+        jobseekers = []
+        employers = []
+        for day in days:
+            users = day.get('users', {})
+            if not any(users.values()):
+                continue
+            jobseekers.append({'date': day['_id'], 'count': users.get('jobseeker', 0)})
+            employers.append({'date': day['_id'], 'count': users.get('employer', 0)})
         
         return {
-            'jobseekers': formatted_jobseeker,
-            'employers': formatted_employer
+            'jobseekers': jobseekers,
+            'employers': employers
         }
     
     @classmethod
-    def _get_job_trends(cls, start_date):
-        # Get job counts by date
-        pipeline = [
-            {
-                '$match': {
-                    'created_at': {'$gte': start_date}
-                }
-            },
-            {
-                '$group': {
-                    '_id': {
-                        '$dateToString': {
-                            'format': '%Y-%m-%d',
-                            'date': '$created_at'
-                        }
-                    },
-                    'count': {'$sum': 1}
-                }
-            },
-            {
-                '$sort': {'_id': 1}
-            }
+    def _get_daily_counts(cls, days, counter):
+        return [{'date': day['_id'], 'count': day[counter]} for day in days if day.get(counter)]
+    
+    @staticmethod
+    def _percentiles(counts, points=(25, 50, 75, 90)):
+        """Exact nearest-rank percentiles of a {integer value: frequency} histogram."""
+        total = sum(counts.values())
+        if not total:
+            return {f'p{point}': None for point in points}
+        
+        values = sorted(counts)
+        percentiles = {}
+        for point in points:
+            rank = max(1, -(-point * total // 100))
+            seen = 0
+            for value in values:
+                seen += counts[value]
+                if seen >= rank:
+                    percentiles[f'p{point}'] = value
+                    break
+        return percentiles
+    
+    @staticmethod
+    def _match_score_lookup():
+        # Joins the stored match of each application; uses the (user_id, job_id) index
+        return {'$lookup': {
+            'from': Match.collection.name,
+            'let': {'user_id': '$jobseeker_id', 'job_id': '$job_id'},
+            'pipeline': [
+                {'$match': {'$expr': {'$and': [
+                    {'$eq': ['$user_id', '$$user_id']},
+                    {'$eq': ['$job_id', '$$job_id']}
+                ]}}},
+                {'$project': {'_id': 0, 'overall_score': 1}}
+            ],
+            'as': 'match'
+        }}
+    
+    @classmethod
+    def _get_match_success_rate(cls, start_date=None):
+        """Share of applications whose match score is high, with the score distribution.
+
+        Applications are joined to their match and grouped by integer score on
+        the server, so at most 102 groups (0-100 and unscored) reach Python.
+        """
+        pipeline = []
+        if start_date:
+            pipeline.append({'$match': {'applied_at': {'$gte': start_date}}})
+        pipeline += [
+            {'$project': {'jobseeker_id': 1, 'job_id': 1}},
+            cls._match_score_lookup(),
+            {'$group': {'_id': {'$max': '$match.overall_score'}, 'count': {'$sum': 1}}}
         ]
         
-        results = list(Job.collection.aggregate(pipeline))
-        
-        # Format results
-        job_data = []
-        for result in results:
-            job_data.append({'date': result['_id'], 'count': result['count']})
+        score_counts = {}
+        unscored = 0
+        for result in Application.collection.aggregate(pipeline):
+            if result['_id'] is None:
+                unscored += result['count']
+            else:
+                score = int(result['_id'])
+                score_counts[score] = score_counts.get(score, 0) + result['count']
+        
+        applications = unscored + sum(score_counts.values())
+        high_match = sum(count for score, count in score_counts.items() if score >= cls.HIGH_MATCH_SCORE)
+        # Ten buckets of ten points; 100 falls in the last one
+        buckets = [0] * 10
+        for score, count in score_counts.items():
+            buckets[min(score // 10, 9)] += count
+        histogram = [
+            {'range': f'{i * 10}-{i * 10 + 9 if i < 9 else 100}', 'count': count}
+            for i, count in enumerate(buckets)
+        ]
         
-        return job_data
+        return {
+            'rate': round(high_match / applications * 100, 2) if applications else 0,
+            'applications': applications,
+            'high_match_applications': high_match,
+            'unscored_applications': unscored,
+            'histogram': histogram,
+            'percentiles': cls._percentiles(score_counts)
+        }
     
     @classmethod
-    def _get_application_trends(cls, start_date):
-        # Get application counts by date
+    def _get_time_to_hire(cls, start_date=None):
+        """Whole days from application to hire for the hires made in the period."""
+        match = {'status': 'Hired', 'updated_at': {'$exists': True}}
+        if start_date:
+            match['updated_at'] = {'$gte': start_date}
         pipeline = [
-            {
-                '$match': {
-                    'applied_at': {'$gte': start_date}
-                }
-            },
-            {
-                '$group': {
-                    '_id': {
-                        '$dateToString': {
-                            'format': '%Y-%m-%d',
-                            'date': '$applied_at'
-                        }
-                    },
-                    'count': {'$sum': 1}
-                }
-            },
-            {
-                '$sort': {'_id': 1}
-            }
+            {'$match': match},
+            {'$project': {'days': {'$floor': {
+                '$divide': [{'$subtract': ['$updated_at', '$applied_at']}, 24 * 60 * 60 * 1000]
+            }}}},
+            {'$group': {'_id': '$days', 'count': {'$sum': 1}}}
         ]
         
-        results = list(Application.collection.aggregate(pipeline))
+        day_counts = {int(result['_id']): result['count'] for result in Application.collection.aggregate(pipeline)}
+        hires = sum(day_counts.values())
+        total_days = sum(days * count for days, count in day_counts.items())
         
-        # Format results
-        application_data = []
-        for result in results:
-            application_data.append({'date': result['_id'], 'count': result['count']})
-        
-        return application_data
+        return {
+            'average_days': round(total_days / hires, 2) if hires else 0,
+            'hires': hires,
+            'histogram': [{'days': days, 'count': day_counts[days]} for days in sorted(day_counts)],
+            'percentiles': cls._percentiles(day_counts)
+        }
     
-    @classmethod
-    def _get_top_skills(cls, limit=10):
-        # Get all jobseeker skills
-        jobseekers = list(User.collection.find({'role': 'jobseeker'}))
-        
-        # Count skills
-        skill_counts = defaultdict(int)
-        for jobseeker in jobseekers:
-            skills = jobseeker.get('skills', [])
-            for skill in skills:
-                skill_counts[skill.lower()] += 1
-        
-        # Sort by count and get top skills
-        top_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-        
-        # Format results
-        formatted_skills = [{'skill': skill, 'count': count} for skill, count in top_skills]
-        
-        return formatted_skills
+    # ------------------- Rollup compaction -------------------
+    @staticmethod
+    def _day_expression(field):
+        return {'$dateToString': {'format': '%Y-%m-%d', 'date': f'${field}'}}
     
     @classmethod
-    def _get_match_success_rate(cls):
-        # Get applications and their corresponding matches
-        applications = list(Application.collection.find({}))
-        
-        if not applications:
-            return 0
-        
-        # Count applications with high match scores
-        high_match_count = 0
-        for application in applications:
-            match = Match.find_by_user_job(application['jobseeker_id'], application['job_id'])
-            if match and match['overall_score'] >= 70:
-                high_match_count += 1
-        
-        # Calculate success rate
-        success_rate = (high_match_count / len(applications)) * 100
-        
-        return round(success_rate, 2)
+    def compact_daily_stats(cls, start_date, end_date=None):
+        """Recompute the `daily_stats` day documents from the raw collections.
+
+        Covers every UTC day from `start_date` up to and excluding `end_date`
+        (default: tomorrow). High-match applications are only counted here,
+        since a match is usually scored after the application is created.
+        """
+        start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = end_date or (datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1))
+
+        days = {}
+        day = start
+        while day < end:
+            days[DailyStats.day_key(day)] = {'date': day, 'users': {}, **{field: 0 for field in DailyStats.DAY_COUNTERS}}
+            day += timedelta(days=1)
+
+        users = User.collection.aggregate([
+            {'$match': {'created_at': {'$gte': start, '$lt': end}}},
+            {'$group': {'_id': {'date': cls._day_expression('created_at'), 'role': '$role'}, 'count': {'$sum': 1}}}
+        ])
+        for result in users:
+            days[result['_id']['date']]['users'][result['_id']['role']] = result['count']
+
+        jobs = Job.collection.aggregate([
+            {'$match': {'created_at': {'$gte': start, '$lt': end}}},
+            {'$group': {'_id': cls._day_expression('created_at'), 'count': {'$sum': 1}}}
+        ])
+        for result in jobs:
+            days[result['_id']]['jobs'] = result['count']
+
+        applications = Application.collection.aggregate([
+            {'$match': {'applied_at': {'$gte': start, '$lt': end}}},
+            cls._match_score_lookup(),
+            {'$group': {
+                '_id': cls._day_expression('applied_at'),
+                'count': {'$sum': 1},
+                'high_match': {'$sum': {
+                    '$cond': [{'$gte': [{'$max': '$match.overall_score'}, cls.HIGH_MATCH_SCORE]}, 1, 0]
+                }}
+            }}
+        ])
+        for result in applications:
+            days[result['_id']]['applications'] = result['count']
+            days[result['_id']]['high_match_applications'] = result['high_match']
+
+        DailyStats.replace_days(days.values())
+        return len(days)
     
     @classmethod
-    def _get_time_to_hire(cls):
-        # Get applications with status "Hired"
-        hired_applications = list(Application.collection.find({'status': 'Hired'}))
-        
-        if not hired_applications:
-            return 0
-        
-        # Calculate average time to hire in days
-        total_days = 0
-        for application in hired_applications:
-            applied_at = application['applied_at']
-            
-            # Get the most recent update
-            updates = []
-            if 'updated_at' in application:
-                updates.append(application['updated_at'])
-            
-            if updates:
-                latest_update = max(updates)
-                days_diff = (latest_update - applied_at).days
-                total_days += days_diff
-        
-        # Calculate average
-        average_days = total_days / len(hired_applications)
-        
-        return round(average_days, 2)
\ No newline at end of file
+    def rebuild_skill_stats(cls):
+        """Recount how many jobseekers list each skill."""
+        pipeline = [
+            {'$match': {'role': 'jobseeker', 'skills.0': {'$exists': True}}},
+            {'$project': {'skills': 1}},
+            {'$unwind': '$skills'},
+            {'$group': {'_id': {'user': '$_id', 'skill': {'$toLower': {'$trim': {'input': '$skills'}}}}}},
+            {'$group': {'_id': '$_id.skill', 'count': {'$sum': 1}}}
+        ]
+        skill_counts = {result['_id']: result['count'] for result in User.collection.aggregate(pipeline) if result['_id']}
+        DailyStats.replace_skills(skill_counts)
+        return len(skill_counts)
@@ -0,0 +1,69 @@
+# backend/app/services/email_outbox.py
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from app import mongo
+
+class EmailOutbox:
+    """Outgoing mail stored in the `email_outbox` collection.
+
+    Enqueueing is a single insert, so requests never wait on the mail server;
+    mail_worker.py drains the outbox in the background. Messages claimed by a
+    sender that died are picked up again after EMAIL_SEND_TIMEOUT seconds.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else mongo.db.email_outbox
+
+    def enqueue(self, subject, recipients, body, sender=None, html=None):
+        now = datetime.utcnow()
+        result = self.collection.insert_one({
+            'subject': subject,
+            'recipients': list(recipients),
+            'body': body,
+            'html': html,
+            'sender': sender,
+            'status': 'pending',
+            'attempts': 0,
+            'created_at': now,
+            'available_at': now
+        })
+        return str(result.inserted_id)
+
+    def claim(self, worker_name, batch_size, timeout):
+        now = datetime.utcnow()
+        query = {'$or': [
+            {'status': 'pending', 'available_at': {'$lte': now}},
+            {'status': 'sending', 'claimed_at': {'$lt': now - timedelta(seconds=timeout)}}
+        ]}
+        messages = []
+        for _ in range(batch_size):
+            message = self.collection.find_one_and_update(
+                query,
+                {'$set': {'status': 'sending', 'claimed_at': now, 'worker': worker_name},
+                 '$inc': {'attempts': 1}},
+                sort=[('available_at', 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not message:
+                break
+            messages.append(message)
+        return messages
+
+    def complete(self, message):
+        # Sent messages are kept for a while (TTL index on sent_at) for auditing
+        self.collection.update_one(
+            {'_id': message['_id']},
+            {'$set': {'status': 'sent', 'sent_at': datetime.utcnow()}, '$unset': {'error': ''}}
+        )
+
+    def fail(self, message, error, max_attempts, retry_delay):
+        if message['attempts'] >= max_attempts:
+            update = {'status': 'failed', 'error': error}
+        else:
+            # Exponential backoff: retry_delay, 2 * retry_delay, 4 * retry_delay, ...
+            delay = timedelta(seconds=retry_delay * 2 ** (message['attempts'] - 1))
+            update = {'status': 'pending', 'error': error, 'available_at': datetime.utcnow() + delay}
+        self.collection.update_one({'_id': message['_id']}, {'$set': update})
+
+    def pending_count(self):
+        return self.collection.count_documents({'status': 'pending'})
@@ -0,0 +1,109 @@
+# backend/app/services/email_sender.py
+import smtplib
+import time
+from contextlib import ExitStack
+from flask import current_app
+from flask_mail import Message
+from app import mail
+from app.services.email_outbox import EmailOutbox
+
+# Errors after which the SMTP connection cannot be trusted any more
+CONNECTION_ERRORS = (smtplib.SMTPException, OSError)
+
+
+class SMTPSession:
+    """One SMTP connection, opened on first use and kept open between batches."""
+
+    def __init__(self):
+        self._stack = None
+        self._connection = None
+
+    def connection(self):
+        if self._connection is None:
+            stack = ExitStack()
+            self._connection = stack.enter_context(mail.connect())
+            self._stack = stack
+        return self._connection
+
+    def close(self):
+        if self._stack is None:
+            return
+        try:
+            self._stack.close()
+        except CONNECTION_ERRORS:
+            pass  # the server already dropped us
+        finally:
+            self._stack = None
+            self._connection = None
+
+
+class EmailSender:
+    """Delivers outbox messages, reusing one SMTP connection across messages."""
+
+    @staticmethod
+    def build_message(message):
+        return Message(
+            subject=message['subject'],
+            sender=message.get('sender') or None,  # None falls back to MAIL_DEFAULT_SENDER
+            recipients=message['recipients'],
+            body=message.get('body'),
+            html=message.get('html')
+        )
+
+    @classmethod
+    def process(cls, outbox, messages, session):
+        max_attempts = current_app.config.get('EMAIL_MAX_ATTEMPTS', 6)
+        retry_delay = current_app.config.get('EMAIL_RETRY_DELAY', 30)
+        sent = 0
+
+        for index, message in enumerate(messages):
+            try:
+                connection = session.connection()
+            except CONNECTION_ERRORS as e:
+                # Mail server unreachable: back off the whole rest of the batch
+                current_app.logger.warning(f'SMTP connection failed: {e}')
+                for pending in messages[index:]:
+                    outbox.fail(pending, str(e), max_attempts, retry_delay)
+                break
+
+            try:
+                connection.send(cls.build_message(message))
+            except Exception as e:
+                current_app.logger.exception(f'Sending email {message["_id"]} failed')
+                if isinstance(e, CONNECTION_ERRORS):
+                    session.close()
+                outbox.fail(message, str(e), max_attempts, retry_delay)
+            else:
+                outbox.complete(message)
+                sent += 1
+
+        return sent
+
+    @classmethod
+    def run_once(cls, session, worker_name='inline', outbox=None):
+        """Claim and send one batch. Returns the number of messages claimed."""
+        outbox = outbox or EmailOutbox()
+        messages = outbox.claim(
+            worker_name,
+            current_app.config.get('EMAIL_BATCH_SIZE', 50),
+            current_app.config.get('EMAIL_SEND_TIMEOUT', 300)
+        )
+        if messages:
+            cls.process(outbox, messages, session)
+        return len(messages)
+
+    @classmethod
+    def run_forever(cls, worker_name, stop_event=None):
+        poll_interval = current_app.config.get('EMAIL_POLL_INTERVAL', 5)
+        outbox = EmailOutbox()
+        session = SMTPSession()
+        current_app.logger.info(f'Email sender {worker_name} started')
+
+        try:
+            while stop_event is None or not stop_event.is_set():
+                if not cls.run_once(session, worker_name, outbox):
+                    # Idle connections get dropped by most servers; reconnect on the next batch
+                    session.close()
+                    time.sleep(poll_interval)
+        finally:
+            session.close()
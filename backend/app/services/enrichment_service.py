@@ -0,0 +1,100 @@
+# backend/app/services/enrichment_service.py
+from bson.objectid import ObjectId
+from app.models.user import User
+from app.models.job import Job
+
+class EnrichmentService:
+    """Adds job / employer / jobseeker details to a page of matches or applications.
+
+    Every referenced collection is read once per page with a batched `$in`
+    query instead of one lookup per row.
+    """
+
+    JOB_FIELDS = {'title': 1, 'employer_id': 1, 'location': 1, 'remote': 1, 'salary_range': 1}
+    JOBSEEKER_FIELDS = {'name': 1, 'email': 1, 'location': 1, 'skills': 1, 'experience': 1}
+
+    @staticmethod
+    def _by_id(collection, ids, projection):
+        object_ids = []
+        for value in set(ids):
+            try:
+                object_ids.append(ObjectId(value))
+            except Exception:
+                continue
+        if not object_ids:
+            return {}
+        return {str(doc['_id']): doc for doc in collection.find({'_id': {'$in': object_ids}}, projection)}
+
+    @classmethod
+    def jobs_by_id(cls, job_ids):
+        return cls._by_id(Job.collection, job_ids, cls.JOB_FIELDS)
+
+    @classmethod
+    def jobseekers_by_id(cls, user_ids):
+        return cls._by_id(User.collection, user_ids, cls.JOBSEEKER_FIELDS)
+
+    @classmethod
+    def company_names(cls, employer_ids):
+        employers = cls._by_id(User.collection, employer_ids, {'company_name': 1})
+        return {employer_id: employer.get('company_name', '') for employer_id, employer in employers.items()}
+
+    @classmethod
+    def enrich_matches_with_jobs(cls, matches):
+        """Jobseeker view of matches; matches whose job no longer exists are dropped."""
+        jobs = cls.jobs_by_id(match['job_id'] for match in matches)
+        companies = cls.company_names(job['employer_id'] for job in jobs.values())
+
+        enriched = []
+        for match in matches:
+            job = jobs.get(match['job_id'])
+            if not job:
+                continue
+            match['job_title'] = job['title']
+            match['company_name'] = companies.get(str(job['employer_id']), '')
+            match['location'] = job['location']
+            match['remote'] = job.get('remote', False)
+            match['salary_range'] = job.get('salary_range', [])
+            enriched.append(match)
+        return enriched
+
+    @classmethod
+    def enrich_matches_with_jobseekers(cls, matches):
+        """Employer view of matches; matches whose jobseeker no longer exists are dropped."""
+        jobseekers = cls.jobseekers_by_id(match['user_id'] for match in matches)
+
+        enriched = []
+        for match in matches:
+            jobseeker = jobseekers.get(match['user_id'])
+            if not jobseeker:
+                continue
+            match['jobseeker_name'] = jobseeker['name']
+            match['jobseeker_location'] = jobseeker.get('location', '')
+            match['jobseeker_skills'] = jobseeker.get('skills', [])
+            match['jobseeker_experience'] = jobseeker.get('experience', 0)
+            enriched.append(match)
+        return enriched
+
+    @classmethod
+    def enrich_applications_with_jobs(cls, applications):
+        jobs = cls.jobs_by_id(application['job_id'] for application in applications)
+        companies = cls.company_names(job['employer_id'] for job in jobs.values())
+
+        for application in applications:
+            job = jobs.get(application['job_id'])
+            if job:
+                application['job_title'] = job['title']
+                application['company_name'] = companies.get(str(job['employer_id']), '')
+        return applications
+
+    @classmethod
+    def enrich_applications_with_jobseekers(cls, applications):
+        jobseekers = cls.jobseekers_by_id(application['jobseeker_id'] for application in applications)
+
+        for application in applications:
+            jobseeker = jobseekers.get(application['jobseeker_id'])
+            if jobseeker:
+                application['jobseeker_name'] = jobseeker.get('name', '')
+                application['jobseeker_email'] = jobseeker.get('email', '')
+                application['jobseeker_location'] = jobseeker.get('location', '')
+                application['jobseeker_skills'] = jobseeker.get('skills', [])
+        return applications
@@ -1,46 +1,218 @@
 # backend/app/services/file_service.py
+import hashlib
+import mimetypes
 import os
+import re
+import tempfile
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
-from flask import current_app
+from flask import current_app, request, send_file
+from app.models.stored_file import StoredFile
+
+# Uploads are stored by content: <subfolder>/<h[:2]>/<h[2:4]>/<sha256><ext>, so
+# re-uploading the same file reuses the stored copy.
+CONTENT_NAME = re.compile(r'^([0-9a-f]{64})(\.[a-z0-9]+)?$')
+
+
+def content_path(subfolder, sha256, extension=''):
+    """Upload-relative path of a content-addressed file"""
+    parts = [subfolder] if subfolder else []
+    return '/'.join(parts + [sha256[:2], sha256[2:4], sha256 + extension])
+
+
+def stream_to_temp(stream, temp_dir, chunk_size=64 * 1024):
+    """Copy a stream to a temp file in chunks while hashing it.
+
+    Returns (temp_path, sha256 hex digest, size in bytes).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+
+def store_uploaded_file(file, subfolder=''):
+    """Store an upload by content and take a reference on it.
+
+    Returns the metadata {path, sha256, size, content_type, original_name}.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    # The temp file lives under the upload folder so the final rename is atomic
+    temp_dir = os.path.join(upload_folder, '.tmp')
+    os.makedirs(temp_dir, exist_ok=True)
+
+    original_name = secure_filename(file.filename or '')
+    extension = os.path.splitext(original_name)[1].lower()
+    temp_path, sha256, size = stream_to_temp(
+        file.stream, temp_dir, current_app.config.get('UPLOAD_CHUNK_SIZE', 64 * 1024)
+    )
+
+    path = content_path(subfolder, sha256, extension)
+    metadata = {
+        'sha256': sha256,
+        'size': size,
+        'content_type': file.mimetype or mimetypes.guess_type(original_name)[0] or 'application/octet-stream',
+        'original_name': original_name
+    }
+
+    # Take the reference before moving the file in place, so a concurrent
+    # delete of the same content sees it and leaves the file alone; one
+    # already removing the file is waited for
+    stored = None
+    try:
+        stored = StoredFile.add_reference(path, metadata)
+        if stored.get('deleting'):
+            StoredFile.wait_until_deleted(path, current_app.config.get('UPLOAD_DELETE_TIMEOUT', 10))
+        full_path = os.path.join(upload_folder, *path.split('/'))
+        # Same hash, same bytes: an existing copy is kept as it is
+        if not os.path.exists(full_path):
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(temp_path, full_path)
+    except Exception:
+        if stored is not None:
+            delete_file(path)
+        raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return {'path': path, **metadata}
+
 
 def save_uploaded_file(file, subfolder=''):
     if not file:
         return None
-    
-    # Create upload directory if it doesn't exist
-    upload_folder = current_app.config['UPLOAD_FOLDER']
-    if subfolder:
-        upload_folder = os.path.join(upload_folder, subfolder)
-    
-    os.makedirs(upload_folder, exist_ok=True)
-    
-    # Secure the filename
-    filename = secure_filename(file.filename)
-    
-    # Add timestamp to filename to avoid collisions
-    from datetime import datetime
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    filename = f"{timestamp}_{filename}"
-    
-    # Save the file
-    file_path = os.path.join(upload_folder, filename)
-    file.save(file_path)
-    
+
     # Return relative path from uploads folder
-    if subfolder:
-        return os.path.join(subfolder, filename)
-    return filename
+    return store_uploaded_file(file, subfolder)['path']
+
+
+def resolve_upload_path(subfolder, filename):
+    """Absolute path of an uploaded file, or None if it escapes the folder.
+
+    Accepts the stored path, the path relative to `subfolder`, or the bare
+    content name (<sha256><ext>), which is expanded to its shard directories.
+    """
+    name = filename.replace('\\', '/').lstrip('/')
+    if subfolder and name.startswith(subfolder + '/'):
+        name = name[len(subfolder) + 1:]
+
+    match = CONTENT_NAME.match(name)
+    if match:
+        name = content_path('', match.group(1), match.group(2) or '')
+
+    folder = os.path.join(current_app.config['UPLOAD_FOLDER'], subfolder)
+    return safe_join(os.path.abspath(folder), name)
+
+
+def content_hash(file_path):
+    """SHA-256 encoded in a content-addressed file name, None for legacy files"""
+    match = CONTENT_NAME.match(os.path.basename(file_path))
+    return match.group(1) if match else None
+
+
+def _private_cache(response, max_age):
+    # Uploads are personal documents: browsers may keep them, shared caches may not
+    response.cache_control.public = None
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+def not_modified(full_path):
+    """304 response if the client already has this content-addressed file.
+
+    The hash is in the name and the content never changes, so this needs
+    neither a stat nor a database lookup.
+    """
+    sha256 = content_hash(full_path)
+    if not sha256 or not request.if_none_match.contains(sha256):
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(sha256)
+    return _private_cache(response, current_app.config.get('UPLOAD_CACHE_MAX_AGE', 3600))
+
+
+def send_upload(full_path, as_attachment=True):
+    """Serve an uploaded file with a strong ETag, Last-Modified and Range support.
+
+    With UPLOAD_SENDFILE_MODE set, only the headers are built here and the
+    reverse proxy streams the bytes (X-Sendfile or nginx X-Accel-Redirect).
+    """
+    mode = current_app.config.get('UPLOAD_SENDFILE_MODE') or ''
+    max_age = current_app.config.get('UPLOAD_CACHE_MAX_AGE', 3600)
+    etag = content_hash(full_path) or True
+
+    if mode not in ('x-sendfile', 'x-accel-redirect'):
+        response = send_file(full_path, as_attachment=as_attachment, etag=etag,
+                             conditional=True, max_age=max_age)
+        return _private_cache(response, max_age)
+
+    response = current_app.response_class(
+        mimetype=mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    )
+    if mode == 'x-sendfile':
+        response.headers['X-Sendfile'] = full_path
+    else:
+        relative = os.path.relpath(full_path, os.path.abspath(current_app.config['UPLOAD_FOLDER']))
+        prefix = current_app.config.get('UPLOAD_ACCEL_PREFIX', '/protected-uploads/')
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + relative.replace(os.sep, '/')
+    if as_attachment:
+        response.headers['Content-Disposition'] = f'attachment; filename="{os.path.basename(full_path)}"'
+
+    stat = os.stat(full_path)
+    response.last_modified = stat.st_mtime
+    response.set_etag(etag if isinstance(etag, str) else f'{stat.st_mtime}-{stat.st_size}')
+    response = response.make_conditional(request)
+    if response.status_code == 304:
+        response.headers.pop('X-Sendfile', None)
+        response.headers.pop('X-Accel-Redirect', None)
+    return _private_cache(response, max_age)
+
+
+def file_metadata(file_path):
+    """Size, hash and content type of a stored upload (None for legacy files)"""
+    return StoredFile.find(file_path)
+
+
+def retain_file(file_path):
+    """Take one more reference on an upload for another holder (e.g. an application)"""
+    return bool(file_path) and StoredFile.retain(file_path)
+
 
 def delete_file(file_path):
+    """Release one reference; the file is removed with the last one.
+
+    Returns True if the file was removed from disk.
+    """
     if not file_path:
         return False
-    
+
+    full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], *file_path.split('/'))
     try:
-        full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], file_path)
-        if os.path.exists(full_path):
-            os.remove(full_path)
-            return True
-    except Exception as e:
-        print(f"Error deleting file: {e}")
-    
-    return False
\ No newline at end of file
+        # Files uploaded before content addressing have no reference count and
+        # may be shared by earlier applications, so they are kept
+        token = StoredFile.release(file_path)
+        if not token:
+            return False
+        try:
+            if os.path.exists(full_path):
+                os.remove(full_path)
+        finally:
+            StoredFile.finish_delete(file_path, token)
+        return True
+    except Exception:
+        current_app.logger.exception(f'Could not delete upload {file_path}')
+        return False
@@ -0,0 +1,70 @@
+# backend/app/services/job_search.py
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from app.models.job import Job
+
+class JobSearch:
+    """Job search with a choice of engine (JOB_SEARCH_ENGINE).
+
+    `text` uses the MongoDB text index with textScore ranking. `bm25` ranks
+    the filtered jobs in process with Okapi BM25; it needs no text index and
+    is meant for test setups (e.g. mongomock) rather than production traffic.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    TEXT_FIELDS = ('title', 'description', 'required_skills', 'preferred_skills')
+
+    @classmethod
+    def search(cls, query, filters=None, limit=20, skip=0):
+        if current_app.config.get('JOB_SEARCH_ENGINE', 'text') == 'bm25':
+            return cls._bm25_search(query, filters, limit, skip)
+        return Job.search(query, limit, skip, filters)
+
+    @staticmethod
+    def tokenize(text):
+        return re.findall(r'\w+', text.lower())
+
+    @classmethod
+    def _document_tokens(cls, job):
+        parts = []
+        for field in cls.TEXT_FIELDS:
+            value = job.get(field) or ''
+            parts.append(' '.join(value) if isinstance(value, list) else str(value))
+        return cls.tokenize(' '.join(parts))
+
+    @classmethod
+    def _bm25_search(cls, query, filters, limit, skip):
+        terms = set(cls.tokenize(Job.text_search_terms(query)))
+        if not terms:
+            return []
+
+        jobs = list(Job.collection.find(Job.filter_query(filters)))
+        documents = [Counter(cls._document_tokens(job)) for job in jobs]
+        if not documents:
+            return []
+
+        average_length = sum(sum(document.values()) for document in documents) / len(documents) or 1
+        document_frequency = {term: sum(1 for document in documents if term in document) for term in terms}
+
+        scored = []
+        for job, document in zip(jobs, documents):
+            length = sum(document.values())
+            relevance = 0.0
+            for term in terms:
+                frequency = document.get(term, 0)
+                if not frequency:
+                    continue
+                idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                relevance += idf * frequency * (cls.K1 + 1) / (
+                    frequency + cls.K1 * (1 - cls.B + cls.B * length / average_length)
+                )
+            if relevance > 0:
+                job['relevance'] = relevance
+                scored.append(job)
+
+        scored.sort(key=lambda job: (job['relevance'], job.get('created_at') or datetime.min), reverse=True)
+        return scored[skip:skip + limit]
@@ -0,0 +1,159 @@
+# backend/app/services/match_queue.py
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from flask import current_app
+from app import mongo
+
+class MongoMatchQueue:
+    """Recompute tasks stored in the local `match_tasks` collection.
+
+    Pending tasks for the same entity are coalesced, so a burst of profile
+    edits only recomputes once. Tasks claimed by a worker that died are picked
+    up again after MATCH_TASK_TIMEOUT seconds. Tasks that ran out of attempts
+    are kept as `failed` until the MATCH_TASK_FAILED_RETENTION_DAYS TTL drops them.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else mongo.db.match_tasks
+
+    def enqueue(self, task):
+        now = datetime.utcnow()
+        key = {'kind': task['kind'], 'jobseeker_id': task.get('jobseeker_id'),
+               'job_id': task.get('job_id'), 'status': 'pending'}
+        update = self._coalesce_update(task)
+        update['$setOnInsert'] = {'attempts': 0, 'created_at': now, 'available_at': now}
+
+        try:
+            self.collection.update_one(key, update, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent enqueue inserted the pending task first: coalesce into it
+            self.collection.update_one(key, update)
+
+    def claim(self, worker_name, batch_size, timeout):
+        now = datetime.utcnow()
+        query = {'$or': [
+            {'status': 'pending', 'available_at': {'$lte': now}},
+            {'status': 'running', 'claimed_at': {'$lt': now - timedelta(seconds=timeout)}}
+        ]}
+        tasks = []
+        for _ in range(batch_size):
+            task = self.collection.find_one_and_update(
+                query,
+                {'$set': {'status': 'running', 'claimed_at': now, 'worker': worker_name},
+                 '$inc': {'attempts': 1}},
+                sort=[('available_at', 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not task:
+                break
+            tasks.append(task)
+        return tasks
+
+    def complete(self, task):
+        self.collection.delete_one({'_id': task['_id']})
+
+    def fail(self, task, error, max_attempts):
+        if task['attempts'] >= max_attempts:
+            update = {'status': 'failed', 'error': error, 'failed_at': datetime.utcnow()}
+        else:
+            # Exponential backoff before the next attempt
+            delay = timedelta(seconds=2 ** task['attempts'])
+            update = {'status': 'pending', 'error': error, 'available_at': datetime.utcnow() + delay}
+        try:
+            self.collection.update_one({'_id': task['_id']}, {'$set': update})
+        except DuplicateKeyError:
+            # The entity was enqueued again while this task ran: fold the
+            # failed work into that pending task instead of retrying it twice
+            key = {'kind': task['kind'], 'jobseeker_id': task.get('jobseeker_id'),
+                   'job_id': task.get('job_id'), 'status': 'pending'}
+            self.collection.update_one(key, self._coalesce_update(task))
+            self.collection.delete_one({'_id': task['_id']})
+
+    @staticmethod
+    def _coalesce_update(task):
+        # Coalesced tasks recompute the union of the changed fields; a task
+        # without fields asks for a full recompute
+        if task.get('full') or task.get('fields') is None:
+            return {'$set': {'full': True}}
+        return {'$addToSet': {'fields': {'$each': list(task['fields'])}}}
+
+    def pending_count(self):
+        return self.collection.count_documents({'status': 'pending'})
+
+
+class InMemoryMatchQueue:
+    """Process-local queue with the same interface, used in tests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self.failed = deque(maxlen=1000)
+
+    def enqueue(self, task):
+        key = (task['kind'], task.get('jobseeker_id'), task.get('job_id'))
+        with self._lock:
+            pending = self._pending.setdefault(key, {
+                '_id': ObjectId(), 'kind': task['kind'], 'jobseeker_id': task.get('jobseeker_id'),
+                'job_id': task.get('job_id'), 'fields': [], 'attempts': 0
+            })
+            if task.get('fields') is None:
+                pending['full'] = True
+            else:
+                pending['fields'] = sorted(set(pending['fields']) | set(task['fields']))
+
+    def claim(self, worker_name, batch_size, timeout):
+        with self._lock:
+            tasks = []
+            while self._pending and len(tasks) < batch_size:
+                _, task = self._pending.popitem(last=False)
+                task['attempts'] += 1
+                tasks.append(task)
+            return tasks
+
+    def complete(self, task):
+        pass
+
+    def fail(self, task, error, max_attempts):
+        task['error'] = error
+        if task['attempts'] >= max_attempts:
+            self.failed.append(task)
+            return
+        with self._lock:
+            self._pending[(task['kind'], task.get('jobseeker_id'), task.get('job_id'))] = task
+
+    def pending_count(self):
+        return len(self._pending)
+
+
+class MatchQueue:
+    """Entry point used by routes to request match recomputation."""
+
+    _memory_queue = None
+
+    @classmethod
+    def backend(cls):
+        if current_app.config.get('MATCH_QUEUE_BACKEND', 'mongo') == 'memory':
+            if cls._memory_queue is None:
+                cls._memory_queue = InMemoryMatchQueue()
+            return cls._memory_queue
+        return MongoMatchQueue()
+
+    @classmethod
+    def enqueue_jobseeker(cls, jobseeker_id, fields=None):
+        cls.backend().enqueue({'kind': 'jobseeker', 'jobseeker_id': jobseeker_id, 'fields': fields})
+
+    @classmethod
+    def enqueue_job(cls, job_id, fields=None):
+        cls.backend().enqueue({'kind': 'job', 'job_id': job_id, 'fields': fields})
+
+    @classmethod
+    def enqueue_pair(cls, jobseeker_id, job_id):
+        cls.backend().enqueue({'kind': 'pair', 'jobseeker_id': jobseeker_id, 'job_id': job_id})
+
+    @classmethod
+    def enqueue_resume(cls, jobseeker_id):
+        cls.backend().enqueue({'kind': 'resume', 'jobseeker_id': jobseeker_id})
@@ -0,0 +1,103 @@
+# backend/app/services/match_worker.py
+import time
+from collections import defaultdict
+from flask import current_app
+from app.services.match_queue import MatchQueue
+from app.services.matching_service import MatchingService
+from app.services.resume_parser import ResumeParser
+
+class MatchWorker:
+    """Consumes recompute tasks and refreshes the precomputed `matches` collection."""
+
+    @classmethod
+    def process(cls, queue, tasks):
+        max_attempts = current_app.config.get('MATCH_TASK_MAX_ATTEMPTS', 5)
+
+        # Pair tasks of the same jobseeker are scored together in one batch
+        pairs = defaultdict(list)
+        for task in tasks:
+            if task['kind'] == 'pair':
+                pairs[task['jobseeker_id']].append(task)
+
+        for jobseeker_id, pair_tasks in pairs.items():
+            try:
+                MatchingService.recompute_pairs(jobseeker_id, [task['job_id'] for task in pair_tasks])
+            except Exception as e:
+                current_app.logger.exception(f'Match pairs recompute failed for {jobseeker_id}')
+                for task in pair_tasks:
+                    queue.fail(task, str(e), max_attempts)
+            else:
+                for task in pair_tasks:
+                    queue.complete(task)
+
+        # Resumes of the batch are parsed in parallel by the parser pool
+        resume_tasks = [task for task in tasks if task['kind'] == 'resume']
+        if resume_tasks:
+            cls._process_resume_tasks(queue, resume_tasks, max_attempts)
+
+        for task in tasks:
+            if task['kind'] in ('pair', 'resume'):
+                continue
+            try:
+                cls._process_entity_task(task)
+            except Exception as e:
+                current_app.logger.exception(f'Match recompute task {task["_id"]} failed')
+                queue.fail(task, str(e), max_attempts)
+            else:
+                queue.complete(task)
+
+        return len(tasks)
+
+    @classmethod
+    def _process_resume_tasks(cls, queue, tasks, max_attempts):
+        try:
+            errors = ResumeParser.extract_for_jobseekers([task['jobseeker_id'] for task in tasks])
+        except Exception as e:
+            current_app.logger.exception('Resume extraction batch failed')
+            errors = {task['jobseeker_id']: str(e) for task in tasks}
+
+        for task in tasks:
+            error = errors.get(task['jobseeker_id'])
+            if error:
+                queue.fail(task, error, max_attempts)
+            else:
+                queue.complete(task)
+
+    @classmethod
+    def _process_entity_task(cls, task):
+        # Only the sub-scores that depend on the changed fields are recomputed,
+        # unless the change can alter the candidate set
+        fields = None if task.get('full') else task.get('fields')
+        components = MatchingService.components_for_fields(task['kind'], fields)
+
+        if task['kind'] == 'jobseeker':
+            if components is None:
+                MatchingService.recompute_for_jobseeker(task['jobseeker_id'])
+            elif components:
+                MatchingService.recompute_components(components, jobseeker_id=task['jobseeker_id'])
+        elif task['kind'] == 'job':
+            if components is None:
+                MatchingService.recompute_for_job(task['job_id'])
+            elif components:
+                MatchingService.sync_job_indexes(task['job_id'])
+                MatchingService.recompute_components(components, job_id=task['job_id'])
+
+    @classmethod
+    def run_once(cls, worker_name='inline'):
+        """Claim and process one batch of tasks. Returns the number processed."""
+        queue = MatchQueue.backend()
+        tasks = queue.claim(
+            worker_name,
+            current_app.config.get('MATCH_WORKER_BATCH_SIZE', 20),
+            current_app.config.get('MATCH_TASK_TIMEOUT', 600)
+        )
+        return cls.process(queue, tasks) if tasks else 0
+
+    @classmethod
+    def run_forever(cls, worker_name, stop_event=None):
+        poll_interval = current_app.config.get('MATCH_WORKER_POLL_INTERVAL', 2)
+        current_app.logger.info(f'Match worker {worker_name} started')
+
+        while stop_event is None or not stop_event.is_set():
+            if not cls.run_once(worker_name):
+                time.sleep(poll_interval)
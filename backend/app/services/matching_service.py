@@ -5,12 +5,25 @@ from app.models.match import Match
 from app.models.application import Application
 from bson.objectid import ObjectId
 from datetime import datetime
+import heapq
+import time
 import math
-import re
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from itertools import islice
+from scipy import sparse
 import numpy as np
+from flask import current_app
+from app.services.semantic_model import SemanticModel
+from app.services.skill_index import SkillIndex
+from app.services.match_queue import MatchQueue
+from app.services.enrichment_service import EnrichmentService
+from app.services.score_cache import ScoreCache
+from app.utils.metrics import record_stage, stage
+from app.utils.job_requirements import (
+    DERIVED_VERSION, DERIVED_SOURCE_FIELDS, EDUCATION_LEVELS,
+    derive_job_requirements, education_level, extract_education, extract_experience_years
+)
+from app.utils.profile_features import FEATURES_VERSION, derive_profile_features
 
 class MatchingService:
     # Weight configuration for different matching factors
@@ -24,6 +37,43 @@ class MatchingService:
         'behavior': 0.10
     }
     
+    # Education levels with scores (checked in order, first match wins)
+    EDUCATION_LEVELS = EDUCATION_LEVELS
+    
+    # Sub-scores that depend on each jobseeker / job field
+    JOBSEEKER_FIELD_COMPONENTS = {
+        'name': {'semantic'},
+        'skills': {'skills', 'semantic'},
+        'resume_skills': {'skills', 'semantic'},
+        'resume_text': {'semantic'},
+        'experience': {'experience', 'semantic'},
+        'education': {'education', 'semantic'},
+        'location': {'location'},
+        'salary_expectation': {'salary'},
+        'profile_complete': {'behavior'},
+        'last_active': {'behavior'}
+    }
+    JOB_FIELD_COMPONENTS = {
+        'title': {'semantic'},
+        'description': {'semantic', 'experience', 'education'},
+        'required_skills': {'skills', 'semantic'},
+        'preferred_skills': {'skills', 'semantic'},
+        'location': {'location'},
+        'remote': {'location'},
+        'salary_range': {'salary'}
+    }
+    # Sub-scores that are pure functions of these (jobseeker, job) fields,
+    # memoized by a fingerprint of their values
+    CACHED_COMPONENTS = {
+        'location': (('location',), ('location', 'remote')),
+        'salary': (('salary_expectation',), ('salary_range',))
+    }
+    # Fields that change which candidates get scored at all
+    CANDIDATE_FIELDS = {
+        'jobseeker': {'skills', 'resume_skills'},
+        'job': {'required_skills', 'preferred_skills', 'active'}
+    }
+    
     @classmethod
     def calculate_match(cls, jobseeker_id, job_id):
         # Get jobseeker and job data
@@ -38,68 +88,90 @@ class MatchingService:
             #return None
         
         # Calculate individual scores
-        skills_score = cls._calculate_skills_score(jobseeker, job)
-        experience_score = cls._calculate_experience_score(jobseeker, job)
-        education_score = cls._calculate_education_score(jobseeker, job)
-        location_score = cls._calculate_location_score(jobseeker, job)
-        salary_score = cls._calculate_salary_score(jobseeker, job)
-        semantic_score = cls._calculate_semantic_score(jobseeker, job)
-        behavior_score = cls._calculate_behavior_score(jobseeker, job)
+        result = cls._match_result(jobseeker_id, job_id, cls._calculate_scores(jobseeker, job))
+        match_ids, _ = cls._save_matches([result])
         
+        return {
+            'match_id': match_ids.get((jobseeker_id, job_id)),
+            'overall_score': result['overall_score'],
+            'breakdown': result['breakdown']
+        }
+    
+    @classmethod
+    def _match_result(cls, jobseeker_id, job_id, scores):
+        # Raw sub-scores are stored so single components can be recomputed later
+        overall_score, breakdown = cls._combine_scores(scores)
+        return {
+            'user_id': jobseeker_id,
+            'job_id': job_id,
+            'overall_score': overall_score,
+            'breakdown': breakdown,
+            'scores': {factor: float(scores[factor]) for factor in cls.WEIGHTS}
+        }
+    
+    @classmethod
+    def _calculate_scores(cls, jobseeker, job):
+        jobseeker = cls._with_features(jobseeker)
+        scores = {}
+        for factor in cls.WEIGHTS:
+            start = time.perf_counter()
+            scores[factor] = cls._component_score(factor, jobseeker, job)
+            record_stage(f'score.{factor}', time.perf_counter() - start)
+        return scores
+    
+    @classmethod
+    def _component_score(cls, factor, jobseeker, job):
+        calculate = getattr(cls, f'_calculate_{factor}_score')
+        if factor not in cls.CACHED_COMPONENTS:
+            return calculate(jobseeker, job)
+        
+        jobseeker_fields, job_fields = cls.CACHED_COMPONENTS[factor]
+        key = ScoreCache.fingerprint(
+            factor,
+            tuple(jobseeker.get(field) for field in jobseeker_fields),
+            tuple(job.get(field) for field in job_fields)
+        )
+        return ScoreCache.get_or_compute(key, lambda: calculate(jobseeker, job))
+    
+    @classmethod
+    def _combine_scores(cls, scores):
         # Calculate overall score
         overall_score = (
-            skills_score * cls.WEIGHTS['skills'] +
-            experience_score * cls.WEIGHTS['experience'] +
-            education_score * cls.WEIGHTS['education'] +
-            location_score * cls.WEIGHTS['location'] +
-            salary_score * cls.WEIGHTS['salary'] +
-            semantic_score * cls.WEIGHTS['semantic'] +
-            behavior_score * cls.WEIGHTS['behavior']
+            scores['skills'] * cls.WEIGHTS['skills'] +
+            scores['experience'] * cls.WEIGHTS['experience'] +
+            scores['education'] * cls.WEIGHTS['education'] +
+            scores['location'] * cls.WEIGHTS['location'] +
+            scores['salary'] * cls.WEIGHTS['salary'] +
+            scores['semantic'] * cls.WEIGHTS['semantic'] +
+            scores['behavior'] * cls.WEIGHTS['behavior']
         )
         
         # Round to nearest integer
         overall_score = int(round(overall_score))
         
         # Create match breakdown
-        breakdown = {
-            'skills': int(round(skills_score)),
-            'experience': int(round(experience_score)),
-            'education': int(round(education_score)),
-            'location': int(round(location_score)),
-            'salary': int(round(salary_score)),
-            'semantic': int(round(semantic_score)),
-            'behavior': int(round(behavior_score))
-        }
-        
-        # Save or update match
-        match_data = {
-            'user_id': jobseeker_id,
-            'job_id': job_id,
-            'overall_score': overall_score,
-            'breakdown': breakdown,
-            'updated_at': datetime.utcnow()
-        }
+        breakdown = {factor: int(round(scores[factor])) for factor in cls.WEIGHTS}
         
-        existing_match = Match.find_by_user_job(jobseeker_id, job_id)
-        if existing_match:
-            Match.update(str(existing_match['_id']), match_data)
-            match_id = str(existing_match['_id'])
-        else:
-            match_data['created_at'] = datetime.utcnow()
-            match_id = Match.create(match_data)
-        
-        return {
-            'match_id': match_id,
-            'overall_score': overall_score,
-            'breakdown': breakdown
-        }
+        return overall_score, breakdown
+    
+    @classmethod
+    def _save_matches(cls, results):
+        # Persist all scored pairs with a single bulk write
+        with stage('matches.upsert'):
+            match_ids, counts = Match.bulk_upsert(results)
+        current_app.logger.info(
+            f"Saved {len(results)} matches: {counts['inserted']} inserted, "
+            f"{counts['modified']} modified, {counts['unchanged']} unchanged"
+        )
+        return match_ids, counts
     
     @classmethod
     def _calculate_skills_score(cls, jobseeker, job):
         # Get jobseeker skills and job required/preferred skills
-        jobseeker_skills = set(skill.lower() for skill in jobseeker.get('skills', []))
-        required_skills = set(skill.lower() for skill in job.get('required_skills', []))
-        preferred_skills = set(skill.lower() for skill in job.get('preferred_skills', []))
+        jobseeker_skills = set(cls._jobseeker_features(jobseeker)['skills'])
+        requirements = cls._job_requirements(job)
+        required_skills = set(requirements['required_skills'])
+        preferred_skills = set(requirements['preferred_skills'])
         
         # Calculate skill overlap
         required_match = len(jobseeker_skills & required_skills) / max(len(required_skills), 1)
@@ -112,11 +184,11 @@ class MatchingService:
     
     @classmethod
     def _calculate_experience_score(cls, jobseeker, job):
-        # Extract years of experience from job description
-        job_exp_required = cls._extract_experience_from_text(job.get('description', ''))
+        # Years of experience asked for in the job description
+        job_exp_required = cls._job_requirements(job)['min_experience_years']
         
         # Get jobseeker experience
-        jobseeker_exp = jobseeker.get('experience', 0)
+        jobseeker_exp = cls._jobseeker_features(jobseeker)['experience_years']
         
         # Calculate score based on how well experience matches requirements
         if job_exp_required <= 0:
@@ -132,35 +204,9 @@ class MatchingService:
     
     @classmethod
     def _calculate_education_score(cls, jobseeker, job):
-        # Define education levels with scores
-        education_levels = {
-            'high school': 20,
-            'certificate': 30,
-            'associate': 40,
-            'bachelor': 60,
-            'master': 80,
-            'phd': 100,
-            'doctorate': 100
-        }
-        
-        # Extract education requirements from job description
-        job_education = cls._extract_education_from_text(job.get('description', ''))
-        
-        # Get jobseeker education
-        jobseeker_education = jobseeker.get('education', '').lower()
-        
-        # Get scores for both
-        jobseeker_score = 0
-        for level, score in education_levels.items():
-            if level in jobseeker_education:
-                jobseeker_score = score
-                break
-        
-        job_required_score = 0
-        for level, score in education_levels.items():
-            if level in job_education:
-                job_required_score = score
-                break
+        # Get scores for both; the job's is parsed from its description
+        jobseeker_score = cls._jobseeker_features(jobseeker)['education_level']
+        job_required_score = cls._job_requirements(job)['required_education_level']
         
         # If no specific requirement, give full score
         if job_required_score == 0:
@@ -172,16 +218,23 @@ class MatchingService:
         else:
             return max(0, (jobseeker_score / job_required_score) * 100)
     
+    @classmethod
+    def _education_level_score(cls, education):
+        return education_level(education)
+    
     @classmethod
     def _calculate_location_score(cls, jobseeker, job):
         # Check if job is remote
         if job.get('remote', False):
             return 100
         
-        # Get locations
-        jobseeker_location = jobseeker.get('location', '').lower()
-        job_location = job.get('location', '').lower()
-        
+        return cls._score_locations(
+            cls._jobseeker_features(jobseeker)['location'],
+            job.get('location', '').lower()
+        )
+    
+    @classmethod
+    def _score_locations(cls, jobseeker_location, job_location):
         # Exact match
         if jobseeker_location == job_location:
             return 100
@@ -207,7 +260,7 @@ class MatchingService:
     @classmethod
     def _calculate_salary_score(cls, jobseeker, job):
         # Get salary ranges
-        jobseeker_salary = jobseeker.get('salary_expectation', [0, 0])
+        jobseeker_salary = cls._jobseeker_features(jobseeker)['salary_bounds']
         job_salary = job.get('salary_range', [0, 0])
         
         # If no salary info, give neutral score
@@ -249,38 +302,8 @@ class MatchingService:
     
     @classmethod
     def _calculate_semantic_score(cls, jobseeker, job):
-        # Get text data
-        jobseeker_text = ' '.join([
-            jobseeker.get('name', ''),
-            ' '.join(jobseeker.get('skills', [])),
-            jobseeker.get('education', ''),
-            str(jobseeker.get('experience', 0))
-        ]).lower()
-        
-        job_text = ' '.join([
-            job.get('title', ''),
-            job.get('description', ''),
-            ' '.join(job.get('required_skills', [])),
-            ' '.join(job.get('preferred_skills', []))
-        ]).lower()
-        
-        # If no text data, return neutral score
-        if not jobseeker_text or not job_text:
-            return 50
-        
-        # Create TF-IDF vectors
-        vectorizer = TfidfVectorizer(stop_words='english')
-        try:
-            tfidf_matrix = vectorizer.fit_transform([jobseeker_text, job_text])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            # Convert to 0-100 scale
-            return min(100, similarity * 100)
-        except:
-            # If TF-IDF fails, return neutral score
-            return 50
+        # Cosine similarity against the corpus-level TF-IDF model
+        return float(SemanticModel.score_jobs(jobseeker, [job])[0])
     
     @classmethod
     def _calculate_behavior_score(cls, jobseeker, job):
@@ -319,90 +342,647 @@ class MatchingService:
     
     @classmethod
     def _extract_experience_from_text(cls, text):
-        # Look for patterns like "5+ years", "3-5 years", etc.
-        patterns = [
-            r'(\d+)\+?\s*years?',
-            r'(\d+)\s*-\s*(\d+)\s*years?'
-        ]
+        return extract_experience_years(text)
+    
+    @classmethod
+    def _extract_education_from_text(cls, text):
+        return extract_education(text)
+    
+    @classmethod
+    def _jobseeker_features(cls, jobseeker):
+        # Stored by User.update_profile / calculate_profile_completeness;
+        # profiles written before (or by an older version) are derived here
+        features = jobseeker.get('features')
+        if features and features.get('version') == FEATURES_VERSION:
+            return features
+        return derive_profile_features(jobseeker)
+    
+    @classmethod
+    def _with_features(cls, jobseeker):
+        # Derives missing features once for all the sub-scores of a jobseeker
+        features = jobseeker.get('features')
+        if features and features.get('version') == FEATURES_VERSION:
+            return jobseeker
+        return {**jobseeker, 'features': derive_profile_features(jobseeker)}
+    
+    @classmethod
+    def _job_requirements(cls, job):
+        # Stored at write time by Job.create / Job.update; jobs written before
+        # (or by an older version) are parsed here and memoized
+        derived = job.get('derived')
+        if derived and derived.get('version') == DERIVED_VERSION:
+            return derived
+        return ScoreCache.get_or_compute(
+            ScoreCache.fingerprint('requirements', tuple(job.get(field) for field in DERIVED_SOURCE_FIELDS)),
+            lambda: derive_job_requirements(job)
+        )
+    
+    # ------------------------------------------------------------------
+    # Batch scoring: one jobseeker against many jobs in a single pass
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def calculate_matches_batch(cls, jobseeker, jobs):
+        """Score a jobseeker against a list of jobs with vectorized NumPy operations.
+        
+        Returns a list of (overall_score, breakdown) tuples in the order of ``jobs``,
+        identical to what calculate_match computes pair by pair.
+        """
+        return [cls._combine_scores(scores) for scores in cls._batch_component_scores(jobseeker, jobs)]
+    
+    @classmethod
+    def _batch_component_scores(cls, jobseeker, jobs):
+        # Raw sub-scores of every job, one dict per job
+        if not jobs:
+            return []
+        
+        scores = cls._score_encoded_jobs(jobseeker, cls._encode_jobs(jobs))
+        columns = {factor: scores[factor].tolist() for factor in cls.WEIGHTS}
+        return [{factor: columns[factor][i] for factor in cls.WEIGHTS} for i in range(len(jobs))]
+    
+    @classmethod
+    def _encode_jobs(cls, jobs):
+        # Skill vocabulary shared by required and preferred skills
+        vocabulary = {}
+        required_rows, required_cols = [], []
+        preferred_rows, preferred_cols = [], []
+        requirements = [cls._job_requirements(job) for job in jobs]
+        for row, job_requirements in enumerate(requirements):
+            for skill in job_requirements['required_skills']:
+                required_rows.append(row)
+                required_cols.append(vocabulary.setdefault(skill, len(vocabulary)))
+            for skill in job_requirements['preferred_skills']:
+                preferred_rows.append(row)
+                preferred_cols.append(vocabulary.setdefault(skill, len(vocabulary)))
+        
+        shape = (len(jobs), max(len(vocabulary), 1))
+        required = sparse.csr_matrix(
+            (np.ones(len(required_rows)), (required_rows, required_cols)), shape=shape
+        )
+        preferred = sparse.csr_matrix(
+            (np.ones(len(preferred_rows)), (preferred_rows, preferred_cols)), shape=shape
+        )
+        
+        # Requirements parsed from the job descriptions
+        experience_required = np.array(
+            [job_requirements['min_experience_years'] for job_requirements in requirements], dtype=float
+        )
+        education_required = np.array(
+            [job_requirements['required_education_level'] for job_requirements in requirements], dtype=float
+        )
         
-        for pattern in patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                if len(match.groups()) == 2:
-                    # Range like "3-5 years", take the average
-                    return (int(match.group(1)) + int(match.group(2))) / 2
+        # Salary ranges; jobs without a usable range get a neutral score
+        salary_min = np.zeros(len(jobs))
+        salary_max = np.zeros(len(jobs))
+        salary_valid = np.zeros(len(jobs), dtype=bool)
+        for row, job in enumerate(jobs):
+            salary_range = job.get('salary_range', [0, 0])
+            if salary_range and len(salary_range) >= 2 and 0 not in salary_range:
+                salary_min[row], salary_max[row] = salary_range[0], salary_range[1]
+                salary_valid[row] = True
+        
+        # Locations are scored once per distinct string
+        locations, location_codes = np.unique(
+            [job.get('location', '').lower() for job in jobs], return_inverse=True
+        )
+        remote = np.array([bool(job.get('remote', False)) for job in jobs])
+        
+        return {
+            'size': len(jobs),
+            'jobs': jobs,
+            'skill_vocabulary': vocabulary,
+            'required_skills': required,
+            'preferred_skills': preferred,
+            'required_counts': np.asarray(required.sum(axis=1)).ravel(),
+            'preferred_counts': np.asarray(preferred.sum(axis=1)).ravel(),
+            'experience_required': experience_required,
+            'education_required': education_required,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_valid': salary_valid,
+            'locations': locations.tolist(),
+            'location_codes': location_codes,
+            'remote': remote
+        }
+    
+    @classmethod
+    def _score_encoded_jobs(cls, jobseeker, encoded):
+        jobseeker = cls._with_features(jobseeker)
+        scores = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for factor in cls.WEIGHTS:
+                start = time.perf_counter()
+                if factor == 'behavior':
+                    # Profile-only score, the same for every job
+                    scores[factor] = np.full(encoded['size'], float(cls._calculate_behavior_score(jobseeker, None)))
                 else:
-                    # Single value like "5+ years"
-                    return int(match.group(1))
+                    scores[factor] = getattr(cls, f'_batch_{factor}_scores')(jobseeker, encoded)
+                record_stage(f'score.{factor}', time.perf_counter() - start)
+        return scores
+    
+    @classmethod
+    def _batch_skills_scores(cls, jobseeker, encoded):
+        vocabulary = encoded['skill_vocabulary']
+        jobseeker_vector = np.zeros(encoded['required_skills'].shape[1])
+        for skill in cls._jobseeker_features(jobseeker)['skills']:
+            if skill in vocabulary:
+                jobseeker_vector[vocabulary[skill]] = 1
         
-        return 0
+        required_match = (encoded['required_skills'] @ jobseeker_vector) / np.maximum(encoded['required_counts'], 1)
+        preferred_match = (encoded['preferred_skills'] @ jobseeker_vector) / np.maximum(encoded['preferred_counts'], 1)
+        
+        return cls._skills_scores(required_match, preferred_match)
     
     @classmethod
-    def _extract_education_from_text(cls, text):
-        # Look for education level keywords
-        education_keywords = [
-            'phd', 'doctorate', 'master', 'bachelor', 'associate',
-            'certificate', 'high school', 'degree'
-        ]
+    def _batch_experience_scores(cls, jobseeker, encoded):
+        return cls._experience_scores(
+            cls._jobseeker_features(jobseeker)['experience_years'], encoded['experience_required']
+        )
+    
+    @classmethod
+    def _batch_education_scores(cls, jobseeker, encoded):
+        return cls._education_scores(
+            cls._jobseeker_features(jobseeker)['education_level'], encoded['education_required']
+        )
+    
+    @classmethod
+    def _batch_location_scores(cls, jobseeker, encoded):
+        jobseeker_location = cls._jobseeker_features(jobseeker)['location']
+        location_scores = np.array(
+            [cls._score_locations(jobseeker_location, location) for location in encoded['locations']],
+            dtype=float
+        )
         
-        text_lower = text.lower()
-        for keyword in education_keywords:
-            if keyword in text_lower:
-                return keyword
+        return np.where(encoded['remote'], 100, location_scores[encoded['location_codes']])
+    
+    @classmethod
+    def _batch_salary_scores(cls, jobseeker, encoded):
+        jobseeker_salary = cls._jobseeker_features(jobseeker)['salary_bounds']
+        if not jobseeker_salary:
+            return np.full(encoded['size'], 50.0)
         
-        return ''
+        scores = cls._salary_scores(
+            jobseeker_salary[0], jobseeker_salary[1], encoded['salary_min'], encoded['salary_max']
+        )
+        return np.where(encoded['salary_valid'], scores, 50)
+    
+    @classmethod
+    def _batch_semantic_scores(cls, jobseeker, encoded):
+        return SemanticModel.score_jobs(jobseeker, encoded['jobs'])
+    
+    # ------------------------------------------------------------------
+    # Batch scoring: many jobseekers against one job in a single pass
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def _batch_jobseekers_component_scores(cls, jobseekers, job):
+        # Raw sub-scores of every jobseeker, one dict per jobseeker
+        if not jobseekers:
+            return []
+        
+        scores = cls._score_encoded_jobseekers(cls._encode_jobseekers(jobseekers), job)
+        columns = {factor: scores[factor].tolist() for factor in cls.WEIGHTS}
+        return [{factor: columns[factor][i] for factor in cls.WEIGHTS} for i in range(len(jobseekers))]
     
     @classmethod
-    def generate_matches_for_jobseeker(cls, jobseeker_id, limit=20):
-        # Get all active jobs
-        jobs = Job.find_all()
+    def _encode_jobseekers(cls, jobseekers):
+        jobseekers = [cls._with_features(jobseeker) for jobseeker in jobseekers]
+        features = [jobseeker['features'] for jobseeker in jobseekers]
+        
+        # Salary expectations; profiles without one get a neutral score
+        salary_min = np.zeros(len(jobseekers))
+        salary_max = np.zeros(len(jobseekers))
+        salary_valid = np.zeros(len(jobseekers), dtype=bool)
+        for row, jobseeker_features in enumerate(features):
+            if jobseeker_features['salary_bounds']:
+                salary_min[row], salary_max[row] = jobseeker_features['salary_bounds']
+                salary_valid[row] = True
+        
+        # Locations are scored once per distinct string
+        locations, location_codes = np.unique(
+            [jobseeker_features['location'] for jobseeker_features in features], return_inverse=True
+        )
         
-        # Calculate matches for each job
-        matches = []
-        for job in jobs:
-            # Skip if already applied
-            if Application.has_applied(jobseeker_id, str(job['_id'])):
-                continue
+        return {
+            'size': len(jobseekers),
+            'jobseekers': jobseekers,
+            'skills': [set(jobseeker_features['skills']) for jobseeker_features in features],
+            'experience_years': np.array([f['experience_years'] for f in features], dtype=float),
+            'education_level': np.array([f['education_level'] for f in features], dtype=float),
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_valid': salary_valid,
+            'locations': locations.tolist(),
+            'location_codes': location_codes
+        }
+    
+    @classmethod
+    def _score_encoded_jobseekers(cls, encoded, job):
+        scores = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for factor in cls.WEIGHTS:
+                start = time.perf_counter()
+                scores[factor] = getattr(cls, f'_batch_jobseekers_{factor}_scores')(encoded, job)
+                record_stage(f'score.{factor}', time.perf_counter() - start)
+        return scores
+    
+    @classmethod
+    def _batch_jobseekers_skills_scores(cls, encoded, job):
+        requirements = cls._job_requirements(job)
+        required_skills = set(requirements['required_skills'])
+        preferred_skills = set(requirements['preferred_skills'])
+        
+        required_match = np.array(
+            [len(skills & required_skills) for skills in encoded['skills']], dtype=float
+        ) / max(len(required_skills), 1)
+        preferred_match = np.array(
+            [len(skills & preferred_skills) for skills in encoded['skills']], dtype=float
+        ) / max(len(preferred_skills), 1)
+        
+        return cls._skills_scores(required_match, preferred_match)
+    
+    @classmethod
+    def _batch_jobseekers_experience_scores(cls, encoded, job):
+        return cls._experience_scores(
+            encoded['experience_years'], cls._job_requirements(job)['min_experience_years']
+        )
+    
+    @classmethod
+    def _batch_jobseekers_education_scores(cls, encoded, job):
+        return cls._education_scores(
+            encoded['education_level'], cls._job_requirements(job)['required_education_level']
+        )
+    
+    @classmethod
+    def _batch_jobseekers_location_scores(cls, encoded, job):
+        if job.get('remote', False):
+            return np.full(encoded['size'], 100.0)
+        
+        job_location = job.get('location', '').lower()
+        location_scores = np.array(
+            [cls._score_locations(location, job_location) for location in encoded['locations']],
+            dtype=float
+        )
+        return location_scores[encoded['location_codes']]
+    
+    @classmethod
+    def _batch_jobseekers_salary_scores(cls, encoded, job):
+        job_salary = job.get('salary_range', [0, 0])
+        if not job_salary or len(job_salary) < 2 or 0 in job_salary:
+            return np.full(encoded['size'], 50.0)
+        
+        scores = cls._salary_scores(encoded['salary_min'], encoded['salary_max'], job_salary[0], job_salary[1])
+        return np.where(encoded['salary_valid'], scores, 50)
+    
+    @classmethod
+    def _batch_jobseekers_semantic_scores(cls, encoded, job):
+        return SemanticModel.score_jobseekers(encoded['jobseekers'], job)
+    
+    @classmethod
+    def _batch_jobseekers_behavior_scores(cls, encoded, job):
+        # Profile-only score
+        return np.array(
+            [float(cls._calculate_behavior_score(jobseeker, job)) for jobseeker in encoded['jobseekers']]
+        )
+    
+    # ------------------------------------------------------------------
+    # Sub-score formulas shared by both batch directions; the jobseeker and
+    # the job side broadcast, so either can be a scalar
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def _skills_scores(cls, required_match, preferred_match):
+        return np.minimum(100, (required_match * 0.7 + preferred_match * 0.3) * 100)
+    
+    @classmethod
+    def _experience_scores(cls, jobseeker_exp, required):
+        ratio = jobseeker_exp / required
+        
+        above = np.minimum(100, 80 + (np.minimum(ratio, 1.5) - 1) * 40)
+        below = np.maximum(0, ratio * 80)
+        
+        return np.where(required <= 0, 100, np.where(jobseeker_exp >= required, above, below))
+    
+    @classmethod
+    def _education_scores(cls, jobseeker_score, required):
+        partial = np.maximum(0, (jobseeker_score / required) * 100)
+        
+        return np.where((required == 0) | (jobseeker_score >= required), 100, partial)
+    
+    @classmethod
+    def _salary_scores(cls, seeker_min, seeker_max, job_min, job_max):
+        min_overlap = np.maximum(seeker_min, job_min)
+        max_overlap = np.minimum(seeker_max, job_max)
+        
+        # No overlap: penalty based on how far apart the ranges are
+        seeker_above = seeker_min > job_max
+        gap = np.where(seeker_above, seeker_min - job_max, job_min - seeker_max)
+        max_gap = np.where(seeker_above, job_max, seeker_max)
+        penalty = np.where(max_gap > 0, np.minimum(50, (gap / max_gap) * 100), 50)
+        gap_scores = np.maximum(0, 50 - penalty)
+        
+        # Overlap: score on average overlap percentage of both ranges
+        overlap_range = max_overlap - min_overlap
+        seeker_range = seeker_max - seeker_min
+        job_range = job_max - job_min
+        overlap_pct = (
+            np.where(seeker_range > 0, overlap_range / seeker_range, 0) +
+            np.where(job_range > 0, overlap_range / job_range, 0)
+        ) / 2
+        overlap_scores = np.minimum(100, 50 + overlap_pct * 50)
+        
+        return np.where(max_overlap < min_overlap, gap_scores, overlap_scores)
+    
+    @classmethod
+    def job_changed(cls, job_id, changed_fields=None):
+        # Keep the in-process indexes in sync and schedule match recomputation.
+        # changed_fields=None means the whole job is new or must be rescored.
+        if not cls.sync_job_indexes(job_id):
+            return
+        if changed_fields is None or cls.components_for_fields('job', changed_fields) != set():
+            MatchQueue.enqueue_job(job_id, changed_fields)
+    
+    @classmethod
+    def jobseeker_changed(cls, jobseeker_id, changed_fields=None):
+        if not cls.sync_jobseeker_indexes(jobseeker_id):
+            return
+        if changed_fields is None or cls.components_for_fields('jobseeker', changed_fields) != set():
+            MatchQueue.enqueue_jobseeker(jobseeker_id, changed_fields)
+    
+    @classmethod
+    def components_for_fields(cls, kind, fields):
+        """Sub-scores affected by a set of changed fields, or None if a full recompute is needed."""
+        if fields is None or set(fields) & cls.CANDIDATE_FIELDS[kind]:
+            return None
+        
+        field_components = cls.JOBSEEKER_FIELD_COMPONENTS if kind == 'jobseeker' else cls.JOB_FIELD_COMPONENTS
+        components = set()
+        for field in fields:
+            components |= field_components.get(field, set())
+        return components
+    
+    @classmethod
+    def sync_job_indexes(cls, job_id):
+        job = Job.find_by_id(job_id)
+        if job and job.get('active', True):
+            SemanticModel.update_job(job)
+            SkillIndex.update_job(job)
+            return job
+        
+        SemanticModel.remove_job(job_id)
+        SkillIndex.remove_job(job_id)
+        return None
+    
+    @classmethod
+    def sync_jobseeker_indexes(cls, jobseeker_id):
+        jobseeker = User.find_by_id(jobseeker_id)
+        if not jobseeker or jobseeker.get('role') != 'jobseeker':
+            return None
+        
+        SkillIndex.update_jobseeker(jobseeker)
+        return jobseeker
+    
+    @classmethod
+    def _candidate_limits(cls, limit):
+        candidate_limit = current_app.config.get('MATCH_CANDIDATE_LIMIT', 1000)
+        min_candidates = min(max(current_app.config.get('MATCH_MIN_CANDIDATES', 50), limit), candidate_limit)
+        return candidate_limit, min_candidates
+    
+    @classmethod
+    def _candidate_job_ids(cls, jobseeker, applied_job_ids, limit):
+        candidate_limit, min_candidates = cls._candidate_limits(limit)
+        
+        # Jobs sharing at least one skill, most overlapping first
+        job_ids = SkillIndex.candidate_job_ids(
+            User.matching_skills(jobseeker), candidate_limit, exclude=applied_job_ids
+        )
+        
+        # Recall guard: top up with the most recent jobs
+        if len(job_ids) < min_candidates:
+            job_ids += Job.find_recent_ids(
+                min_candidates - len(job_ids), exclude_ids=set(job_ids) | applied_job_ids
+            )
+        
+        return job_ids
+    
+    @classmethod
+    def _candidate_jobseeker_ids(cls, job, applied_jobseeker_ids, limit):
+        candidate_limit, min_candidates = cls._candidate_limits(limit)
+        
+        # Jobseekers sharing at least one skill, most overlapping first
+        jobseeker_ids = SkillIndex.candidate_jobseeker_ids(
+            job.get('required_skills', []) + job.get('preferred_skills', []),
+            candidate_limit, exclude=applied_jobseeker_ids
+        )
+        
+        # Recall guard: top up with the most recently active jobseekers
+        if len(jobseeker_ids) < min_candidates:
+            jobseeker_ids += User.find_recent_jobseeker_ids(
+                min_candidates - len(jobseeker_ids),
+                exclude_ids=set(jobseeker_ids) | applied_jobseeker_ids
+            )
+        
+        return jobseeker_ids
+    
+    @classmethod
+    def _score_candidates(cls, candidates, score_chunk, keep):
+        """Score and store a stream of candidates chunk by chunk.
+        
+        Only the `keep` best (document, result, match_id) triples are retained,
+        in a bounded min-heap, so memory stays O(keep + chunk size) however
+        many candidates there are. Returns them best first with the write counts.
+        """
+        chunk_size = current_app.config.get('MATCH_SCORE_CHUNK_SIZE', 256)
+        candidates = iter(candidates)
+        top = []
+        counts = Counter(inserted=0, modified=0, unchanged=0)
+        position = 0
+        
+        while True:
+            chunk = list(islice(candidates, chunk_size))
+            if not chunk:
+                break
+            
+            results = score_chunk(chunk)
+            match_ids, chunk_counts = cls._save_matches(results)
+            counts.update(chunk_counts)
             
-            # Calculate match
-            match_result = cls.calculate_match(jobseeker_id, str(job['_id']))
-            if match_result:
-                match_result['job_id'] = str(job['_id'])
-                match_result['job_title'] = job['title']
-                match_result['company_name'] = User.find_by_id(job['employer_id'])['company_name']
-                match_result['location'] = job['location']
-                match_result['remote'] = job.get('remote', False)
-                match_result['salary_range'] = job.get('salary_range', [])
-                matches.append(match_result)
+            for doc, result in zip(chunk, results):
+                position += 1
+                if keep <= 0:
+                    continue
+                # Ties keep the earlier candidate, like a stable sort
+                entry = (result['overall_score'], -position, doc, result,
+                         match_ids.get((result['user_id'], result['job_id'])))
+                if len(top) < keep:
+                    heapq.heappush(top, entry)
+                elif entry[:2] > top[0][:2]:
+                    heapq.heapreplace(top, entry)
+        
+        top.sort(key=lambda entry: entry[:2], reverse=True)
+        return [(doc, result, match_id) for _, _, doc, result, match_id in top], dict(counts)
+    
+    @classmethod
+    def _score_jobseeker(cls, jobseeker, limit, keep=0):
+        jobseeker_id = str(jobseeker['_id'])
+        
+        # Get candidate jobs the jobseeker has not applied to yet
+        with stage('candidates.applied'):
+            applied_job_ids = Application.find_job_ids_by_jobseeker(jobseeker_id)
+        with stage('candidates.select'):
+            candidate_ids = cls._candidate_job_ids(jobseeker, applied_job_ids, limit)
+        jobs = Job.iter_by_ids(candidate_ids, batch_size=current_app.config.get('MATCH_SCORE_CHUNK_SIZE', 256))
+        
+        # Each chunk of jobs is scored in one vectorized pass
+        def score_chunk(chunk):
+            return [
+                cls._match_result(jobseeker_id, str(job['_id']), scores)
+                for job, scores in zip(chunk, cls._batch_component_scores(jobseeker, chunk))
+            ]
+        
+        return cls._score_candidates(jobs, score_chunk, keep)
+    
+    @classmethod
+    def _score_job(cls, job, limit, keep=0):
+        job_id = str(job['_id'])
+        
+        # Get candidate jobseekers who have not applied yet
+        with stage('candidates.applied'):
+            applied_jobseeker_ids = Application.find_jobseeker_ids_by_job(job_id)
+        with stage('candidates.select'):
+            candidate_ids = cls._candidate_jobseeker_ids(job, applied_jobseeker_ids, limit)
+        jobseekers = User.iter_by_ids(candidate_ids, batch_size=current_app.config.get('MATCH_SCORE_CHUNK_SIZE', 256))
+        
+        # Each chunk of jobseekers is scored in one vectorized pass
+        def score_chunk(chunk):
+            return [
+                cls._match_result(str(jobseeker['_id']), job_id, scores)
+                for jobseeker, scores in zip(chunk, cls._batch_jobseekers_component_scores(chunk, job))
+            ]
+        
+        return cls._score_candidates(jobseekers, score_chunk, keep)
+    
+    @classmethod
+    def recompute_for_jobseeker(cls, jobseeker_id):
+        """Recompute and store the matches of one jobseeker (background worker)."""
+        jobseeker = cls.sync_jobseeker_indexes(jobseeker_id)
+        if not jobseeker:
+            return None
+        return cls._score_jobseeker(jobseeker, 0)[1]
+    
+    @classmethod
+    def recompute_for_job(cls, job_id):
+        """Recompute and store the matches of one job (background worker)."""
+        job = cls.sync_job_indexes(job_id)
+        if not job:
+            return None
+        return cls._score_job(job, 0)[1]
+    
+    @classmethod
+    def recompute_pairs(cls, jobseeker_id, job_ids):
+        """Recompute and store specific jobseeker x job pairs in one batch."""
+        jobseeker = User.find_by_id(jobseeker_id)
+        jobs = Job.find_by_ids(job_ids)
+        if not jobseeker or not jobs:
+            return None
+        
+        results = [
+            cls._match_result(jobseeker_id, str(job['_id']), scores)
+            for job, scores in zip(jobs, cls._batch_component_scores(jobseeker, jobs))
+        ]
+        return cls._save_matches(results)[1]
+    
+    @classmethod
+    def recompute_components(cls, components, jobseeker_id=None, job_id=None):
+        """Recompute some sub-scores of the stored matches of a jobseeker or a job.
+        
+        The other sub-scores are taken from the stored match and the overall
+        score is recombined from them.
+        """
+        if jobseeker_id:
+            stored = Match.find_all_by_user(jobseeker_id)
+            jobseeker = User.find_by_id(jobseeker_id)
+            jobs = {str(job['_id']): job for job in Job.find_by_ids([match['job_id'] for match in stored])}
+            pairs = [(jobseeker, jobs[match['job_id']], match)
+                     for match in stored if jobseeker and match['job_id'] in jobs]
+        else:
+            stored = Match.find_all_by_job(job_id)
+            job = Job.find_by_id(job_id)
+            jobseekers = {str(user['_id']): user for user in User.find_by_ids([match['user_id'] for match in stored])}
+            pairs = [(jobseekers[match['user_id']], job, match)
+                     for match in stored if job and match['user_id'] in jobseekers]
         
-        # Sort by overall score (descending)
-        matches.sort(key=lambda x: x['overall_score'], reverse=True)
+        if not pairs:
+            return None
+        
+        # The semantic score is computed for all pairs with one sparse product
+        if 'semantic' in components:
+            if jobseeker_id:
+                semantic = SemanticModel.score_jobs(pairs[0][0], [job for _, job, _ in pairs]).tolist()
+            else:
+                semantic = SemanticModel.score_jobseekers([jobseeker for jobseeker, _, _ in pairs], pairs[0][1]).tolist()
+        
+        results = []
+        for i, (jobseeker, job, match) in enumerate(pairs):
+            jobseeker = cls._with_features(jobseeker)
+            # Older matches only have the rounded breakdown
+            scores = dict(match.get('scores') or match['breakdown'])
+            for component in components:
+                if component == 'semantic':
+                    scores[component] = semantic[i]
+                else:
+                    scores[component] = cls._component_score(component, jobseeker, job)
+            results.append(cls._match_result(match['user_id'], match['job_id'], scores))
         
-        return matches[:limit]
+        return cls._save_matches(results)[1]
     
     @classmethod
-    def generate_matches_for_job(cls, job_id, limit=20):
-        # Get all jobseekers
-        jobseekers = list(User.collection.find({'role': 'jobseeker'}))
+    def generate_matches_for_jobseeker(cls, jobseeker_id, limit=20, skip=0):
+        jobseeker = User.find_by_id(jobseeker_id)
+        if not jobseeker:
+            return []
+        
+        top, _ = cls._score_jobseeker(jobseeker, limit + skip, keep=limit + skip)
+        top = top[skip:]
         
-        # Calculate matches for each jobseeker
+        # Only the returned page is enriched
+        with stage('enrichment'):
+            companies = EnrichmentService.company_names(job['employer_id'] for job, _, _ in top)
         matches = []
-        for jobseeker in jobseekers:
-            # Skip if already applied
-            if Application.has_applied(str(jobseeker['_id']), job_id):
-                continue
-            
-            # Calculate match
-            match_result = cls.calculate_match(str(jobseeker['_id']), job_id)
-            if match_result:
-                match_result['jobseeker_id'] = str(jobseeker['_id'])
-                match_result['jobseeker_name'] = jobseeker['name']
-                match_result['jobseeker_location'] = jobseeker.get('location', '')
-                match_result['jobseeker_skills'] = jobseeker.get('skills', [])
-                match_result['jobseeker_experience'] = jobseeker.get('experience', 0)
-                matches.append(match_result)
-        
-        # Sort by overall score (descending)
-        matches.sort(key=lambda x: x['overall_score'], reverse=True)
-        
-        return matches[:limit]
\ No newline at end of file
+        for job, result, match_id in top:
+            matches.append({
+                'match_id': match_id,
+                'overall_score': result['overall_score'],
+                'breakdown': result['breakdown'],
+                'job_id': result['job_id'],
+                'job_title': job['title'],
+                'company_name': companies.get(str(job['employer_id']), ''),
+                'location': job['location'],
+                'remote': job.get('remote', False),
+                'salary_range': job.get('salary_range', [])
+            })
+        
+        return matches
+    
+    @classmethod
+    def generate_matches_for_job(cls, job_id, limit=20, skip=0):
+        job = Job.find_by_id(job_id)
+        if not job:
+            return []
+        
+        top, _ = cls._score_job(job, limit + skip, keep=limit + skip)
+        
+        matches = []
+        for jobseeker, result, match_id in top[skip:]:
+            matches.append({
+                'match_id': match_id,
+                'overall_score': result['overall_score'],
+                'breakdown': result['breakdown'],
+                'jobseeker_id': result['user_id'],
+                'jobseeker_name': jobseeker['name'],
+                'jobseeker_location': jobseeker.get('location', ''),
+                'jobseeker_skills': jobseeker.get('skills', []),
+                'jobseeker_experience': jobseeker.get('experience', 0)
+            })
+        
+        return matches
@@ -0,0 +1,84 @@
+# backend/app/services/notification_bus.py
+import queue
+import threading
+from collections import defaultdict
+from flask import current_app
+
+class Subscription:
+    """One connected client; events wait in a bounded queue until it reads them."""
+
+    def __init__(self, recipient_id, max_queue):
+        self.recipient_id = recipient_id
+        self.events = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def offer(self, event):
+        # A client that cannot keep up is cut off rather than slowing the
+        # publisher or growing without bound; it resumes from Last-Event-ID
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class InMemoryNotificationBus:
+    """Pub/sub between the requests of a single process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, recipient_id, max_queue=100):
+        subscription = Subscription(recipient_id, max_queue)
+        with self._lock:
+            self._subscriptions[recipient_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.recipient_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.recipient_id]
+
+    def publish(self, recipient_id, event):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(recipient_id, ()))
+        for subscription in subscribers:
+            subscription.offer(event)
+        return len(subscribers)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+
+class NotificationBus:
+    """Entry point used by the models and the stream endpoint.
+
+    The backend is chosen by NOTIFICATION_BUS_BACKEND. Only `memory` ships
+    here; a broker-backed bus (e.g. Redis pub/sub) needs to provide the same
+    subscribe / unsubscribe / publish methods to be used across processes.
+    """
+
+    _memory_bus = None
+
+    @classmethod
+    def backend(cls):
+        name = current_app.config.get('NOTIFICATION_BUS_BACKEND', 'memory')
+        if name != 'memory':
+            raise ValueError(f'Unknown notification bus backend: {name}')
+        if cls._memory_bus is None:
+            cls._memory_bus = InMemoryNotificationBus()
+        return cls._memory_bus
+
+    @classmethod
+    def publish(cls, recipient_id, event):
+        return cls.backend().publish(recipient_id, event)
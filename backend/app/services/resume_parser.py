@@ -0,0 +1,129 @@
+# backend/app/services/resume_parser.py
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from app.models.user import User
+from app.models.resume_extraction import ResumeExtraction
+from app.services.file_service import content_hash, resolve_upload_path
+from app.services.matching_service import MatchingService
+from app.utils.helpers import extract_skills_from_text
+from app.utils.resume_text import extract_text, ResumeParserUnavailable, UnsupportedResumeFormat
+
+class ResumeParser:
+    """Extracts text and skills from uploaded resumes, off the request path.
+
+    Runs inside the match worker for `resume` tasks. Parsing is CPU-bound, so
+    files are parsed in a process pool; results are cached by content hash in
+    `resume_extractions` and copied onto the jobseeker for the matcher.
+    """
+
+    # Bump when the extraction changes so cached results are parsed again
+    VERSION = 1
+
+    _lock = threading.Lock()
+    _pool = None
+
+    @classmethod
+    def pool(cls):
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = ProcessPoolExecutor(max_workers=current_app.config.get('RESUME_PARSER_PROCESSES', 2))
+            return cls._pool
+
+    @classmethod
+    def recycle_pool(cls):
+        """Replace the pool, killing its workers.
+
+        A parse that runs past the timeout cannot be cancelled and would keep
+        its worker busy, so the pool is dropped rather than left to fill up.
+        """
+        with cls._lock:
+            pool, cls._pool = cls._pool, None
+        if pool is None:
+            return
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def file_hash(full_path):
+        sha256 = content_hash(full_path)
+        if sha256:
+            return sha256
+
+        # Files stored before content addressing are hashed on the fly
+        digest = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def extract_for_jobseekers(cls, jobseeker_ids):
+        """Extract the current resume of each jobseeker, parsing files in parallel.
+
+        Returns {jobseeker_id: error message, or None on success}.
+        """
+        timeout = current_app.config.get('RESUME_PARSE_TIMEOUT', 60)
+        max_chars = current_app.config.get('RESUME_TEXT_MAX_CHARS', 20000)
+        errors, extractions = {}, {}
+        timed_out = False
+        pending = {}  # sha256 -> (future, jobseeker ids sharing that file)
+
+        for jobseeker_id in jobseeker_ids:
+            jobseeker = User.find_by_id(jobseeker_id)
+            full_path = resolve_upload_path('', jobseeker['resume_url']) if jobseeker and jobseeker.get('resume_url') else None
+            if not full_path or not os.path.isfile(full_path):
+                errors[jobseeker_id] = None  # nothing to extract
+                continue
+
+            sha256 = cls.file_hash(full_path)
+            cached = ResumeExtraction.find(sha256, cls.VERSION)
+            if cached:
+                extractions[jobseeker_id] = cached
+                continue
+
+            if sha256 not in pending:
+                pending[sha256] = (cls.pool().submit(extract_text, full_path), [])
+            pending[sha256][1].append(jobseeker_id)
+
+        for sha256, (future, waiting_ids) in pending.items():
+            try:
+                text = future.result(timeout=timeout)
+                extraction = ResumeExtraction.save(sha256, cls.VERSION, text[:max_chars], extract_skills_from_text(text))
+            except UnsupportedResumeFormat as e:
+                # Cached too, so re-uploads of the file are not retried
+                extraction = ResumeExtraction.save(sha256, cls.VERSION, '', [], error=str(e))
+            except ResumeParserUnavailable as e:
+                # Not cached: the file is parsed once the library is installed
+                current_app.logger.warning(f'Resume {sha256} not extracted: {e}')
+                for jobseeker_id in waiting_ids:
+                    errors[jobseeker_id] = None
+                continue
+            except FutureTimeoutError:
+                current_app.logger.error(f'Resume {sha256} not parsed within {timeout}s')
+                timed_out = True
+                for jobseeker_id in waiting_ids:
+                    errors[jobseeker_id] = f'Resume parsing timed out after {timeout}s'
+                continue
+            except Exception as e:
+                current_app.logger.exception(f'Resume extraction failed for {sha256}')
+                for jobseeker_id in waiting_ids:
+                    errors[jobseeker_id] = str(e)
+                continue
+
+            for jobseeker_id in waiting_ids:
+                extractions[jobseeker_id] = extraction
+
+        if timed_out:
+            cls.recycle_pool()
+
+        for jobseeker_id, extraction in extractions.items():
+            changed = User.set_resume_extraction(jobseeker_id, extraction['_id'], extraction['text'], extraction['skills'])
+            if changed:
+                MatchingService.jobseeker_changed(jobseeker_id, changed)
+            errors[jobseeker_id] = None
+
+        return errors
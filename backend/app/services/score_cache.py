@@ -0,0 +1,171 @@
+# backend/app/services/score_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app
+from app.utils.cache import TTLCache
+from app.utils.metrics import registry
+
+class SqliteScoreCache:
+    """Score cache in a local SQLite file, shared by the processes of one host.
+
+    Entries expire after `ttl` seconds; past `maxsize` entries the oldest
+    written are dropped. Each thread of each process opens its own connection.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, path, maxsize=100000, ttl=3600):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        # Connections are not carried over a fork
+        if getattr(self._local, 'pid', None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS scores '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS scores_expires_at ON scores (expires_at)')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+
+    def get(self, key, default=None):
+        row = self._connection().execute(
+            'SELECT value FROM scores WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO scores (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value), time.time() + self.ttl)
+        )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 1000 == 0
+        if prune:
+            self.prune(connection)
+
+    def prune(self, connection=None):
+        connection = connection or self._connection()
+        connection.execute('DELETE FROM scores WHERE expires_at <= ?', (time.time(),))
+        # Every entry lives for `ttl`, so the oldest written expire first
+        connection.execute(
+            'DELETE FROM scores WHERE key IN '
+            '(SELECT key FROM scores ORDER BY expires_at DESC LIMIT -1 OFFSET ?)', (self.maxsize,)
+        )
+
+    def clear(self):
+        self._connection().execute('DELETE FROM scores')
+
+    def stats(self):
+        size = self._connection().execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': size,
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0
+            }
+
+
+class ScoreCache:
+    """Memoized sub-scores, keyed by a fingerprint of the fields they read.
+
+    The backend is chosen by SCORE_CACHE_BACKEND: `memory` (an LRU shared by
+    the threads of one process), `sqlite` (a local file shared by the
+    processes of one host, behind the in-process LRU) or `none`.
+    """
+
+    # Bump when a cached score function changes so old entries are ignored
+    VERSION = 1
+
+    _memory = None
+    _shared = None
+
+    @classmethod
+    def fingerprint(cls, component, *values):
+        # Stable across processes, unlike hash()
+        data = repr((cls.VERSION, component, values)).encode()
+        return f'{component}:{hashlib.blake2b(data, digest_size=16).hexdigest()}'
+
+    @classmethod
+    def backends(cls):
+        name = current_app.config.get('SCORE_CACHE_BACKEND', 'memory')
+        if name == 'none':
+            return ()
+        if name not in ('memory', 'sqlite'):
+            raise ValueError(f'Unknown score cache backend: {name}')
+
+        if cls._memory is None:
+            cls._memory = TTLCache(
+                maxsize=current_app.config.get('SCORE_CACHE_SIZE', 100000),
+                ttl=current_app.config.get('SCORE_CACHE_TTL', 3600)
+            )
+        if name == 'memory':
+            return (cls._memory,)
+
+        if cls._shared is None:
+            cls._shared = SqliteScoreCache(
+                current_app.config['SCORE_CACHE_PATH'],
+                maxsize=current_app.config.get('SCORE_CACHE_SHARED_SIZE', 1000000),
+                ttl=current_app.config.get('SCORE_CACHE_TTL', 3600)
+            )
+        return (cls._memory, cls._shared)
+
+    @classmethod
+    def get_or_compute(cls, key, compute):
+        """Cached value of `key`, computing and storing it on a miss."""
+        backends = cls.backends()
+        component = key.partition(':')[0]
+        for level, backend in enumerate(backends):
+            value = backend.get(key)
+            if value is not None:
+                registry.inc('smartmatch_score_cache_lookups_total', (('component', component), ('result', 'hit')))
+                # Promote shared hits into the in-process LRU
+                for upper in backends[:level]:
+                    upper.set(key, value)
+                return value
+
+        if backends:
+            registry.inc('smartmatch_score_cache_lookups_total', (('component', component), ('result', 'miss')))
+        value = compute()
+        for backend in backends:
+            backend.set(key, value)
+        return value
+
+    @classmethod
+    def clear(cls):
+        for backend in (cls._memory, cls._shared):
+            if backend is not None:
+                backend.clear()
+
+    @classmethod
+    def stats(cls):
+        return {name: backend.stats() for name, backend in (('memory', cls._memory), ('shared', cls._shared))
+                if backend is not None}
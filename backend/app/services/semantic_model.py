@@ -0,0 +1,318 @@
+# backend/app/services/semantic_model.py
+import os
+import threading
+import time
+from datetime import datetime
+import joblib
+import numpy as np
+import sklearn
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from flask import current_app
+from app.models.user import User
+from app.models.job import Job
+from app.utils.cache import TTLCache
+from app.utils.metrics import stage
+from app.utils.profile_features import FEATURES_VERSION, profile_text
+
+class SemanticModel:
+    """Corpus-level TF-IDF model used for the semantic match score.
+
+    The vectorizer is fitted once over all active jobs and jobseeker profiles.
+    Job vectors are kept precomputed (L2-normalized rows of a sparse matrix) so
+    scoring a jobseeker against any number of jobs is one sparse product.
+    """
+
+    # Bump when the artifact layout changes so old files are refitted
+    ARTIFACT_FORMAT = 1
+
+    # Vectors of new or changed jobs are appended to a small side matrix, merged
+    # into the main one (dropping replaced rows) once it reaches this many rows
+    PENDING_ROWS = 1024
+
+    JOB_FIELDS = {'title': 1, 'description': 1, 'required_skills': 1,
+                  'preferred_skills': 1, 'updated_at': 1}
+    JOBSEEKER_FIELDS = {'name': 1, 'skills': 1, 'education': 1, 'experience': 1,
+                        'resume_skills': 1, 'resume_text': 1}
+
+    _lock = threading.RLock()
+    _vectorizer = None
+    _job_matrix = None
+    _pending_matrix = None  # vectors appended since the last compaction
+    _job_rows = {}        # job_id -> (row, updated_at); rows past _job_matrix are in _pending_matrix
+    _model_version = None
+    _loaded = False
+    _refit_at = 0         # monotonic time of the next fit attempt while there is no corpus
+    _jobseeker_vectors = None  # (model version, profile text digest) -> TF-IDF row
+
+    @staticmethod
+    def jobseeker_text(jobseeker):
+        return profile_text(jobseeker)
+
+    @staticmethod
+    def job_text(job):
+        return ' '.join([
+            job.get('title', ''),
+            job.get('description', ''),
+            ' '.join(job.get('required_skills', [])),
+            ' '.join(job.get('preferred_skills', []))
+        ]).lower()
+
+    @classmethod
+    def artifact_path(cls):
+        return current_app.config['SEMANTIC_MODEL_PATH']
+
+    @classmethod
+    def fit(cls, jobs=None, jobseekers=None):
+        """Fit the vectorizer over the whole corpus and precompute job vectors."""
+        if jobs is None:
+            jobs = list(Job.collection.find({'active': True}, cls.JOB_FIELDS))
+        if jobseekers is None:
+            jobseekers = list(User.collection.find({'role': 'jobseeker'}, cls.JOBSEEKER_FIELDS))
+
+        with stage('semantic.fit'):
+            job_texts = [cls.job_text(job) for job in jobs]
+            corpus = job_texts + [cls.jobseeker_text(jobseeker) for jobseeker in jobseekers]
+
+            vectorizer = TfidfVectorizer(stop_words='english')
+            try:
+                vectorizer.fit(corpus)
+                job_matrix = vectorizer.transform(job_texts).tocsr()
+            except ValueError:
+                # Empty corpus or no usable terms
+                vectorizer, job_matrix = None, None
+
+        with cls._lock:
+            cls._vectorizer = vectorizer
+            cls._job_matrix = job_matrix
+            cls._pending_matrix = None
+            cls._job_rows = {
+                str(job['_id']): (row, job.get('updated_at'))
+                for row, job in enumerate(jobs) if '_id' in job
+            }
+            cls._model_version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+            cls._loaded = True
+            if vectorizer is None:
+                cls._refit_at = time.monotonic() + current_app.config.get('SEMANTIC_REFIT_INTERVAL', 300)
+
+        return cls._model_version
+
+    @classmethod
+    def save(cls, path=None):
+        """Write the fitted model to a versioned on-disk artifact.
+
+        Returns None without writing when there is no fitted vectorizer (empty corpus).
+        """
+        path = path or cls.artifact_path()
+
+        with cls._lock:
+            if cls._vectorizer is None:
+                return None
+            cls._compact()
+            artifact = {
+                'format': cls.ARTIFACT_FORMAT,
+                'sklearn_version': sklearn.__version__,
+                'model_version': cls._model_version,
+                'vectorizer': cls._vectorizer,
+                'job_matrix': cls._job_matrix,
+                'job_rows': dict(cls._job_rows)
+            }
+
+        # Write to a temporary file first so readers never see a partial artifact
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        """Load a previously saved artifact. Returns False if it is missing or stale."""
+        path = path or cls.artifact_path()
+        if not os.path.isfile(path):
+            return False
+
+        try:
+            artifact = joblib.load(path)
+        except Exception as e:
+            current_app.logger.warning(f'Could not load semantic model from {path}: {e}')
+            return False
+
+        if (artifact.get('format') != cls.ARTIFACT_FORMAT or
+                artifact.get('sklearn_version') != sklearn.__version__ or
+                artifact.get('vectorizer') is None):
+            return False
+
+        with cls._lock:
+            cls._vectorizer = artifact['vectorizer']
+            cls._job_matrix = artifact['job_matrix']
+            cls._pending_matrix = None
+            cls._job_rows = artifact['job_rows']
+            cls._model_version = artifact['model_version']
+            cls._loaded = True
+
+        return True
+
+    @classmethod
+    def ensure_loaded(cls):
+        if cls._loaded and (cls._vectorizer is not None or time.monotonic() < cls._refit_at):
+            return
+        with cls._lock:
+            if cls._loaded and (cls._vectorizer is not None or time.monotonic() < cls._refit_at):
+                return
+            # Until there is a corpus, fitting is retried periodically (and as
+            # soon as a job is added)
+            if cls._loaded or not cls.load():
+                cls.fit()
+                cls.save()
+
+    @classmethod
+    def update_job(cls, job):
+        """Refresh the precomputed vector of a created or updated job."""
+        if not cls._loaded:
+            return
+        if cls._vectorizer is None:
+            # The first jobs make a corpus: fit on the next score
+            if job.get('active', True):
+                cls._refit_at = 0
+            return
+        if not job.get('active', True):
+            cls.remove_job(str(job['_id']))
+            return
+        with cls._lock:
+            cls._append_job_vectors([job])
+
+    @classmethod
+    def remove_job(cls, job_id):
+        with cls._lock:
+            cls._job_rows.pop(str(job_id), None)
+
+    @classmethod
+    def _append_job_vectors(cls, jobs):
+        # Replaced rows stay in place until the next compaction
+        vectors = cls._vectorizer.transform([cls.job_text(job) for job in jobs]).tocsr()
+        first_row = cls._job_matrix.shape[0]
+        if cls._pending_matrix is not None:
+            first_row += cls._pending_matrix.shape[0]
+            vectors = sparse.vstack([cls._pending_matrix, vectors], format='csr')
+        cls._pending_matrix = vectors
+        for offset, job in enumerate(jobs):
+            cls._job_rows[str(job['_id'])] = (first_row + offset, job.get('updated_at'))
+
+        if cls._pending_matrix.shape[0] >= cls.PENDING_ROWS:
+            cls._compact()
+
+    @classmethod
+    def _compact(cls):
+        # Keeps only the current vector of each known job, in one matrix
+        matrix = cls._job_matrix
+        if cls._pending_matrix is not None:
+            matrix = sparse.vstack([matrix, cls._pending_matrix], format='csr')
+        job_ids = list(cls._job_rows)
+        cls._job_matrix = matrix[[cls._job_rows[job_id][0] for job_id in job_ids]]
+        cls._pending_matrix = None
+        cls._job_rows = {job_id: (row, cls._job_rows[job_id][1]) for row, job_id in enumerate(job_ids)}
+
+    @classmethod
+    def _job_vectors(cls, jobs):
+        """TF-IDF rows of the given jobs, in order.
+
+        Jobs unknown to this process (or changed since their vector was built)
+        are vectorized with the fitted vocabulary and kept; jobs without an id
+        are vectorized on the fly.
+        """
+        with cls._lock:
+            stale = {}
+            for job in jobs:
+                if '_id' not in job:
+                    continue
+                known = cls._job_rows.get(str(job['_id']))
+                if known is None or known[1] != job.get('updated_at'):
+                    stale[str(job['_id'])] = job
+            if stale:
+                cls._append_job_vectors(list(stale.values()))
+
+            rows = np.array([cls._job_rows[str(job['_id'])][0] if '_id' in job else -1 for job in jobs], dtype=int)
+            main, pending = cls._job_matrix, cls._pending_matrix
+
+        if (rows >= 0).all() and (rows < main.shape[0]).all():
+            return main[rows]
+
+        # Gather from the main matrix, the pending rows and the id-less jobs
+        pieces, positions = [], []
+        in_main = (rows >= 0) & (rows < main.shape[0])
+        in_pending = rows >= main.shape[0]
+        anonymous = rows < 0
+        if in_main.any():
+            pieces.append(main[rows[in_main]])
+            positions.append(np.flatnonzero(in_main))
+        if in_pending.any():
+            pieces.append(pending[rows[in_pending] - main.shape[0]])
+            positions.append(np.flatnonzero(in_pending))
+        if anonymous.any():
+            pieces.append(cls._vectorizer.transform([cls.job_text(jobs[i]) for i in np.flatnonzero(anonymous)]))
+            positions.append(np.flatnonzero(anonymous))
+
+        matrix = sparse.vstack(pieces, format='csr')
+        return matrix[np.argsort(np.concatenate(positions))]
+
+    @classmethod
+    def _jobseeker_matrix(cls, jobseekers):
+        # Profiles with stored features are vectorized once per model version
+        if cls._jobseeker_vectors is None:
+            cls._jobseeker_vectors = TTLCache(
+                maxsize=current_app.config.get('SEMANTIC_VECTOR_CACHE_SIZE', 10000),
+                ttl=current_app.config.get('SEMANTIC_VECTOR_CACHE_TTL', 3600)
+            )
+
+        vectorizer, model_version = cls._vectorizer, cls._model_version
+        rows, missing = [None] * len(jobseekers), []
+        for i, jobseeker in enumerate(jobseekers):
+            features = jobseeker.get('features')
+            if features and features.get('version') == FEATURES_VERSION:
+                rows[i] = cls._jobseeker_vectors.get((model_version, features['text_digest']))
+            if rows[i] is None:
+                missing.append(i)
+
+        if missing:
+            vectors = vectorizer.transform([cls.jobseeker_text(jobseekers[i]) for i in missing]).tocsr()
+            for offset, i in enumerate(missing):
+                rows[i] = vectors[offset]
+                features = jobseekers[i].get('features')
+                if features and features.get('version') == FEATURES_VERSION:
+                    cls._jobseeker_vectors.set((model_version, features['text_digest']), rows[i])
+
+        return sparse.vstack(rows, format='csr')
+
+    @classmethod
+    def score_jobs(cls, jobseeker, jobs):
+        """Semantic scores (0-100) of a jobseeker against a list of jobs."""
+        cls.ensure_loaded()
+
+        if cls._vectorizer is None:
+            # No corpus to compare against, return neutral score
+            return np.full(len(jobs), 50.0)
+        if not jobs:
+            return np.zeros(0)
+
+        jobseeker_vector = cls._jobseeker_matrix([jobseeker])
+
+        # Rows are L2-normalized so the dot product is the cosine similarity
+        similarity = (cls._job_vectors(jobs) @ jobseeker_vector.T).toarray().ravel()
+
+        return np.minimum(100, similarity * 100)
+
+    @classmethod
+    def score_jobseekers(cls, jobseekers, job):
+        """Semantic scores (0-100) of several jobseekers against one job."""
+        cls.ensure_loaded()
+
+        if cls._vectorizer is None:
+            return np.full(len(jobseekers), 50.0)
+        if not jobseekers:
+            return np.zeros(0)
+
+        jobseeker_matrix = cls._jobseeker_matrix(jobseekers)
+        similarity = (jobseeker_matrix @ cls._job_vectors([job]).T).toarray().ravel()
+
+        return np.minimum(100, similarity * 100)
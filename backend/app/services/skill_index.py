@@ -0,0 +1,176 @@
+# backend/app/services/skill_index.py
+import heapq
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import current_app
+from app.models.user import User
+from app.models.job import Job
+from app.utils.job_requirements import normalize_skills
+
+class SkillIndex:
+    """In-process inverted index from normalized skill to job and jobseeker ids.
+
+    Used to pre-filter match candidates so only documents sharing at least one
+    skill are fully scored. The index is rebuilt from MongoDB every
+    SKILL_INDEX_TTL seconds to pick up writes made by other processes; the
+    rebuild runs in a background thread while requests keep using the
+    current index.
+    """
+
+    _lock = threading.RLock()
+    _build_lock = threading.RLock()
+    _jobs_by_skill = defaultdict(set)
+    _jobseekers_by_skill = defaultdict(set)
+    _job_skills = {}          # job_id -> set of skills
+    _jobseeker_skills = {}    # jobseeker_id -> set of skills
+    _built_at = None
+    _rebuilding = False
+    _updates_during_build = None  # changes made while a build scans, replayed on its result
+
+    @staticmethod
+    def normalize(skills):
+        return set(normalize_skills(skills))
+
+    @classmethod
+    def job_skill_set(cls, job):
+        return cls.normalize(job.get('required_skills', [])) | cls.normalize(job.get('preferred_skills', []))
+
+    @classmethod
+    def build(cls):
+        """Rebuild the whole index from active jobs and jobseekers."""
+        with cls._build_lock:
+            with cls._lock:
+                cls._updates_during_build = []
+            try:
+                jobs = Job.collection.find({'active': True}, {'required_skills': 1, 'preferred_skills': 1})
+                jobseekers = User.collection.find({'role': 'jobseeker'}, {'skills': 1, 'resume_skills': 1})
+
+                jobs_by_skill, job_skills = defaultdict(set), {}
+                for job in jobs:
+                    job_id = str(job['_id'])
+                    job_skills[job_id] = cls.job_skill_set(job)
+                    for skill in job_skills[job_id]:
+                        jobs_by_skill[skill].add(job_id)
+
+                jobseekers_by_skill, jobseeker_skills = defaultdict(set), {}
+                for jobseeker in jobseekers:
+                    jobseeker_id = str(jobseeker['_id'])
+                    jobseeker_skills[jobseeker_id] = cls.normalize(User.matching_skills(jobseeker))
+                    for skill in jobseeker_skills[jobseeker_id]:
+                        jobseekers_by_skill[skill].add(jobseeker_id)
+            except Exception:
+                with cls._lock:
+                    cls._updates_during_build = None
+                raise
+
+            with cls._lock:
+                updates, cls._updates_during_build = cls._updates_during_build, None
+                cls._jobs_by_skill, cls._job_skills = jobs_by_skill, job_skills
+                cls._jobseekers_by_skill, cls._jobseeker_skills = jobseekers_by_skill, jobseeker_skills
+                # Writes made while scanning may not be in what was read
+                for update in updates:
+                    cls._apply(*update)
+                cls._built_at = time.monotonic()
+
+    @classmethod
+    def ensure_built(cls):
+        if cls._built_at is None:
+            # Nothing to serve yet: the first build runs in the request
+            with cls._build_lock:
+                if cls._built_at is None:
+                    cls.build()
+            return
+
+        ttl = current_app.config.get('SKILL_INDEX_TTL', 300)
+        if time.monotonic() - cls._built_at > ttl:
+            cls._rebuild_in_background()
+
+    @classmethod
+    def _rebuild_in_background(cls):
+        with cls._lock:
+            if cls._rebuilding:
+                return
+            cls._rebuilding = True
+        app = current_app._get_current_object()
+
+        def rebuild():
+            try:
+                with app.app_context():
+                    cls.build()
+            except Exception:
+                # The stale index stays in use; the next lookup retries
+                app.logger.exception('Could not rebuild the skill index')
+            finally:
+                with cls._lock:
+                    cls._rebuilding = False
+
+        threading.Thread(target=rebuild, name='skill-index-rebuild', daemon=True).start()
+
+    @classmethod
+    def _reindex(cls, postings, entries, entity_id, skills):
+        for skill in entries.get(entity_id, set()) - skills:
+            postings[skill].discard(entity_id)
+            if not postings[skill]:
+                del postings[skill]
+        for skill in skills:
+            postings[skill].add(entity_id)
+        entries[entity_id] = skills
+
+    @classmethod
+    def _apply(cls, kind, entity_id, skills):
+        # skills=None removes the entity; called with the lock held
+        if kind == 'job':
+            postings, entries = cls._jobs_by_skill, cls._job_skills
+        else:
+            postings, entries = cls._jobseekers_by_skill, cls._jobseeker_skills
+        cls._reindex(postings, entries, entity_id, skills or set())
+        if skills is None:
+            entries.pop(entity_id, None)
+
+    @classmethod
+    def _update(cls, kind, entity_id, skills):
+        with cls._lock:
+            if cls._built_at is None and cls._updates_during_build is None:
+                return
+            cls._apply(kind, entity_id, skills)
+            if cls._updates_during_build is not None:
+                cls._updates_during_build.append((kind, entity_id, skills))
+
+    @classmethod
+    def update_job(cls, job):
+        cls._update('job', str(job['_id']), cls.job_skill_set(job))
+
+    @classmethod
+    def remove_job(cls, job_id):
+        cls._update('job', str(job_id), None)
+
+    @classmethod
+    def update_jobseeker(cls, jobseeker):
+        cls._update('jobseeker', str(jobseeker['_id']), cls.normalize(User.matching_skills(jobseeker)))
+
+    @classmethod
+    def _top_by_overlap(cls, postings, skills, limit, exclude):
+        overlap = Counter()
+        with cls._lock:
+            for skill in cls.normalize(skills):
+                overlap.update(postings.get(skill, ()))
+
+        for entity_id in exclude or ():
+            overlap.pop(entity_id, None)
+
+        if limit is None or len(overlap) <= limit:
+            return [entity_id for entity_id, _ in overlap.most_common()]
+        return [entity_id for entity_id, _ in heapq.nlargest(limit, overlap.items(), key=lambda item: item[1])]
+
+    @classmethod
+    def candidate_job_ids(cls, skills, limit=None, exclude=None):
+        """Ids of active jobs sharing at least one skill, most overlapping first."""
+        cls.ensure_built()
+        return cls._top_by_overlap(cls._jobs_by_skill, skills, limit, exclude)
+
+    @classmethod
+    def candidate_jobseeker_ids(cls, skills, limit=None, exclude=None):
+        """Ids of jobseekers sharing at least one skill, most overlapping first."""
+        cls.ensure_built()
+        return cls._top_by_overlap(cls._jobseekers_by_skill, skills, limit, exclude)
@@ -1,14 +1,14 @@
-from flask_mail import Message
-from app import mail
+from app.services.email_outbox import EmailOutbox
 from flask import current_app
 
-def send_verification_email(to_email, token):
+def queue_verification_email(to_email, token):
     """
-    Sends an email with a verification link to the employer.
+    Queues an email with a verification link to the employer.
+    The mail worker delivers it, so registration does not wait on SMTP.
     """
     verification_link = f"http://localhost:5000/api/auth/verify-employer/{token}"  # backend route
 
-    msg = Message(
+    return EmailOutbox().enqueue(
         subject="Verify Your Employer Account - SmartMatch",
         sender=current_app.config.get("MAIL_USERNAME"),
         recipients=[to_email],
@@ -29,4 +29,3 @@ Best regards,
 SmartMatch Team
 """
     )
-    mail.send(msg)
@@ -0,0 +1,62 @@
+# backend/app/utils/identity.py
+from bson import ObjectId
+from flask import g, current_app, has_app_context
+from flask_jwt_extended import get_jwt_identity
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Authorization claims shared by all requests of this process
+CLAIM_FIELDS = ('role', 'verified', 'suspended')
+_claims_cache = None
+
+
+def _cache():
+    global _claims_cache
+    if _claims_cache is None:
+        _claims_cache = TTLCache(
+            maxsize=current_app.config.get('IDENTITY_CACHE_SIZE', 10000),
+            ttl=current_app.config.get('IDENTITY_CACHE_TTL', 30)
+        )
+    return _claims_cache
+
+
+def _claims_of(user):
+    return {field: user.get(field, False) for field in CLAIM_FIELDS}
+
+
+def load_current_user():
+    """Full user document of the JWT identity, fetched at most once per request."""
+    if 'current_user' not in g:
+        user_id = get_jwt_identity()
+        user = User.find_by_id(user_id) if ObjectId.is_valid(user_id) else None
+        g.current_user = user
+        if user:
+            _cache().set(user_id, _claims_of(user))
+    return g.current_user
+
+
+def current_user_claims():
+    """Role / verified / suspended claims of the JWT identity.
+
+    Served from the request, then from the process-wide cache, and only then
+    from MongoDB. Returns None if the user does not exist.
+    """
+    if 'current_user' in g:
+        return _claims_of(g.current_user) if g.current_user else None
+
+    claims = _cache().get(get_jwt_identity())
+    if claims is not None:
+        return claims
+
+    user = load_current_user()
+    return _claims_of(user) if user else None
+
+
+def invalidate_user(user_id):
+    """Drop cached claims after the user's role, verification or suspension changed."""
+    if _claims_cache is not None:
+        _claims_cache.pop(str(user_id))
+    if has_app_context():
+        user = g.get('current_user')
+        if user and str(user['_id']) == str(user_id):
+            g.pop('current_user')
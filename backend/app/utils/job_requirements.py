@@ -0,0 +1,81 @@
+# backend/app/utils/job_requirements.py
+import re
+
+# Bump when the derivation changes; backfill_job_requirements.py rewrites older documents
+DERIVED_VERSION = 2
+
+# Job fields the derived requirements are computed from
+DERIVED_SOURCE_FIELDS = ('description', 'required_skills', 'preferred_skills')
+
+# Education levels with scores (checked in order, first match wins)
+EDUCATION_LEVELS = {
+    'high school': 20,
+    'certificate': 30,
+    'associate': 40,
+    'bachelor': 60,
+    'master': 80,
+    'phd': 100,
+    'doctorate': 100
+}
+
+EDUCATION_KEYWORDS = [
+    'phd', 'doctorate', 'master', 'bachelor', 'associate',
+    'certificate', 'high school', 'degree'
+]
+
+# Patterns like "5+ years", "3-5 years", tried in order
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?'),
+    re.compile(r'(\d+)\s*-\s*(\d+)\s*years?')
+]
+
+
+def extract_experience_years(text):
+    text_lower = text.lower()
+    for pattern in EXPERIENCE_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            if len(match.groups()) == 2:
+                # Range like "3-5 years", take the average
+                return (int(match.group(1)) + int(match.group(2))) / 2
+            # Single value like "5+ years"
+            return int(match.group(1))
+    return 0
+
+
+def extract_education(text):
+    text_lower = text.lower()
+    for keyword in EDUCATION_KEYWORDS:
+        if keyword in text_lower:
+            return keyword
+    return ''
+
+
+def education_level(education):
+    for level, score in EDUCATION_LEVELS.items():
+        if level in education:
+            return score
+    return 0
+
+
+def normalize_skill(skill):
+    """Form in which skills are compared, indexed and stored ('' for a blank or non-string value)"""
+    return skill.strip().lower() if isinstance(skill, str) else ''
+
+
+def normalize_skills(skills):
+    return sorted({normalized for normalized in map(normalize_skill, skills or []) if normalized})
+
+
+def derive_job_requirements(job):
+    """Requirements parsed from a job, stored on it as the `derived` sub-document"""
+    description = job.get('description') or ''
+    education = extract_education(description)
+    return {
+        'version': DERIVED_VERSION,
+        'min_experience_years': extract_experience_years(description),
+        'required_education': education,
+        'required_education_level': education_level(education),
+        'required_skills': normalize_skills(job.get('required_skills')),
+        'preferred_skills': normalize_skills(job.get('preferred_skills'))
+    }
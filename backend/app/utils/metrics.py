@@ -0,0 +1,201 @@
+# backend/app/utils/metrics.py
+import bisect
+import copy
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import Response, current_app, request
+from pymongo import monitoring
+
+# In-process metrics in the Prometheus text format. Everything here is a dict
+# update under one lock, cheap enough to stay on in production. Each process
+# (web worker or match worker) exposes its own numbers.
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+METRICS = {
+    'smartmatch_http_requests_total': ('counter', 'HTTP requests by endpoint, method and status', None),
+    'smartmatch_http_request_seconds': ('histogram', 'HTTP request latency by endpoint', LATENCY_BUCKETS),
+    'smartmatch_request_mongo_commands': ('histogram', 'MongoDB round trips per HTTP request', COUNT_BUCKETS),
+    'smartmatch_mongo_command_seconds': ('histogram', 'MongoDB command latency by endpoint and command', LATENCY_BUCKETS),
+    'smartmatch_stage_seconds': ('summary', 'Time spent in matching pipeline stages', None),
+    'smartmatch_score_cache_lookups_total': ('counter', 'Memoized sub-score lookups by component and result', None),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}   # (name, labels) -> counter value, [count, sum] or [bucket counts, count, sum]
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        kind, _, buckets = METRICS[name]
+        key = (name, labels)
+        with self._lock:
+            if kind == 'summary':
+                entry = self._values.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += value
+            else:
+                entry = self._values.setdefault(key, [[0] * len(buckets), 0, 0.0])
+                index = bisect.bisect_left(buckets, value)
+                if index < len(buckets):
+                    entry[0][index] += 1
+                entry[1] += 1
+                entry[2] += value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        with self._lock:
+            values = copy.deepcopy(self._values)
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            series = sorted((labels, value) for (metric, labels), value in values.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in series:
+                if kind == 'counter':
+                    lines.append(f'{name}{_labels(labels)} {value}')
+                elif kind == 'summary':
+                    lines.append(f'{name}_count{_labels(labels)} {value[0]}')
+                    lines.append(f'{name}_sum{_labels(labels)} {value[1]}')
+                else:
+                    counts, count, total = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{_labels(labels + (("le", str(bound)),))} {cumulative}')
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {count}')
+                    lines.append(f'{name}_count{_labels(labels)} {count}')
+                    lines.append(f'{name}_sum{_labels(labels)} {total}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+registry = MetricsRegistry()
+
+
+class RequestStats:
+    """Database round trips and stage timings of the current HTTP request"""
+    __slots__ = ('endpoint', 'started', 'db_count', 'db_seconds', 'stages')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_seconds = 0.0
+        self.stages = {}
+
+    def server_timing(self, total):
+        entries = [f'app;dur={total * 1000:.1f}',
+                   f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_count} commands"']
+        entries += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.stages.items()]
+        return ', '.join(entries)
+
+
+_request_stats = ContextVar('request_stats', default=None)
+
+
+def record_stage(name, seconds):
+    registry.observe('smartmatch_stage_seconds', seconds, (('stage', name),))
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.stages[name] = stats.stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name):
+    """Time a block of the matching pipeline"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Attributes MongoDB command count and latency to the Flask endpoint.
+
+    pymongo publishes command events on the thread that runs the command, so
+    the current request's stats are visible here.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        seconds = event.duration_micros / 1e6
+        stats = _request_stats.get()
+        endpoint = stats.endpoint if stats is not None else 'background'
+        registry.observe('smartmatch_mongo_command_seconds', seconds,
+                         (('endpoint', endpoint), ('command', event.command_name)))
+        if stats is not None:
+            stats.db_count += 1
+            stats.db_seconds += seconds
+
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        # Without a token the metrics are only served in development
+        if not (current_app.debug or os.getenv('FLASK_ENV') == 'development'):
+            return Response('Forbidden: METRICS_TOKEN is not set\n', status=403, mimetype='text/plain')
+    elif request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    """Per-request metrics, the Server-Timing header and the /metrics endpoint"""
+
+    @app.before_request
+    def start_request_stats():
+        _request_stats.set(RequestStats(request.endpoint or 'unmatched'))
+
+    @app.after_request
+    def finish_request_stats(response):
+        stats = _request_stats.get()
+        if stats is None:
+            return response
+
+        elapsed = time.perf_counter() - stats.started
+        registry.inc('smartmatch_http_requests_total',
+                     (('endpoint', stats.endpoint), ('method', request.method), ('status', str(response.status_code))))
+        registry.observe('smartmatch_http_request_seconds', elapsed, (('endpoint', stats.endpoint),))
+        registry.observe('smartmatch_request_mongo_commands', stats.db_count, (('endpoint', stats.endpoint),))
+
+        if app.config.get('SERVER_TIMING_ENABLED', False):
+            response.headers['Server-Timing'] = stats.server_timing(elapsed)
+        return response
+
+    @app.teardown_request
+    def clear_request_stats(exc):
+        _request_stats.set(None)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,77 @@
+# backend/app/utils/pagination.py
+import base64
+from datetime import datetime
+from bson import ObjectId, json_util
+from flask import jsonify
+
+# Keyset (cursor) pagination: a page is "the documents after the last one
+# seen" in a (sort_field, _id) ordering, so deep pages cost the same as the first.
+
+CURSOR_HEADER = 'X-Next-Cursor'
+_SORT_VALUE_TYPES = (int, float, str, datetime, ObjectId, type(None))
+
+
+def encode_cursor(doc, sort_field):
+    """Opaque token for the position right after `doc`"""
+    key = [doc['_id']] if sort_field == '_id' else [doc.get(sort_field), doc['_id']]
+    return base64.urlsafe_b64encode(json_util.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort_field):
+    try:
+        key = json_util.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+    # Only plain values may reach the query, never operator documents
+    size = 1 if sort_field == '_id' else 2
+    if (not isinstance(key, list) or len(key) != size or not isinstance(key[-1], ObjectId)
+            or not isinstance(key[0], _SORT_VALUE_TYPES)):
+        raise ValueError('Invalid cursor')
+    return key
+
+
+def is_valid_cursor(token, sort_field):
+    try:
+        decode_cursor(token, sort_field)
+    except ValueError:
+        return False
+    return True
+
+
+def sort_spec(sort_field, direction=-1):
+    if sort_field == '_id':
+        return [('_id', direction)]
+    return [(sort_field, direction), ('_id', direction)]
+
+
+def after_cursor(query, cursor, sort_field, direction=-1):
+    """Restrict `query` to the documents after the cursor position"""
+    if not cursor:
+        return query
+
+    key = decode_cursor(cursor, sort_field)
+    operator = '$lt' if direction < 0 else '$gt'
+    if sort_field == '_id':
+        condition = {'_id': {operator: key[0]}}
+    else:
+        value, last_id = key
+        condition = {'$or': [
+            {sort_field: {operator: value}},
+            {sort_field: value, '_id': {operator: last_id}}
+        ]}
+    return {'$and': [query, condition]} if query else condition
+
+
+def next_cursor(docs, limit, sort_field):
+    """Token for the following page, or None once a short page shows the end"""
+    if not docs or len(docs) < limit:
+        return None
+    return encode_cursor(docs[-1], sort_field)
+
+
+def paginated_response(items, cursor):
+    response = jsonify(items)
+    if cursor:
+        response.headers[CURSOR_HEADER] = cursor
+    return response
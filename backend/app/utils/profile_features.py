@@ -0,0 +1,86 @@
+# backend/app/utils/profile_features.py
+import hashlib
+import math
+from app.utils.job_requirements import education_level, normalize_skills
+
+# Bump when the derivation changes; backfill_profile_features.py rewrites older documents
+FEATURES_VERSION = 2
+
+# Jobseeker fields the features are computed from
+FEATURE_SOURCE_FIELDS = ('name', 'skills', 'resume_skills', 'resume_text',
+                         'experience', 'education', 'location', 'salary_expectation')
+
+
+# Profiles are saved as sent by the client, so every field is coerced
+# defensively: deriving features must never fail a registration or a save
+
+def _text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ' '.join(item for item in value if isinstance(item, str))
+    return ''
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float, str)):
+        try:
+            number = float(value)
+        except ValueError:
+            return 0.0
+        return number if math.isfinite(number) else 0.0
+    return 0.0
+
+
+def _string_list(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+
+def matching_skills(user):
+    """Profile skills plus the skills extracted from the uploaded resume"""
+    return _string_list(user.get('skills')) + _string_list(user.get('resume_skills'))
+
+
+def profile_text(user):
+    """Text of a jobseeker profile for the semantic model"""
+    experience = user.get('experience', 0)
+    return ' '.join([
+        _text(user.get('name', '')),
+        ' '.join(matching_skills(user)),
+        _text(user.get('education', '')),
+        str(experience) if isinstance(experience, (int, float, str)) else '',
+        _text(user.get('resume_text'))
+    ]).lower()
+
+
+def salary_bounds(salary_expectation):
+    # None when there is no usable expectation (scored as neutral); a single
+    # amount is an expectation of exactly that much
+    if not salary_expectation:
+        return None
+    if isinstance(salary_expectation, (list, tuple)):
+        if len(salary_expectation) < 2:
+            return None
+        return [_number(salary_expectation[0]), _number(salary_expectation[1])]
+    amount = _number(salary_expectation)
+    return [amount, amount] if amount else None
+
+
+def derive_profile_features(user):
+    """Matching features of a jobseeker, stored on it as the `features` sub-document"""
+    return {
+        'version': FEATURES_VERSION,
+        'skills': normalize_skills(matching_skills(user)),
+        'experience_years': _number(user.get('experience')),
+        'education_level': education_level(_text(user.get('education')).lower()),
+        'location': _text(user.get('location')).lower(),
+        'salary_bounds': salary_bounds(user.get('salary_expectation', [0, 0])),
+        # Identifies the profile text, so its TF-IDF vector can be cached
+        'text_digest': hashlib.blake2b(profile_text(user).encode(), digest_size=16).hexdigest()
+    }
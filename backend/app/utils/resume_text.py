@@ -0,0 +1,48 @@
+# backend/app/utils/resume_text.py
+import os
+
+# PDF and DOCX parsers are in requirements.txt; if one is missing the import
+# still works and those resumes are reported as not parseable yet
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    import docx
+except ImportError:
+    docx = None
+
+
+class UnsupportedResumeFormat(ValueError):
+    pass
+
+
+class ResumeParserUnavailable(RuntimeError):
+    """The format is supported but its parser library is not installed"""
+
+
+def extract_text(file_path):
+    """Plain text of a PDF, DOCX or TXT resume.
+
+    Runs in the resume parser process pool, so it only depends on the file.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == '.pdf':
+        if PdfReader is None:
+            raise ResumeParserUnavailable('pypdf is required to parse PDF resumes')
+        reader = PdfReader(file_path)
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+    if extension == '.docx':
+        if docx is None:
+            raise ResumeParserUnavailable('python-docx is required to parse DOCX resumes')
+        document = docx.Document(file_path)
+        return '\n'.join(paragraph.text for paragraph in document.paragraphs)
+
+    if extension == '.txt':
+        with open(file_path, encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    raise UnsupportedResumeFormat(f'Unsupported resume format: {extension or "no extension"}')
@@ -0,0 +1,28 @@
+# backend/backfill_job_requirements.py
+import argparse
+from itertools import islice
+from app import create_app
+
+def backfill_job_requirements(batch_size=500):
+    """Store derived requirements on jobs written before they existed (or by an older version)"""
+    app = create_app()
+    
+    with app.app_context():
+        from app.models.job import Job
+        
+        jobs = Job.find_stale_requirements(batch_size)
+        updated = 0
+        while True:
+            batch = list(islice(jobs, batch_size))
+            if not batch:
+                break
+            updated += Job.backfill_requirements(batch)
+        
+        print(f"Stored derived requirements on {updated} job(s)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill the derived requirements of jobs')
+    parser.add_argument('--batch-size', type=int, default=500, help='jobs updated per bulk write')
+    args = parser.parse_args()
+    
+    backfill_job_requirements(args.batch_size)
@@ -0,0 +1,28 @@
+# backend/backfill_profile_features.py
+import argparse
+from itertools import islice
+from app import create_app
+
+def backfill_profile_features(batch_size=500):
+    """Store matching features on jobseekers written before they existed (or by an older version)"""
+    app = create_app()
+    
+    with app.app_context():
+        from app.models.user import User
+        
+        users = User.find_stale_features(batch_size)
+        updated = 0
+        while True:
+            batch = list(islice(users, batch_size))
+            if not batch:
+                break
+            updated += User.backfill_features(batch)
+        
+        print(f"Stored matching features on {updated} jobseeker(s)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill the matching features of jobseekers')
+    parser.add_argument('--batch-size', type=int, default=500, help='jobseekers updated per bulk write')
+    args = parser.parse_args()
+    
+    backfill_profile_features(args.batch_size)
@@ -0,0 +1,312 @@
+# backend/benchmark.py
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+from config import Config
+
+# The document kind is encoded in the first byte of every generated ObjectId,
+# so a given seed and scale always produce the same ids
+ID_PREFIX = {'admin': 1, 'employer': 2, 'jobseeker': 3, 'job': 4, 'application': 5}
+APPLICATION_STATUSES = ['Applied', 'Under Review', 'Interview', 'Hired', 'Rejected']
+
+
+class BenchmarkConfig(Config):
+    TESTING = True
+    MONGO_URI = 'mongodb://localhost:27017/smartmatch_bench'
+    MATCH_QUEUE_BACKEND = 'memory'
+
+
+def synthetic_id(kind, index):
+    return ObjectId(f'{ID_PREFIX[kind]:02x}{index:022x}')
+
+
+def generate_catalog(jobs, jobseekers, applications_per_jobseeker=2, seed=42, now=None):
+    """Yield (collection, document) pairs of a deterministic synthetic catalog.
+
+    Uses the vocabularies of seed_data.py. Documents are produced lazily so
+    catalogs of millions of documents never sit in memory at once.
+    """
+    from seed_data import SKILL_SETS, EDUCATION_LEVELS, LOCATIONS, JOB_TITLES, JOB_DESCRIPTIONS
+
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    all_skills = sorted({skill for skills in SKILL_SETS for skill in skills})
+    employers = max(5, jobs // 50)
+
+    def days_ago(max_days):
+        return now - timedelta(days=rng.randint(0, max_days), seconds=rng.randint(0, 86399))
+
+    def skills():
+        primary = rng.sample(rng.choice(SKILL_SETS), rng.randint(2, 4))
+        return primary + [skill for skill in rng.sample(all_skills, rng.randint(0, 2)) if skill not in primary]
+
+    yield 'users', {'_id': synthetic_id('admin', 0), 'name': 'Benchmark Admin', 'email': 'admin@bench.smartmatch.com',
+                    'password_hash': '!', 'role': 'admin', 'created_at': now, 'last_active': now}
+
+    for i in range(employers):
+        yield 'users', {
+            '_id': synthetic_id('employer', i), 'name': f'Employer {i}', 'email': f'employer{i}@bench.smartmatch.com',
+            'password_hash': '!', 'role': 'employer', 'company_name': f'Tech Company {i}',
+            'verified': True, 'jobs': [], 'created_at': days_ago(365), 'last_active': days_ago(30)
+        }
+
+    for i in range(jobseekers):
+        low = rng.randint(40000, 80000)
+        yield 'users', {
+            '_id': synthetic_id('jobseeker', i), 'name': f'Jobseeker {i}', 'email': f'jobseeker{i}@bench.smartmatch.com',
+            'password_hash': '!', 'role': 'jobseeker', 'location': rng.choice(LOCATIONS), 'skills': skills(),
+            'experience': rng.randint(0, 15), 'education': rng.choice(EDUCATION_LEVELS),
+            'salary_expectation': [low, rng.randint(low, 150000)], 'profile_complete': rng.randint(40, 100),
+            'applications': [], 'saved_jobs': [], 'created_at': days_ago(365), 'last_active': days_ago(60)
+        }
+
+    for i in range(jobs):
+        created_at = days_ago(365)
+        low = rng.randint(50000, 90000)
+        yield 'jobs', {
+            '_id': synthetic_id('job', i), 'title': rng.choice(JOB_TITLES), 'description': rng.choice(JOB_DESCRIPTIONS),
+            'required_skills': skills(), 'preferred_skills': rng.sample(all_skills, rng.randint(0, 3)),
+            'location': rng.choice(LOCATIONS), 'salary_range': [low, rng.randint(low, 160000)],
+            'remote': rng.random() < 0.3, 'employer_id': str(synthetic_id('employer', rng.randrange(employers))),
+            'created_at': created_at, 'updated_at': created_at, 'active': True
+        }
+
+    count = 0
+    for i in range(jobseekers):
+        for job_index in rng.sample(range(jobs), min(applications_per_jobseeker, jobs)):
+            applied_at = days_ago(180)
+            status = rng.choice(APPLICATION_STATUSES)
+            yield 'applications', {
+                '_id': synthetic_id('application', count), 'jobseeker_id': str(synthetic_id('jobseeker', i)),
+                'job_id': str(synthetic_id('job', job_index)),
+                'employer_id': str(synthetic_id('employer', job_index % employers)),
+                'status': status, 'applied_at': applied_at,
+                'updated_at': applied_at + timedelta(days=rng.randint(1, 45)) if status != 'Applied' else applied_at
+            }
+            count += 1
+
+
+def load_catalog(db, documents, chunk_size=10000):
+    """Bulk insert a generated catalog and write the matching analytics rollups."""
+    from app.models.daily_stats import DailyStats
+    from app.utils.job_requirements import derive_job_requirements
+    from app.utils.profile_features import derive_profile_features
+
+    pending = defaultdict(list)
+    counts = Counter()
+    days = defaultdict(lambda: {'users': Counter(), 'jobs': 0, 'applications': 0, 'high_match_applications': 0})
+    skill_counts = Counter()
+
+    for collection, doc in documents:
+        pending[collection].append(doc)
+        counts[collection] += 1
+        if collection == 'users':
+            days[DailyStats.day_key(doc['created_at'])]['users'][doc['role']] += 1
+            if doc['role'] == 'jobseeker':
+                # As stored by User.create
+                doc['features'] = derive_profile_features(doc)
+                skill_counts.update({DailyStats.normalize_skill(skill) for skill in doc['skills']})
+        elif collection == 'jobs':
+            # As stored by Job.create
+            doc['derived'] = derive_job_requirements(doc)
+            days[DailyStats.day_key(doc['created_at'])]['jobs'] += 1
+        else:
+            days[DailyStats.day_key(doc['applied_at'])]['applications'] += 1
+
+        if len(pending[collection]) >= chunk_size:
+            db[collection].insert_many(pending.pop(collection), ordered=False)
+
+    for collection, docs in pending.items():
+        db[collection].insert_many(docs, ordered=False)
+
+    DailyStats.replace_days([
+        {**day, 'date': datetime.strptime(key, '%Y-%m-%d'), 'users': dict(day['users'])}
+        for key, day in days.items()
+    ])
+    DailyStats.replace_skills(skill_counts)
+    return dict(counts)
+
+
+def benchmark_cases(app, jobs, jobseekers, seed):
+    """(name, callable) pairs; each call is one round of the case"""
+    from flask_jwt_extended import create_access_token
+    from app.models.user import User
+    from app.models.job import Job
+    from app.services.matching_service import MatchingService
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(seed)
+    seeker_ids = [str(synthetic_id('jobseeker', rng.randrange(jobseekers))) for _ in range(50)]
+    job_ids = [str(synthetic_id('job', rng.randrange(jobs))) for _ in range(50)]
+    pairs = itertools.cycle(list(zip(seeker_ids, job_ids)))
+    seekers, job_cycle = itertools.cycle(seeker_ids), itertools.cycle(job_ids)
+
+    sample_jobs = list(Job.collection.find({'active': True}).limit(1000))
+    seeker_docs = itertools.cycle(User.find_by_ids(seeker_ids[:10]))
+
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {create_access_token(identity=str(synthetic_id('admin', 0)))}"}
+
+    def get(path):
+        response = client.get(path, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f'GET {path} returned {response.status_code}')
+
+    return [
+        ('calculate_match', lambda: MatchingService.calculate_match(*next(pairs))),
+        ('generate_matches_for_jobseeker', lambda: MatchingService.generate_matches_for_jobseeker(next(seekers), 20)),
+        ('generate_matches_for_job', lambda: MatchingService.generate_matches_for_job(next(job_cycle), 20)),
+        ('semantic.fit', SemanticModel.fit),
+        ('semantic.score_jobs', lambda: SemanticModel.score_jobs(next(seeker_docs), sample_jobs)),
+        ('analytics.platform', lambda: get('/api/admin/analytics?period=year')),
+        ('analytics.dashboard', lambda: get('/api/admin/dashboard')),
+    ]
+
+
+def run_case(func, rounds, warmup):
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    mean = statistics.mean(timings)
+    return {
+        'rounds': rounds,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': mean,
+        'median': statistics.median(timings),
+        'stddev': statistics.stdev(timings) if rounds > 1 else 0.0,
+        'ops': 1 / mean if mean else None
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline_path, benchmarks):
+    """Print the median change of every case against an earlier results file."""
+    with open(baseline_path) as f:
+        baseline = {bench['name']: bench for bench in json.load(f)['benchmarks']}
+
+    print(f"\n{'case':<34}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for bench in benchmarks:
+        before = baseline.get(bench['name'], {}).get('stats')
+        after = bench.get('stats')
+        if not before or not after:
+            print(f"{bench['name']:<34}{'-':>14}{'-':>14}{'n/a':>10}")
+            continue
+        change = (after['median'] - before['median']) / before['median'] * 100
+        print(f"{bench['name']:<34}{before['median'] * 1000:>14.2f}{after['median'] * 1000:>14.2f}{change:>+9.1f}%")
+
+
+def use_mongomock():
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit('--backend mongomock needs the mongomock package')
+    import flask_pymongo
+    # Flask-PyMongo builds its client through this name, so every model
+    # collection ends up on the in-memory server
+    flask_pymongo.MongoClient = lambda *args, **kwargs: mongomock.MongoClient()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Matching and analytics benchmarks on a synthetic catalog')
+    parser.add_argument('--scale', type=int, default=1000, help='number of jobs and of jobseekers (10^3 - 10^6)')
+    parser.add_argument('--jobs', type=int, help='override the number of jobs')
+    parser.add_argument('--jobseekers', type=int, help='override the number of jobseekers')
+    parser.add_argument('--applications-per-jobseeker', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('-k', '--filter', help='only run cases whose name contains this text')
+    parser.add_argument('--backend', choices=['mongomock', 'mongod'], default='mongomock')
+    parser.add_argument('--mongo-uri', default=BenchmarkConfig.MONGO_URI, help='database used with --backend mongod')
+    parser.add_argument('--drop', action='store_true', help='allow dropping a non-empty --mongo-uri database')
+    parser.add_argument('--output', help='write pytest-benchmark style JSON results here')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare against')
+    args = parser.parse_args()
+
+    jobs = args.jobs or args.scale
+    jobseekers = args.jobseekers or args.scale
+
+    if args.backend == 'mongomock':
+        use_mongomock()
+    BenchmarkConfig.MONGO_URI = args.mongo_uri
+    # A fresh semantic model artifact, fitted on the synthetic catalog
+    BenchmarkConfig.SEMANTIC_MODEL_PATH = os.path.join(tempfile.mkdtemp(prefix='smartmatch-bench-'), 'semantic_model.joblib')
+
+    from app import create_app, mongo
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        from init_db import init_indexes
+
+        if args.backend == 'mongod':
+            if mongo.db.users.estimated_document_count() and not args.drop:
+                raise SystemExit(f'{mongo.db.name} is not empty; pass --drop to replace its contents')
+            mongo.cx.drop_database(mongo.db.name)
+
+        start = time.perf_counter()
+        counts = load_catalog(mongo.db, generate_catalog(jobs, jobseekers, args.applications_per_jobseeker, args.seed))
+        init_indexes(app)
+        print(f"Loaded {counts} in {time.perf_counter() - start:.1f}s")
+
+        benchmarks = []
+        for name, func in benchmark_cases(app, jobs, jobseekers, args.seed):
+            if args.filter and args.filter not in name:
+                continue
+            try:
+                stats = run_case(func, args.rounds, args.warmup)
+            except Exception as e:
+                # e.g. aggregation stages mongomock does not implement
+                benchmarks.append({'name': name, 'error': f'{type(e).__name__}: {e}'})
+                print(f"{name:<34}ERROR {type(e).__name__}: {e}")
+                continue
+            benchmarks.append({'name': name, 'stats': stats})
+            print(f"{name:<34}median {stats['median'] * 1000:10.2f} ms   min {stats['min'] * 1000:10.2f} ms   {stats['ops']:10.1f} ops/s")
+
+    results = {
+        'machine_info': {'python_version': platform.python_version(), 'platform': platform.platform(),
+                         'cpu_count': os.cpu_count()},
+        'commit_info': {'id': git_commit()},
+        'datetime': datetime.utcnow().isoformat(),
+        'params': {'backend': args.backend, 'jobs': jobs, 'jobseekers': jobseekers,
+                   'applications': counts.get('applications', 0), 'seed': args.seed,
+                   'rounds': args.rounds, 'warmup': args.warmup},
+        'benchmarks': benchmarks
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        compare(args.compare, benchmarks)
+
+    # mongomock lacks some aggregation stages; against a real server every case must run
+    return 1 if any('error' in bench for bench in benchmarks) and args.backend == 'mongod' else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
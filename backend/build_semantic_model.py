@@ -0,0 +1,19 @@
+# backend/build_semantic_model.py
+from app import create_app
+from app.services.semantic_model import SemanticModel
+
+def build_semantic_model():
+    """Refit the corpus TF-IDF model and write it to the on-disk artifact"""
+    app = create_app()
+    
+    with app.app_context():
+        version = SemanticModel.fit()
+        path = SemanticModel.save()
+        
+        if path is None:
+            print("No jobs or profiles to fit the semantic model on; nothing written")
+        else:
+            print(f"Semantic model {version} written to {path}")
+
+if __name__ == '__main__':
+    build_semantic_model()
@@ -0,0 +1,135 @@
+# backend/check_indexes.py
+import sys
+from datetime import datetime, timedelta
+from bson import ObjectId
+from bson.son import SON
+from pymongo import monitoring
+from app import create_app, mongo
+
+# Command fields added by the driver that explain does not accept
+DRIVER_FIELDS = {'lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'signature'}
+FLAGGED_STAGES = {'COLLSCAN', 'SORT'}
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """Collects the read commands issued while a model method runs"""
+    READ_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        if event.command_name in self.READ_COMMANDS:
+            command = SON((key, value) for key, value in event.command.items() if key not in DRIVER_FIELDS)
+            self.commands.append(command)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def model_queries():
+    """(name, call, allowed stages) for every read query issued by the models"""
+    from app.models.user import User
+    from app.models.job import Job
+    from app.models.application import Application
+    from app.models.match import Match
+    from app.models.notification import Notification
+    from app.models.daily_stats import DailyStats
+    from app.services.analytics_service import AnalyticsService
+    from app.services.match_queue import MongoMatchQueue
+    from app.services.email_outbox import EmailOutbox
+    from app.utils.pagination import encode_cursor
+
+    some_id = str(ObjectId())
+    now = datetime.utcnow()
+    created_cursor = encode_cursor({'_id': ObjectId(), 'created_at': now}, 'created_at')
+    score_cursor = encode_cursor({'_id': ObjectId(), 'overall_score': 50}, 'overall_score')
+
+    return [
+        ('User.find_by_email', lambda: User.find_by_email('advisor@example.com'), set()),
+        ('User.find_by_ids', lambda: User.find_by_ids([some_id]), set()),
+        ('User.find_recent_jobseeker_ids', lambda: User.find_recent_jobseeker_ids(10, {some_id}), set()),
+        ('Job.find_by_ids', lambda: Job.find_by_ids([some_id]), set()),
+        ('Job.find_recent_ids', lambda: Job.find_recent_ids(10, {some_id}), set()),
+        ('Job.find_by_employer', lambda: Job.find_by_employer(some_id), set()),
+        ('Job.find_all', lambda: Job.find_all({'remote': True, 'skills': ['Python']}), set()),
+        ('Job.find_all (cursor)', lambda: Job.find_all(cursor=created_cursor), set()),
+        # Text results are ordered by relevance, which is always an in-memory sort
+        ('Job.search', lambda: Job.search('python developer'), {'SORT'}),
+        ('Application.find_by_jobseeker', lambda: Application.find_by_jobseeker(some_id), set()),
+        ('Application.find_by_job', lambda: Application.find_by_job(some_id), set()),
+        ('Application.has_applied', lambda: Application.has_applied(some_id, some_id), set()),
+        ('Match.find_by_user_job', lambda: Match.find_by_user_job(some_id, some_id), set()),
+        ('Match.find_by_user', lambda: Match.find_by_user(some_id, cursor=score_cursor), set()),
+        ('Match.find_by_job', lambda: Match.find_by_job(some_id, cursor=score_cursor), set()),
+        ('Match.find_by_job_and_users', lambda: Match.find_by_job_and_users(some_id, [some_id]), set()),
+        ('Notification.find_by_recipient', lambda: Notification.find_by_recipient(some_id, cursor=created_cursor), set()),
+        ('Notification.find_by_recipient (unread)', lambda: Notification.find_by_recipient(some_id, unread_only=True), set()),
+        ('Notification.get_unread_count', lambda: Notification.get_unread_count(some_id), set()),
+        ('Notification.find_after', lambda: Notification.find_after(some_id, ObjectId()), set()),
+        ('DailyStats.find_days', lambda: DailyStats.find_days(now - timedelta(days=30)), set()),
+        ('DailyStats.top_skills', lambda: DailyStats.top_skills(), set()),
+        ('AnalyticsService._get_match_success_rate', lambda: AnalyticsService._get_match_success_rate(now - timedelta(days=30)), set()),
+        ('AnalyticsService._get_time_to_hire', lambda: AnalyticsService._get_time_to_hire(now - timedelta(days=30)), set()),
+        ('MongoMatchQueue.pending_count', lambda: MongoMatchQueue().pending_count(), set()),
+        ('EmailOutbox.pending_count', lambda: EmailOutbox().pending_count(), set()),
+    ]
+
+
+def plan_stages(explain_output):
+    """Stage names and index names of the winning plan(s), rejected plans excluded"""
+    stages, indexes = set(), set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            if 'stage' in node:
+                stages.add(node['stage'])
+                if node.get('indexName'):
+                    indexes.add(node['indexName'])
+            for key, value in node.items():
+                if key != 'rejectedPlans':
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(explain_output)
+    return stages, indexes
+
+
+def check_indexes():
+    """Explain every model query and flag collection scans and in-memory sorts"""
+    recorder = QueryRecorder()
+    monitoring.register(recorder)
+    app = create_app()
+    problems = 0
+
+    with app.app_context():
+        for name, call, allowed in model_queries():
+            recorder.commands = []
+            call()
+
+            for command in recorder.commands:
+                explain = mongo.db.command(SON([('explain', command), ('verbosity', 'queryPlanner')]))
+                stages, indexes = plan_stages(explain)
+                flagged = (stages & FLAGGED_STAGES) - allowed
+
+                if 'EOF' in stages and not indexes:
+                    status = 'SKIP'   # collection does not exist yet
+                elif flagged:
+                    status = 'FAIL'
+                    problems += 1
+                else:
+                    status = 'OK'
+                detail = ', '.join(sorted(flagged)) if flagged else ', '.join(sorted(indexes)) or '-'
+                print(f"{status:<5}{name:<48}{command.get('find') or command.get('aggregate') or '':<16}{detail}")
+
+    print(f"{problems} quer{'y' if problems == 1 else 'ies'} without a usable index")
+    return problems
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_indexes() else 0)
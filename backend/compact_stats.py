@@ -0,0 +1,31 @@
+# backend/compact_stats.py
+import argparse
+from datetime import datetime, timedelta
+from app import create_app
+
+def compact_stats(days, backfill=False):
+    """Recompute the daily analytics rollups; run periodically (e.g. from cron)"""
+    app = create_app()
+    
+    with app.app_context():
+        from app.models.user import User
+        from app.services.analytics_service import AnalyticsService
+        
+        start_date = datetime.utcnow() - timedelta(days=days - 1)
+        if backfill:
+            first_user = User.collection.find_one({}, {'created_at': 1}, sort=[('created_at', 1)])
+            if first_user:
+                start_date = first_user['created_at']
+        
+        compacted_days = AnalyticsService.compact_daily_stats(start_date)
+        skills = AnalyticsService.rebuild_skill_stats()
+        
+        print(f"Compacted {compacted_days} day(s) of stats and {skills} skill counter(s)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compact the daily analytics rollups')
+    parser.add_argument('--days', type=int, default=2, help='number of most recent days to recompute')
+    parser.add_argument('--backfill', action='store_true', help='recompute the whole history')
+    args = parser.parse_args()
+    
+    compact_stats(args.days, args.backfill)
@@ -22,14 +22,76 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
+    # === Identity cache (role / verified / suspended claims) ===
+    IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", 30))  # seconds, 0 disables
+    IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", 10000))
+
 
    # === File Uploads ===
     UPLOAD_FOLDER = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads'
 )
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))  # 16MB
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))  # bytes read per chunk while hashing
+    UPLOAD_DELETE_TIMEOUT = int(os.getenv("UPLOAD_DELETE_TIMEOUT", 10))  # seconds a store waits for a delete of the same content
+    UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", 3600))  # seconds browsers may reuse a download
+    # Let the reverse proxy stream downloads: "" (Flask serves), "x-sendfile" or "x-accel-redirect" (nginx)
+    UPLOAD_SENDFILE_MODE = os.getenv("UPLOAD_SENDFILE_MODE", "")
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")  # internal location aliased to UPLOAD_FOLDER
+
+    # === Resume extraction (runs in the match worker) ===
+    RESUME_PARSER_PROCESSES = int(os.getenv("RESUME_PARSER_PROCESSES", 2))
+    RESUME_PARSE_TIMEOUT = int(os.getenv("RESUME_PARSE_TIMEOUT", 60))  # seconds per file
+    RESUME_TEXT_MAX_CHARS = int(os.getenv("RESUME_TEXT_MAX_CHARS", 20000))  # text kept for the semantic score
+
+    # === Matching ===
+    SEMANTIC_MODEL_PATH = os.getenv(
+        "SEMANTIC_MODEL_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts', 'semantic_model.joblib')
+    )
+    # Only the top candidates by skill overlap are fully scored
+    MATCH_CANDIDATE_LIMIT = int(os.getenv("MATCH_CANDIDATE_LIMIT", 1000))
+    # Recall guard: top up with recent candidates when too few share a skill
+    MATCH_MIN_CANDIDATES = int(os.getenv("MATCH_MIN_CANDIDATES", 50))
+    SKILL_INDEX_TTL = int(os.getenv("SKILL_INDEX_TTL", 300))  # seconds
+    SEMANTIC_REFIT_INTERVAL = int(os.getenv("SEMANTIC_REFIT_INTERVAL", 300))  # seconds between fits while there is no corpus
+    # TF-IDF vectors of jobseeker profiles, reused until the profile or the model changes
+    SEMANTIC_VECTOR_CACHE_SIZE = int(os.getenv("SEMANTIC_VECTOR_CACHE_SIZE", 10000))
+    SEMANTIC_VECTOR_CACHE_TTL = int(os.getenv("SEMANTIC_VECTOR_CACHE_TTL", 3600))  # seconds
+    # Candidates are streamed and scored in chunks of this size
+    MATCH_SCORE_CHUNK_SIZE = int(os.getenv("MATCH_SCORE_CHUNK_SIZE", 256))
+    # Pure sub-scores (location, education, salary, ...) are memoized by input fingerprint
+    SCORE_CACHE_BACKEND = os.getenv("SCORE_CACHE_BACKEND", "memory")  # memory, sqlite (shared by local processes) or none
+    SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", 100000))  # entries per process
+    SCORE_CACHE_TTL = int(os.getenv("SCORE_CACHE_TTL", 3600))  # seconds
+    SCORE_CACHE_PATH = os.getenv(
+        "SCORE_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts', 'score_cache.sqlite3')
+    )
+    SCORE_CACHE_SHARED_SIZE = int(os.getenv("SCORE_CACHE_SHARED_SIZE", 1000000))
+
+    # === Job search ===
+    JOB_SEARCH_ENGINE = os.getenv("JOB_SEARCH_ENGINE", "text")  # text (MongoDB text index) or bm25 (in-process)
 
+    # === Notification stream (server-sent events) ===
+    NOTIFICATION_BUS_BACKEND = os.getenv("NOTIFICATION_BUS_BACKEND", "memory")
+    NOTIFICATION_STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", 100))  # per client
+    NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", 15))  # seconds
+    NOTIFICATION_STREAM_MAX_AGE = int(os.getenv("NOTIFICATION_STREAM_MAX_AGE", 300))  # seconds before the client reconnects
 
+    # === Background match worker ===
+    MATCH_QUEUE_BACKEND = os.getenv("MATCH_QUEUE_BACKEND", "mongo")  # mongo or memory
+    MATCH_WORKER_PROCESSES = int(os.getenv("MATCH_WORKER_PROCESSES", 2))
+    MATCH_WORKER_BATCH_SIZE = int(os.getenv("MATCH_WORKER_BATCH_SIZE", 20))
+    MATCH_WORKER_POLL_INTERVAL = float(os.getenv("MATCH_WORKER_POLL_INTERVAL", 2))  # seconds
+    MATCH_TASK_TIMEOUT = int(os.getenv("MATCH_TASK_TIMEOUT", 600))  # seconds before a claimed task is retried
+    MATCH_TASK_MAX_ATTEMPTS = int(os.getenv("MATCH_TASK_MAX_ATTEMPTS", 5))
+    MATCH_TASK_FAILED_RETENTION_DAYS = int(os.getenv("MATCH_TASK_FAILED_RETENTION_DAYS", 7))  # failed tasks are then dropped
+
+    # === Metrics ===
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # bearer token for /metrics; required outside development
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "False") == "True"  # exposes DB timings to clients
 
     # === Email Settings ===
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
@@ -39,3 +101,11 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", "noreply@smartmatch.com")
+
+    # === Email outbox (drained by mail_worker.py) ===
+    EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))  # messages per claim
+    EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", 5))  # seconds
+    EMAIL_SEND_TIMEOUT = int(os.getenv("EMAIL_SEND_TIMEOUT", 300))  # seconds before a claimed message is retried
+    EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 6))
+    EMAIL_RETRY_DELAY = int(os.getenv("EMAIL_RETRY_DELAY", 30))  # seconds, doubled after each failure
+    EMAIL_SENT_RETENTION_DAYS = int(os.getenv("EMAIL_SENT_RETENTION_DAYS", 7))
@@ -1,26 +1,42 @@
 # backend/init_db.py
-from app import create_app
+from app import create_app, mongo
 from app.models.user import User
 from app.models.job import Job
 from app.models.application import Application
 from app.models.match import Match
 from app.models.notification import Notification
+from app.models.daily_stats import DailyStats
 from bson.objectid import ObjectId
 
-def init_indexes():
-    """Initialize MongoDB indexes for better performance"""
-    app = create_app()
+# Single-field indexes superseded by a compound index with the same prefix
+OBSOLETE_INDEXES = {
+    'users': ['role_1'],
+    'jobs': ['active_1'],
+    'matches': ['overall_score_1'],
+    'notifications': ['recipient_id_1', 'read_1'],
+}
+
+def init_indexes(app=None):
+    """Initialize MongoDB indexes for better performance.
+
+    Compound indexes follow the equality -> sort -> range order of the model
+    queries; check_indexes.py verifies every model query against them.
+    """
+    app = app or create_app()
     
     with app.app_context():
         # User indexes
         User.collection.create_index("email", unique=True)
-        User.collection.create_index("role")
         User.collection.create_index("created_at")
+        User.collection.create_index([("role", 1), ("_id", 1)])  # admin listing + cursor
+        User.collection.create_index([("role", 1), ("last_active", -1)])  # recent jobseekers
+        User.collection.create_index("verification_token", sparse=True)
         
         # Job indexes
         Job.collection.create_index("employer_id")
         Job.collection.create_index("created_at")
-        Job.collection.create_index("active")
+        Job.collection.create_index([("active", 1), ("created_at", -1), ("_id", -1)])  # listing + cursor
+        Job.collection.create_index([("active", 1), ("_id", 1)])  # admin listing + cursor
         Job.collection.create_index([
             ("title", "text"),
             ("description", "text"),
@@ -30,19 +46,50 @@ def init_indexes():
         
         # Application indexes
         Application.collection.create_index([("jobseeker_id", 1), ("job_id", 1)], unique=True)
-        Application.collection.create_index("job_id")
+        Application.collection.create_index([("jobseeker_id", 1), ("applied_at", -1)])
+        Application.collection.create_index([("job_id", 1), ("applied_at", -1)])
         Application.collection.create_index("employer_id")
         Application.collection.create_index("applied_at")
+        Application.collection.create_index([("status", 1), ("updated_at", 1)])  # time to hire
         
         # Match indexes
         Match.collection.create_index([("user_id", 1), ("job_id", 1)], unique=True)
-        Match.collection.create_index("overall_score")
+        Match.collection.create_index([("user_id", 1), ("overall_score", -1), ("_id", -1)])
+        Match.collection.create_index([("job_id", 1), ("overall_score", -1), ("_id", -1)])
         Match.collection.create_index("updated_at")
         
+        # Match task queue indexes
+        mongo.db.match_tasks.create_index([("status", 1), ("available_at", 1)])
+        # One pending task per entity, so concurrent enqueues coalesce
+        mongo.db.match_tasks.create_index(
+            [("kind", 1), ("jobseeker_id", 1), ("job_id", 1), ("status", 1)],
+            name='pending_task_key', unique=True, partialFilterExpression={'status': 'pending'}
+        )
+        # Failed tasks are kept for inspection, then expire
+        mongo.db.match_tasks.create_index(
+            "failed_at", expireAfterSeconds=app.config['MATCH_TASK_FAILED_RETENTION_DAYS'] * 86400
+        )
+        
+        # Email outbox indexes; sent messages expire after the retention period
+        mongo.db.email_outbox.create_index([("status", 1), ("available_at", 1)])
+        mongo.db.email_outbox.create_index(
+            "sent_at", expireAfterSeconds=app.config['EMAIL_SENT_RETENTION_DAYS'] * 86400
+        )
+        
+        # Analytics rollup indexes (day documents are keyed by their date)
+        DailyStats.collection.create_index([("kind", 1), ("count", -1)])
+        
         # Notification indexes
-        Notification.collection.create_index("recipient_id")
-        Notification.collection.create_index("read")
         Notification.collection.create_index("created_at")
+        Notification.collection.create_index([("recipient_id", 1), ("created_at", -1), ("_id", -1)])
+        Notification.collection.create_index([("recipient_id", 1), ("read", 1), ("created_at", -1), ("_id", -1)])
+        Notification.collection.create_index([("recipient_id", 1), ("_id", 1)])  # stream resume
+        
+        for collection, names in OBSOLETE_INDEXES.items():
+            existing = mongo.db[collection].index_information()
+            for name in names:
+                if name in existing:
+                    mongo.db[collection].drop_index(name)
         
         print("Database indexes created successfully!")
 
@@ -0,0 +1,11 @@
+# backend/mail_worker.py
+import os
+import socket
+from app import create_app
+
+if __name__ == '__main__':
+    app = create_app()
+
+    with app.app_context():
+        from app.services.email_sender import EmailSender
+        EmailSender.run_forever(f'{socket.gethostname()}-{os.getpid()}')
@@ -0,0 +1,16 @@
+# backend/reconcile_notifications.py
+from app import create_app
+
+def reconcile_notifications():
+    """Repair the per-user unread notification counters; run periodically (e.g. from cron)"""
+    app = create_app()
+    
+    with app.app_context():
+        from app.models.notification import Notification
+        
+        corrected = Notification.reconcile_counters()
+        
+        print(f"Reconciled notification counters: {corrected} corrected")
+
+if __name__ == '__main__':
+    reconcile_notifications()
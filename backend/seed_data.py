@@ -10,6 +10,44 @@ from bson.objectid import ObjectId
 import random
 from datetime import datetime, timedelta
 
+# Vocabularies shared with benchmark.py's synthetic data generator
+SKILL_SETS = [
+    ['React', 'JavaScript', 'HTML', 'CSS'],
+    ['Python', 'Django', 'PostgreSQL', 'Docker'],
+    ['Java', 'Spring Boot', 'MySQL', 'Kubernetes'],
+    ['Node.js', 'Express', 'MongoDB', 'AWS'],
+    ['Angular', 'TypeScript', 'RxJS', 'NgRx'],
+    ['Vue.js', 'Vuex', 'JavaScript', 'Sass'],
+    ['PHP', 'Laravel', 'MySQL', 'Apache'],
+    ['Ruby', 'Rails', 'PostgreSQL', 'Heroku'],
+    ['C#', '.NET Core', 'SQL Server', 'Azure'],
+    ['Go', 'Docker', 'Kubernetes', 'gRPC']
+]
+
+EDUCATION_LEVELS = ['High School', 'Certificate', 'Associate', 'Bachelor', 'Master', 'PhD']
+LOCATIONS = ['New York', 'San Francisco', 'London', 'Berlin', 'Tokyo', 'Sydney', 'Toronto', 'Singapore']
+
+JOB_TITLES = [
+    'Frontend Developer',
+    'Backend Developer',
+    'Full Stack Developer',
+    'DevOps Engineer',
+    'Data Scientist',
+    'Product Manager',
+    'UX Designer',
+    'Mobile Developer',
+    'QA Engineer',
+    'Technical Writer'
+]
+
+JOB_DESCRIPTIONS = [
+    'We are looking for a talented developer to join our team and help build amazing products.',
+    'Join our innovative team and work on cutting-edge technology solutions.',
+    'We need a skilled professional to help us deliver high-quality software to our clients.',
+    'Looking for a passionate individual to contribute to our growing product portfolio.',
+    'Seeking a creative problem-solver to help us tackle complex challenges.'
+]
+
 def seed_data():
     app = create_app()
     
@@ -47,32 +85,16 @@ def seed_data():
         
         # Create jobseekers
         jobseekers = []
-        skills_list = [
-            ['React', 'JavaScript', 'HTML', 'CSS'],
-            ['Python', 'Django', 'PostgreSQL', 'Docker'],
-            ['Java', 'Spring Boot', 'MySQL', 'Kubernetes'],
-            ['Node.js', 'Express', 'MongoDB', 'AWS'],
-            ['Angular', 'TypeScript', 'RxJS', 'NgRx'],
-            ['Vue.js', 'Vuex', 'JavaScript', 'Sass'],
-            ['PHP', 'Laravel', 'MySQL', 'Apache'],
-            ['Ruby', 'Rails', 'PostgreSQL', 'Heroku'],
-            ['C#', '.NET Core', 'SQL Server', 'Azure'],
-            ['Go', 'Docker', 'Kubernetes', 'gRPC']
-        ]
-        
-        education_levels = ['High School', 'Certificate', 'Associate', 'Bachelor', 'Master', 'PhD']
-        locations = ['New York', 'San Francisco', 'London', 'Berlin', 'Tokyo', 'Sydney', 'Toronto', 'Singapore']
-        
         for i in range(1, 21):
             jobseeker_data = {
                 'name': f'Jobseeker {i}',
                 'email': f'jobseeker{i}@smartmatch.com',
                 'password': 'jobseeker123',
                 'role': 'jobseeker',
-                'location': random.choice(locations),
-                'skills': random.choice(skills_list),
+                'location': random.choice(LOCATIONS),
+                'skills': random.choice(SKILL_SETS),
                 'experience': random.randint(1, 15),
-                'education': random.choice(education_levels),
+                'education': random.choice(EDUCATION_LEVELS),
                 'salary_expectation': [random.randint(40000, 80000), random.randint(80000, 150000)],
                 'portfolio_links': [f'https://github.com/jobseeker{i}']
             }
@@ -87,35 +109,14 @@ def seed_data():
         
         # Create jobs
         jobs = []
-        job_titles = [
-            'Frontend Developer',
-            'Backend Developer',
-            'Full Stack Developer',
-            'DevOps Engineer',
-            'Data Scientist',
-            'Product Manager',
-            'UX Designer',
-            'Mobile Developer',
-            'QA Engineer',
-            'Technical Writer'
-        ]
-        
-        job_descriptions = [
-            'We are looking for a talented developer to join our team and help build amazing products.',
-            'Join our innovative team and work on cutting-edge technology solutions.',
-            'We need a skilled professional to help us deliver high-quality software to our clients.',
-            'Looking for a passionate individual to contribute to our growing product portfolio.',
-            'Seeking a creative problem-solver to help us tackle complex challenges.'
-        ]
-        
         for i in range(1, 31):
             employer_id = random.choice(employers)
             job_data = {
-                'title': random.choice(job_titles),
-                'description': random.choice(job_descriptions),
-                'required_skills': random.sample(random.choice(skills_list), random.randint(2, 4)),
-                'preferred_skills': random.sample(random.choice(skills_list), random.randint(1, 3)),
-                'location': random.choice(locations),
+                'title': random.choice(JOB_TITLES),
+                'description': random.choice(JOB_DESCRIPTIONS),
+                'required_skills': random.sample(random.choice(SKILL_SETS), random.randint(2, 4)),
+                'preferred_skills': random.sample(random.choice(SKILL_SETS), random.randint(1, 3)),
+                'location': random.choice(LOCATIONS),
                 'salary_range': [random.randint(50000, 90000), random.randint(90000, 160000)],
                 'remote': random.choice([True, False])
             }
@@ -0,0 +1,140 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def analytics_service():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        from app.services.analytics_service import AnalyticsService
+        yield AnalyticsService
+
+
+def test_percentiles_from_histogram(analytics_service):
+    """Nearest-rank percentiles are exact for integer-valued histograms"""
+    scores = [3, 7, 7, 10, 15, 40, 40, 41, 90, 100]
+    counts = {}
+    for score in scores:
+        counts[score] = counts.get(score, 0) + 1
+
+    assert analytics_service._percentiles(counts) == {'p25': 7, 'p50': 15, 'p75': 41, 'p90': 90}
+    assert analytics_service._percentiles({}) == {'p25': None, 'p50': None, 'p75': None, 'p90': None}
+
+
+@pytest.fixture
+def rollups(analytics_service, monkeypatch):
+    """Models and rollups on a mongomock database"""
+    import mongomock
+    from app.models.user import User
+    from app.models.job import Job
+    from app.models.application import Application
+    from app.models.match import Match
+    from app.models.daily_stats import DailyStats
+
+    db = mongomock.MongoClient().db
+    for model, collection in ((User, db.users), (Job, db.jobs), (Application, db.applications),
+                              (Match, db.matches), (DailyStats, db.daily_stats)):
+        monkeypatch.setattr(model, 'collection', collection)
+
+    # mongomock has no $lookup with `let`; every jobseeker below applies to
+    # one job, so joining on the jobseeker alone finds the same match
+    monkeypatch.setattr(analytics_service, '_match_score_lookup', staticmethod(lambda: {'$lookup': {
+        'from': 'matches', 'localField': 'jobseeker_id', 'foreignField': 'user_id', 'as': 'match'
+    }}))
+    return db
+
+
+def raw_analytics(db, start_date, high_match_score):
+    """The rollup part of the platform analytics, recomputed from the raw collections"""
+    from collections import Counter
+
+    def day(moment):
+        return moment.strftime('%Y-%m-%d')
+
+    users = Counter((day(user['created_at']), user['role'])
+                    for user in db.users.find({'created_at': {'$gte': start_date}}))
+    user_days = sorted({date for date, _ in users})
+    jobs = Counter(day(job['created_at']) for job in db.jobs.find({'created_at': {'$gte': start_date}}))
+    applications = Counter(day(application['applied_at'])
+                           for application in db.applications.find({'applied_at': {'$gte': start_date}}))
+    skills = Counter(skill for user in db.users.find({'role': 'jobseeker'})
+                     for skill in {skill.strip().lower() for skill in user.get('skills', [])})
+    scores = {match['user_id']: match['overall_score'] for match in db.matches.find()}
+    high_match = Counter(day(application['applied_at']) for application in db.applications.find()
+                         if scores.get(application['jobseeker_id'], 0) >= high_match_score)
+
+    return {
+        'user_growth': {
+            'jobseekers': [{'date': date, 'count': users[(date, 'jobseeker')]} for date in user_days],
+            'employers': [{'date': date, 'count': users[(date, 'employer')]} for date in user_days]
+        },
+        'job_trends': [{'date': date, 'count': count} for date, count in sorted(jobs.items())],
+        'application_trends': [{'date': date, 'count': count} for date, count in sorted(applications.items())],
+        'top_skills': [{'skill': skill, 'count': count}
+                       for skill, count in sorted(skills.items(), key=lambda item: (-item[1], item[0]))][:10],
+        'high_match_applications': dict(high_match)
+    }
+
+
+def test_rollups_match_raw_recomputation(analytics_service, rollups):
+    from datetime import datetime, timedelta
+    from bson.objectid import ObjectId
+    from app.models.user import User
+    from app.models.job import Job
+    from app.models.application import Application
+    from app.models.daily_stats import DailyStats
+
+    now = datetime.utcnow()
+    seekers = []
+    # Earlier days are written the way the models do it, with a past timestamp
+    for days_ago, role, skills in ((3, 'jobseeker', ['Python', ' python ', 'Go']), (3, 'employer', None),
+                                   (2, 'jobseeker', ['Go', 'Rust']), (45, 'jobseeker', ['COBOL'])):
+        created_at = now - timedelta(days=days_ago)
+        user_id = rollups.users.insert_one({'role': role, 'created_at': created_at, 'skills': skills or []}).inserted_id
+        DailyStats.increment({f'users.{role}': 1}, created_at)
+        if role == 'jobseeker':
+            DailyStats.update_skills(added=skills)
+            seekers.append(str(user_id))
+    seekers.append(User.create({'role': 'jobseeker', 'password': 'secret', 'skills': ['Rust', 'Docker']}))
+    User.create({'role': 'employer', 'password': 'secret'})
+
+    job_id = Job.create({'title': 'Backend Developer', 'required_skills': ['Go']}, 'employer-1')
+    old_job = {'created_at': now - timedelta(days=2), 'title': 'Data Engineer', 'active': True}
+    rollups.jobs.insert_one(old_job)
+    DailyStats.increment({'jobs': 1}, old_job['created_at'])
+
+    for jobseeker_id, score in zip(seekers, (85, 40, 70, 90)):
+        Application.create({'jobseeker_id': jobseeker_id, 'job_id': job_id})
+        rollups.matches.insert_one({'user_id': jobseeker_id, 'job_id': job_id, 'overall_score': score})
+    # A profile edit, applied the way User.update_profile does it
+    rollups.users.update_one({'_id': ObjectId(seekers[1])}, {'$set': {'skills': ['Rust', 'Kotlin']}})
+    DailyStats.update_skills(added=['Rust', 'Kotlin'], removed=['Go', 'Rust'])
+
+    start_date = now - timedelta(days=30)
+    expected = raw_analytics(rollups, start_date, analytics_service.HIGH_MATCH_SCORE)
+
+    def rollup_part(analytics):
+        # Skills with the same count come in no particular order
+        part = {key: analytics[key] for key in ('user_growth', 'job_trends', 'application_trends')}
+        part['top_skills'] = sorted(analytics['top_skills'], key=lambda skill: (-skill['count'], skill['skill']))
+        return part
+
+    # Written incrementally by the models
+    live = analytics_service.get_platform_analytics('month')
+    assert rollup_part(live) == {key: expected[key] for key in rollup_part(live)}
+    assert expected['top_skills'][0] == {'skill': 'rust', 'count': 2}
+
+    # Recomputed by the compaction, which also counts high-match applications
+    # (rebuild_skill_stats needs $trim, which mongomock does not implement)
+    assert analytics_service.compact_daily_stats(start_date) == 31
+    assert rollup_part(analytics_service.get_platform_analytics('month')) == rollup_part(live)
+    high_match = analytics_service.get_platform_analytics('month')['high_match_trends']
+    assert {day['date']: day['count'] for day in high_match} == expected['high_match_applications']
+
+    # A drifted day is repaired by the next compaction
+    today = DailyStats.day_key(now)
+    rollups.daily_stats.update_one({'_id': today}, {'$inc': {'jobs': 5, 'users.jobseeker': -1}})
+    assert rollup_part(analytics_service.get_platform_analytics('month')) != rollup_part(live)
+    analytics_service.compact_daily_stats(now)
+    assert rollup_part(analytics_service.get_platform_analytics('month')) == rollup_part(live)
@@ -0,0 +1,106 @@
+import socketserver
+import threading
+import pytest
+from bson import ObjectId
+from app import create_app
+
+
+class DebugSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that keeps every message it receives."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost debugging server')
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data in self.rfile:
+                    if data in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data)
+                self.server.messages.append(b''.join(lines))
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class FakeOutbox:
+    def __init__(self, messages):
+        self.messages = messages
+        self.completed, self.failed = [], []
+
+    def claim(self, worker_name, batch_size, timeout):
+        claimed, self.messages = self.messages[:batch_size], self.messages[batch_size:]
+        for message in claimed:
+            message['attempts'] += 1
+        return claimed
+
+    def complete(self, message):
+        self.completed.append(message['_id'])
+
+    def fail(self, message, error, max_attempts, retry_delay):
+        self.failed.append(message['_id'])
+
+
+def make_message(to):
+    return {'_id': ObjectId(), 'subject': 'Hello', 'recipients': [to], 'body': 'Hi', 'attempts': 0}
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), DebugSMTPHandler)
+    server.daemon_threads = True
+    server.connections, server.messages = 0, []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def app(smtp_server):
+    app = create_app()
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.server_address[1],
+                      MAIL_USE_TLS=False, MAIL_USE_SSL=False, MAIL_USERNAME=None,
+                      MAIL_PASSWORD=None, EMAIL_BATCH_SIZE=2)
+    with app.app_context():
+        # Flask-Mail reads its settings when the extension is initialised
+        from app import mail
+        mail.init_app(app)
+        yield app
+
+
+def test_batches_share_one_smtp_connection(app, smtp_server):
+    from app.services.email_sender import EmailSender, SMTPSession
+
+    outbox = FakeOutbox([make_message(f'user{i}@example.com') for i in range(3)])
+    session = SMTPSession()
+    assert EmailSender.run_once(session, outbox=outbox) == 2
+    assert EmailSender.run_once(session, outbox=outbox) == 1
+    assert EmailSender.run_once(session, outbox=outbox) == 0
+    session.close()
+
+    assert len(outbox.completed) == 3 and not outbox.failed
+    assert len(smtp_server.messages) == 3
+    assert smtp_server.connections == 1
+
+
+def test_unreachable_server_backs_off_whole_batch(app, smtp_server):
+    from app.services.email_sender import EmailSender, SMTPSession
+
+    smtp_server.shutdown()
+    smtp_server.server_close()
+    outbox = FakeOutbox([make_message('a@example.com'), make_message('b@example.com')])
+
+    assert EmailSender.run_once(SMTPSession(), outbox=outbox) == 2
+    assert len(outbox.failed) == 2 and not outbox.completed
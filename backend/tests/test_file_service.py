@@ -0,0 +1,187 @@
+import hashlib
+import io
+import os
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app()
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    with app.app_context():
+        yield app
+
+
+def test_stream_to_temp_hashes_in_chunks(tmp_path):
+    from app.services.file_service import stream_to_temp
+
+    data = os.urandom(10_000)
+    temp_path, sha256, size = stream_to_temp(io.BytesIO(data), str(tmp_path), chunk_size=1024)
+
+    assert sha256 == hashlib.sha256(data).hexdigest()
+    assert size == len(data)
+    with open(temp_path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_resolve_upload_path_expands_content_names(app, tmp_path):
+    from app.services.file_service import content_path, resolve_upload_path
+
+    sha256 = hashlib.sha256(b'resume').hexdigest()
+    stored = content_path('resumes', sha256, '.pdf')
+    expected = os.path.join(str(tmp_path), 'resumes', sha256[:2], sha256[2:4], f'{sha256}.pdf')
+
+    assert stored == f'resumes/{sha256[:2]}/{sha256[2:4]}/{sha256}.pdf'
+    assert resolve_upload_path('resumes', stored) == expected
+    assert resolve_upload_path('resumes', f'{sha256}.pdf') == expected
+    assert resolve_upload_path('resumes', 'old_cv.pdf') == os.path.join(str(tmp_path), 'resumes', 'old_cv.pdf')
+    assert resolve_upload_path('resumes', '../../etc/passwd') is None
+
+
+def store_resume(folder, data):
+    from app.services.file_service import content_path
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = content_path('resumes', sha256, '.pdf')
+    full_path = os.path.join(str(folder), *path.split('/'))
+    os.makedirs(os.path.dirname(full_path))
+    with open(full_path, 'wb') as f:
+        f.write(data)
+    return sha256
+
+
+def test_resume_download_is_conditional_and_ranged(app, tmp_path):
+    data = os.urandom(4096)
+    sha256 = store_resume(tmp_path, data)
+    client = app.test_client()
+    url = f'/api/applications/resumes/{sha256}.pdf'
+
+    response = client.get(url)
+    assert response.status_code == 200 and response.data == data
+    assert response.headers['ETag'] == f'"{sha256}"'
+    assert 'Last-Modified' in response.headers
+    assert 'private' in response.headers['Cache-Control']
+
+    assert client.get(url, headers={'If-None-Match': f'"{sha256}"'}).status_code == 304
+
+    partial = client.get(url, headers={'Range': 'bytes=100-199'})
+    assert partial.status_code == 206 and partial.data == data[100:200]
+    assert client.get(url, headers={'Range': 'bytes=9000-'}).status_code == 416
+
+
+def test_deleted_resume_is_not_revalidated(app, tmp_path):
+    sha256 = store_resume(tmp_path, b'%PDF-1.4 resume')
+    client = app.test_client()
+    url = f'/api/applications/resumes/{sha256}.pdf'
+    os.remove(os.path.join(str(tmp_path), 'resumes', sha256[:2], sha256[2:4], f'{sha256}.pdf'))
+
+    assert client.get(url, headers={'If-None-Match': f'"{sha256}"'}).status_code == 404
+
+
+def test_resume_download_can_be_delegated_to_proxy(app, tmp_path):
+    sha256 = store_resume(tmp_path, b'%PDF-1.4 resume')
+    app.config['UPLOAD_SENDFILE_MODE'] = 'x-accel-redirect'
+
+    response = app.test_client().get(f'/api/applications/resumes/{sha256}.pdf')
+    assert response.status_code == 200 and response.data == b''
+    assert response.headers['X-Accel-Redirect'] == f'/protected-uploads/resumes/{sha256[:2]}/{sha256[2:4]}/{sha256}.pdf'
+    assert response.headers['ETag'] == f'"{sha256}"'
+
+
+@pytest.fixture
+def stored_files(app, monkeypatch):
+    import mongomock
+    from app.models.stored_file import StoredFile
+
+    collection = mongomock.MongoClient().db.stored_files
+    monkeypatch.setattr(StoredFile, 'collection', collection)
+    return collection
+
+
+def upload(data):
+    from werkzeug.datastructures import FileStorage
+    return FileStorage(stream=io.BytesIO(data), filename='cv.pdf', content_type='application/pdf')
+
+
+def test_file_is_removed_with_its_last_reference(app, tmp_path, stored_files):
+    from app.services.file_service import delete_file, retain_file, save_uploaded_file
+
+    path = save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes')
+    assert save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes') == path
+    assert retain_file(path)
+    full_path = os.path.join(str(tmp_path), *path.split('/'))
+    assert stored_files.find_one({'_id': path})['refcount'] == 3
+
+    assert delete_file(path) is False and delete_file(path) is False
+    assert os.path.isfile(full_path)
+    assert delete_file(path) is True
+    assert not os.path.exists(full_path)
+    assert stored_files.count_documents({}) == 0
+    assert delete_file(path) is False and retain_file(path) is False
+
+
+def test_legacy_files_are_not_deleted(app, tmp_path, stored_files):
+    from app.services.file_service import delete_file
+
+    os.makedirs(tmp_path / 'resumes')
+    (tmp_path / 'resumes' / 'old_cv.pdf').write_bytes(b'%PDF-1.4')
+    assert delete_file('resumes/old_cv.pdf') is False
+    assert (tmp_path / 'resumes' / 'old_cv.pdf').exists()
+
+
+def test_store_waits_for_a_concurrent_delete(app, tmp_path, stored_files):
+    import threading
+    import time
+    from app.models.stored_file import StoredFile
+    from app.services.file_service import save_uploaded_file
+
+    path = save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes')
+    full_path = os.path.join(str(tmp_path), *path.split('/'))
+
+    # The last reference is dropped, the file is not removed yet
+    token = StoredFile.release(path)
+    assert token
+
+    def store_again():
+        with app.app_context():
+            save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes')
+
+    thread = threading.Thread(target=store_again)
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()
+
+    os.remove(full_path)
+    assert StoredFile.finish_delete(path, token) is False
+    thread.join(timeout=5)
+
+    assert os.path.isfile(full_path)
+    stored = stored_files.find_one({'_id': path})
+    assert stored['refcount'] == 1 and 'deleting' not in stored
+
+
+def test_stored_content_is_not_rewritten(app, tmp_path, stored_files, monkeypatch):
+    from app.services import file_service
+
+    path = file_service.save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes')
+    replaced = []
+    monkeypatch.setattr(file_service.os, 'replace', lambda src, dst: replaced.append(dst))
+
+    assert file_service.save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes') == path
+    assert replaced == []
+    assert os.listdir(tmp_path / '.tmp') == []
+    assert stored_files.find_one({'_id': path})['refcount'] == 2
+
+
+def test_failed_store_releases_its_reference(app, tmp_path, stored_files, monkeypatch):
+    from app.services import file_service
+
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(file_service.os, 'replace', failing_replace)
+
+    with pytest.raises(OSError):
+        file_service.save_uploaded_file(upload(b'%PDF-1.4 resume'), 'resumes')
+    assert stored_files.count_documents({}) == 0
+    assert os.listdir(tmp_path / '.tmp') == []
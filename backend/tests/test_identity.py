@@ -0,0 +1,57 @@
+import pytest
+from bson import ObjectId
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        yield app
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired():
+    from app.utils.cache import TTLCache
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+    expired = TTLCache(maxsize=2, ttl=0)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+
+def test_claims_are_cached_and_invalidated(app, monkeypatch):
+    """Role checks hit MongoDB once per user until the profile changes"""
+    from flask import g
+    from app.models.user import User
+    from app.utils import identity
+
+    user_id = str(ObjectId())
+    lookups = []
+
+    def find_by_id(requested_id):
+        lookups.append(requested_id)
+        return {'_id': ObjectId(requested_id), 'role': 'employer', 'verified': True}
+
+    monkeypatch.setattr(User, 'find_by_id', find_by_id)
+    monkeypatch.setattr(identity, 'get_jwt_identity', lambda: user_id)
+    monkeypatch.setattr(identity, '_claims_cache', None)
+
+    for _ in range(3):
+        with app.test_request_context():
+            assert identity.current_user_claims()['role'] == 'employer'
+            # The fixture's app context (and so `g`) outlives each request
+            g.pop('current_user', None)
+    assert len(lookups) == 1
+
+    identity.invalidate_user(user_id)
+    with app.test_request_context():
+        assert identity.current_user_claims()['verified'] is True
+    assert len(lookups) == 2
@@ -0,0 +1,20 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def job_model():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        from app.models.job import Job
+        yield Job
+
+
+def test_search_input_is_escaped(job_model):
+    """Text-search operators and regex metacharacters in user input are neutralized"""
+    assert job_model.text_search_terms('"senior dev" -java \\ - --') == 'senior dev java'
+    assert job_model.text_search_terms('""') == ''
+
+    query = job_model.filter_query({'location': 'London (UK'})
+    assert query['location']['$regex'] == r'London\ \(UK'
@@ -0,0 +1,135 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['MATCH_QUEUE_BACKEND'] = 'memory'
+    app.config['MATCH_TASK_MAX_ATTEMPTS'] = 2
+    with app.app_context():
+        from app.services.match_queue import MatchQueue, InMemoryMatchQueue
+        MatchQueue._memory_queue = InMemoryMatchQueue()
+        yield app
+
+
+def test_worker_coalesces_and_batches_tasks(app, monkeypatch):
+    """Repeated tasks are coalesced and pair tasks are scored per jobseeker"""
+    from app.services.match_queue import MatchQueue
+    from app.services.match_worker import MatchWorker
+    from app.services.matching_service import MatchingService
+
+    calls = []
+    monkeypatch.setattr(MatchingService, 'recompute_for_jobseeker', lambda jobseeker_id: calls.append(('jobseeker', jobseeker_id)))
+    monkeypatch.setattr(MatchingService, 'recompute_for_job', lambda job_id: calls.append(('job', job_id)))
+    monkeypatch.setattr(MatchingService, 'recompute_pairs', lambda jobseeker_id, job_ids: calls.append(('pairs', jobseeker_id, sorted(job_ids))))
+
+    MatchQueue.enqueue_jobseeker('seeker-1')
+    MatchQueue.enqueue_jobseeker('seeker-1')
+    MatchQueue.enqueue_job('job-1')
+    MatchQueue.enqueue_pair('seeker-2', 'job-1')
+    MatchQueue.enqueue_pair('seeker-2', 'job-2')
+
+    assert MatchQueue.backend().pending_count() == 4
+    assert MatchWorker.run_once() == 4
+    assert MatchWorker.run_once() == 0
+    assert sorted(calls, key=str) == sorted([
+        ('jobseeker', 'seeker-1'), ('job', 'job-1'), ('pairs', 'seeker-2', ['job-1', 'job-2'])
+    ], key=str)
+
+
+def test_worker_retries_failed_tasks(app, monkeypatch):
+    from app.services.match_queue import MatchQueue
+    from app.services.match_worker import MatchWorker
+    from app.services.matching_service import MatchingService
+
+    def fail(job_id):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(MatchingService, 'recompute_for_job', fail)
+    MatchQueue.enqueue_job('job-1')
+
+    assert MatchWorker.run_once() == 1
+    assert MatchQueue.backend().pending_count() == 1
+    assert MatchWorker.run_once() == 1
+    assert MatchQueue.backend().pending_count() == 0
+    assert MatchQueue.backend().failed[0]['error'] == 'boom'
+
+
+def test_worker_extracts_resumes_in_one_batch(app, monkeypatch):
+    from app.services.match_queue import MatchQueue
+    from app.services.match_worker import MatchWorker
+    from app.services.resume_parser import ResumeParser
+
+    batches = []
+
+    def extract(jobseeker_ids):
+        batches.append(sorted(jobseeker_ids))
+        return {jobseeker_id: 'unreadable' if jobseeker_id == 'seeker-2' else None for jobseeker_id in jobseeker_ids}
+
+    monkeypatch.setattr(ResumeParser, 'extract_for_jobseekers', extract)
+    MatchQueue.enqueue_resume('seeker-1')
+    MatchQueue.enqueue_resume('seeker-1')
+    MatchQueue.enqueue_resume('seeker-2')
+
+    assert MatchWorker.run_once() == 2
+    assert batches == [['seeker-1', 'seeker-2']]
+    assert MatchQueue.backend().pending_count() == 1  # seeker-2 is retried
+
+
+@pytest.fixture
+def mongo_queue():
+    import mongomock
+    from app.services.match_queue import MongoMatchQueue
+    return MongoMatchQueue(mongomock.MongoClient().db.match_tasks)
+
+
+def test_mongo_queue_coalesces_racing_enqueues(app, mongo_queue, monkeypatch):
+    from pymongo.errors import DuplicateKeyError
+
+    mongo_queue.enqueue({'kind': 'jobseeker', 'jobseeker_id': 'seeker-1', 'fields': ['skills']})
+
+    # Another process inserts the pending task between our match and our insert
+    update_one = mongo_queue.collection.update_one
+    def racing_update_one(query, update, upsert=False):
+        if upsert:
+            raise DuplicateKeyError('E11000 duplicate key error')
+        return update_one(query, update, upsert=upsert)
+    monkeypatch.setattr(mongo_queue.collection, 'update_one', racing_update_one)
+
+    mongo_queue.enqueue({'kind': 'jobseeker', 'jobseeker_id': 'seeker-1', 'fields': ['location']})
+    task = mongo_queue.collection.find_one()
+    assert mongo_queue.pending_count() == 1 and sorted(task['fields']) == ['location', 'skills']
+
+
+def test_mongo_queue_stamps_failed_tasks_for_expiry(app, mongo_queue):
+    mongo_queue.enqueue({'kind': 'job', 'job_id': 'job-1'})
+    task, = mongo_queue.claim('worker-1', 1, timeout=60)
+
+    mongo_queue.fail(task, 'boom', max_attempts=1)
+    failed = mongo_queue.collection.find_one()
+    assert failed['status'] == 'failed' and failed['failed_at'] and failed['error'] == 'boom'
+    assert mongo_queue.claim('worker-1', 1, timeout=60) == []
+
+
+def test_worker_survives_failure_of_task_re_enqueued_while_running(app, mongo_queue, monkeypatch):
+    """A failed task whose entity was enqueued again is merged into the pending task"""
+    from app.services.match_worker import MatchWorker
+
+    mongo_queue.collection.create_index(
+        [('kind', 1), ('jobseeker_id', 1), ('job_id', 1), ('status', 1)],
+        unique=True, partialFilterExpression={'status': 'pending'}
+    )
+    mongo_queue.enqueue({'kind': 'jobseeker', 'jobseeker_id': 'seeker-1', 'fields': ['skills']})
+    tasks = mongo_queue.claim('worker-1', 1, timeout=60)
+    mongo_queue.enqueue({'kind': 'jobseeker', 'jobseeker_id': 'seeker-1', 'fields': ['location']})
+
+    def fail(task):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(MatchWorker, '_process_entity_task', fail)
+
+    assert MatchWorker.process(mongo_queue, tasks) == 1
+    task, = mongo_queue.collection.find()
+    assert task['status'] == 'pending' and task['attempts'] == 0
+    assert sorted(task['fields']) == ['location', 'skills']
@@ -0,0 +1,443 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from bson.objectid import ObjectId
+from app import create_app
+
+SKILLS = ['React', 'JavaScript', 'HTML', 'CSS', 'Python', 'Django', 'PostgreSQL',
+          'Docker', 'Java', 'Spring Boot', 'MySQL', 'Kubernetes', 'AWS', 'Go']
+LOCATIONS = ['New York', 'San Francisco', 'London, UK', 'Berlin, Germany',
+             'Manchester, UK', 'Nairobi, Kenya', '']
+EDUCATION = ['High School', 'Certificate', 'Associate', 'Bachelor', 'Master', 'PhD', '']
+DESCRIPTIONS = [
+    'We are looking for a talented developer to join our team.',
+    'Requires 5+ years of experience and a bachelor degree.',
+    'Minimum 3 years experience, master preferred.',
+    'PhD in computer science and 10 years in the industry.',
+    'Join our innovative team building cutting-edge products.',
+    'High school diploma and 1 year experience with Python.',
+    ''
+]
+
+
+@pytest.fixture
+def matching_service():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        from app.services.matching_service import MatchingService
+        yield MatchingService
+
+
+def make_jobseeker(rng, i):
+    return {
+        'name': f'Jobseeker {i}',
+        'skills': rng.sample(SKILLS, rng.randint(0, 5)),
+        'resume_skills': rng.sample(SKILLS, rng.randint(0, 3)),
+        'experience': rng.randint(0, 15),
+        'education': rng.choice(EDUCATION),
+        'location': rng.choice(LOCATIONS),
+        'salary_expectation': rng.choice([
+            [], [0, 0],
+            [rng.randint(40000, 80000), rng.randint(80000, 150000)]
+        ]),
+        'profile_complete': rng.randint(0, 100),
+        'last_active': datetime.utcnow() - timedelta(days=rng.randint(0, 60))
+    }
+
+
+def make_job(rng):
+    return {
+        '_id': ObjectId(),
+        'title': rng.choice(['Frontend Developer', 'Backend Developer', 'Data Scientist', '']),
+        'description': rng.choice(DESCRIPTIONS),
+        'required_skills': rng.sample(SKILLS, rng.randint(0, 4)),
+        'preferred_skills': rng.sample(SKILLS, rng.randint(0, 3)),
+        'location': rng.choice(LOCATIONS),
+        'salary_range': rng.choice([
+            [0, 0], [50000, 50000],
+            [rng.randint(30000, 90000), rng.randint(90000, 160000)]
+        ]),
+        'remote': rng.choice([True, False])
+    }
+
+
+def test_batch_scores_match_pairwise(matching_service):
+    """Vectorized batch scoring gives the same results as the per-pair path"""
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(42)
+    jobs = [make_job(rng) for _ in range(60)]
+    jobseekers = [make_jobseeker(rng, i) for i in range(25)]
+    SemanticModel.fit(jobs, jobseekers)
+
+    for jobseeker in jobseekers:
+        batch = matching_service.calculate_matches_batch(jobseeker, jobs)
+        for job, (overall_score, breakdown) in zip(jobs, batch):
+            expected = matching_service._combine_scores(
+                matching_service._calculate_scores(jobseeker, job)
+            )
+            assert (overall_score, breakdown) == expected
+
+
+def test_jobseeker_batch_scores_match_pairwise(matching_service, monkeypatch):
+    """Scoring many jobseekers against a job gives the per-pair sub-scores, with one semantic call"""
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(7)
+    jobs = [make_job(rng) for _ in range(30)]
+    jobseekers = [make_jobseeker(rng, i) for i in range(40)]
+    SemanticModel.fit(jobs, jobseekers)
+
+    semantic_calls = []
+    score_jobseekers = SemanticModel.score_jobseekers.__func__
+    monkeypatch.setattr(SemanticModel, 'score_jobseekers', classmethod(
+        lambda cls, chunk, job: semantic_calls.append(len(chunk)) or score_jobseekers(cls, chunk, job)
+    ))
+
+    for job in jobs:
+        batch = matching_service._batch_jobseekers_component_scores(jobseekers, job)
+        for jobseeker, scores in zip(jobseekers, batch):
+            expected = matching_service._calculate_scores(jobseeker, job)
+            assert scores == pytest.approx(expected)
+            assert matching_service._combine_scores(scores) == matching_service._combine_scores(expected)
+    assert semantic_calls == [len(jobseekers)] * len(jobs)
+    assert matching_service._batch_jobseekers_component_scores([], jobs[0]) == []
+
+
+def test_batch_scores_empty(matching_service):
+    assert matching_service.calculate_matches_batch({'name': 'Nobody'}, []) == []
+
+
+def test_semantic_model_artifact_roundtrip(matching_service, tmp_path):
+    """A saved semantic model scores identically after loading"""
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(7)
+    jobs = [make_job(rng) for _ in range(20)]
+    jobseeker = make_jobseeker(rng, 0)
+    jobseeker['skills'] = ['Python', 'Docker']
+    SemanticModel.fit(jobs, [jobseeker])
+    expected = SemanticModel.score_jobs(jobseeker, jobs)
+
+    path = str(tmp_path / 'semantic_model.joblib')
+    SemanticModel.save(path)
+    SemanticModel.fit([], [])
+    assert SemanticModel.load(path)
+
+    assert SemanticModel.score_jobs(jobseeker, jobs).tolist() == expected.tolist()
+    assert max(expected) > 0
+
+
+def test_skill_index_candidates(matching_service):
+    """Candidates are jobs sharing a skill, ordered by overlap"""
+    import time
+    from app.services.skill_index import SkillIndex
+
+    SkillIndex._jobs_by_skill.clear()
+    SkillIndex._job_skills.clear()
+    SkillIndex._built_at = time.monotonic()
+
+    jobs = [
+        {'_id': 'a', 'required_skills': ['Python', 'Docker'], 'preferred_skills': ['AWS']},
+        {'_id': 'b', 'required_skills': ['python'], 'preferred_skills': []},
+        {'_id': 'c', 'required_skills': ['Java'], 'preferred_skills': ['Spring Boot']},
+    ]
+    for job in jobs:
+        SkillIndex.update_job(job)
+
+    assert SkillIndex.candidate_job_ids(['Python', 'AWS ']) == ['a', 'b']
+    assert SkillIndex.candidate_job_ids(['Python', 'AWS'], limit=1) == ['a']
+    assert SkillIndex.candidate_job_ids(['python'], exclude={'a'}) == ['b']
+
+    SkillIndex.update_job({'_id': 'b', 'required_skills': ['Go']})
+    SkillIndex.remove_job('a')
+    assert SkillIndex.candidate_job_ids(['Python']) == []
+
+
+def test_skill_normalization_is_shared(matching_service):
+    """The index and the stored requirements and features normalize skills alike"""
+    from app.services.skill_index import SkillIndex
+    from app.utils.job_requirements import derive_job_requirements
+    from app.utils.profile_features import derive_profile_features
+
+    skills = [' Python ', 'PYTHON', 'Spring Boot\n', '', '  ', None, 3]
+    assert SkillIndex.normalize(skills) == {'python', 'spring boot'}
+    assert derive_job_requirements({'required_skills': skills})['required_skills'] == ['python', 'spring boot']
+    assert derive_profile_features({'skills': skills})['skills'] == ['python', 'spring boot']
+
+    jobseeker = {'skills': ['Python ']}
+    job = {'required_skills': [' python'], 'preferred_skills': [], 'description': ''}
+    assert matching_service._calculate_skills_score(jobseeker, job) == 70
+
+
+def test_skill_index_rebuilds_in_background(matching_service, monkeypatch):
+    """A stale index keeps answering while it is rebuilt, and keeps updates made meanwhile"""
+    import threading
+    from collections import defaultdict
+    from app.models.job import Job
+    from app.models.user import User
+    from app.services.skill_index import SkillIndex
+
+    monkeypatch.setattr(SkillIndex, '_jobs_by_skill', defaultdict(set))
+    monkeypatch.setattr(SkillIndex, '_jobseekers_by_skill', defaultdict(set))
+    monkeypatch.setattr(SkillIndex, '_job_skills', {})
+    monkeypatch.setattr(SkillIndex, '_jobseeker_skills', {})
+    monkeypatch.setattr(SkillIndex, '_built_at', 0)
+    SkillIndex.update_job({'_id': 'old', 'required_skills': ['Python']})
+
+    scanning, release = threading.Event(), threading.Event()
+
+    class Collection:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def find(self, *args):
+            scanning.set()
+            release.wait(5)
+            return iter(self.docs)
+
+    monkeypatch.setattr(Job, 'collection', Collection([{'_id': 'scanned', 'required_skills': ['Python']}]))
+    monkeypatch.setattr(User, 'collection', Collection([]))
+
+    assert SkillIndex.candidate_job_ids(['python']) == ['old']
+    assert scanning.wait(5)
+    # Answered from the stale index while the scan is running
+    assert SkillIndex.candidate_job_ids(['python']) == ['old']
+    SkillIndex.update_job({'_id': 'new', 'required_skills': ['python']})
+    release.set()
+
+    for thread in threading.enumerate():
+        if thread.name == 'skill-index-rebuild':
+            thread.join(5)
+    assert sorted(SkillIndex.candidate_job_ids(['python'])) == ['new', 'scanned']
+    assert SkillIndex._built_at > 0 and not SkillIndex._rebuilding
+
+
+def test_partial_recompute_matches_full_recompute(matching_service):
+    """Recomputing only the components mapped to a changed field gives the full result"""
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(3)
+    jobs = [make_job(rng) for _ in range(30)]
+    jobseeker = make_jobseeker(rng, 0)
+    SemanticModel.fit(jobs, [jobseeker])
+    stored = [matching_service._calculate_scores(jobseeker, job) for job in jobs]
+
+    edits = {
+        'name': 'Python Developer',
+        'experience': 12,
+        'education': 'PhD',
+        'location': 'London, UK',
+        'salary_expectation': [90000, 120000],
+        'profile_complete': 100
+    }
+    for field, value in edits.items():
+        edited = dict(jobseeker, **{field: value})
+        components = matching_service.components_for_fields('jobseeker', [field])
+        for job, scores in zip(jobs, stored):
+            partial = dict(scores)
+            for component in components:
+                partial[component] = matching_service._calculate_scores(edited, job)[component]
+            assert partial == matching_service._calculate_scores(edited, job), field
+
+    job_edits = {
+        'title': 'Senior Python Engineer',
+        'description': 'Requires 7 years experience and a master degree.',
+        'location': 'Berlin, Germany',
+        'remote': True,
+        'salary_range': [60000, 70000]
+    }
+    for field, value in job_edits.items():
+        components = matching_service.components_for_fields('job', [field])
+        for job, scores in zip(jobs, stored):
+            edited = dict(job, **{field: value})
+            partial = dict(scores)
+            for component in components:
+                partial[component] = matching_service._calculate_scores(jobseeker, edited)[component]
+            assert partial == matching_service._calculate_scores(jobseeker, edited), field
+
+    assert matching_service.components_for_fields('jobseeker', ['skills']) is None
+    assert matching_service.components_for_fields('job', ['title']) == {'semantic'}
+    assert matching_service.components_for_fields('job', ['company_benefits']) == set()
+
+
+def test_streaming_top_k_matches_full_sort(matching_service, monkeypatch):
+    """The bounded heap keeps the same best candidates as sorting all of them"""
+    from flask import current_app
+
+    rng = random.Random(11)
+    jobseeker = dict(make_jobseeker(rng, 0), _id=ObjectId())
+    jobs = [make_job(rng) for _ in range(300)]
+    current_app.config['MATCH_SCORE_CHUNK_SIZE'] = 64
+
+    saved = []
+
+    def save_matches(results):
+        saved.extend(results)
+        return {}, {'inserted': len(results), 'modified': 0, 'unchanged': 0}
+
+    def score_chunk(chunk):
+        return [
+            matching_service._match_result(str(jobseeker['_id']), str(job['_id']), scores)
+            for job, scores in zip(chunk, matching_service._batch_component_scores(jobseeker, chunk))
+        ]
+
+    monkeypatch.setattr(matching_service, '_save_matches', save_matches)
+    top, counts = matching_service._score_candidates(iter(jobs), score_chunk, keep=25)
+
+    expected = sorted(saved, key=lambda result: result['overall_score'], reverse=True)[:25]
+    assert [result for _, result, _ in top] == expected
+    assert counts['inserted'] == len(saved) == len(jobs)
+
+
+def test_bulk_upsert_rewrites_changed_raw_scores(matching_service, monkeypatch):
+    """A change of the raw sub-scores is written even when the rounded breakdown is the same"""
+    import mongomock
+    from app.models.match import Match
+
+    monkeypatch.setattr(Match, 'collection', mongomock.MongoClient().db.matches)
+    scores = {factor: 50.0 for factor in matching_service.WEIGHTS}
+    result = matching_service._match_result('user-1', 'job-1', scores)
+
+    assert Match.bulk_upsert([result])[1]['inserted'] == 1
+    assert Match.bulk_upsert([result])[1] == {'inserted': 0, 'modified': 0, 'unchanged': 1}
+
+    changed = matching_service._match_result('user-1', 'job-1', dict(scores, skills=50.2))
+    assert changed['breakdown'] == result['breakdown']
+    assert Match.bulk_upsert([changed])[1]['modified'] == 1
+    assert Match.collection.find_one()['scores']['skills'] == 50.2
+
+
+def test_score_cache_memoizes_pure_components(matching_service, tmp_path, monkeypatch):
+    """Pure sub-scores are computed once per distinct input, in memory and across processes"""
+    from flask import current_app
+    from app.services.score_cache import ScoreCache
+
+    current_app.config['SCORE_CACHE_BACKEND'] = 'sqlite'
+    current_app.config['SCORE_CACHE_PATH'] = str(tmp_path / 'scores.sqlite3')
+    monkeypatch.setattr(ScoreCache, '_memory', None)
+    monkeypatch.setattr(ScoreCache, '_shared', None)
+
+    rng = random.Random(5)
+    jobseeker = make_jobseeker(rng, 0)
+    jobs = [make_job(rng) for _ in range(40)]
+    expected = [matching_service._calculate_scores(jobseeker, job) for job in jobs]
+
+    calls = []
+    original = matching_service._calculate_location_score.__func__
+    monkeypatch.setattr(matching_service, '_calculate_location_score',
+                        classmethod(lambda cls, *args: calls.append(args) or original(cls, *args)))
+
+    assert [matching_service._calculate_scores(jobseeker, job) for job in jobs] == expected
+    assert calls == []
+
+    # Another process only sees the shared file
+    ScoreCache._memory.clear()
+    assert [matching_service._calculate_scores(jobseeker, job) for job in jobs] == expected
+    assert calls == []
+    assert ScoreCache.stats()['shared']['hits'] > 0
+
+    matching_service._calculate_scores(dict(jobseeker, location='Lisbon, Portugal'), jobs[0])
+    assert len(calls) == 1
+
+
+def test_stored_job_requirements_score_like_parsing(matching_service):
+    """Requirements derived at write time give the scores of parsing on the fly"""
+    from app.utils.job_requirements import DERIVED_VERSION, derive_job_requirements
+
+    rng = random.Random(9)
+    jobs = [make_job(rng) for _ in range(40)]
+    jobseekers = [make_jobseeker(rng, i) for i in range(10)]
+    stored = [dict(job, derived=derive_job_requirements(job)) for job in jobs]
+    assert stored[0]['derived']['version'] == DERIVED_VERSION
+
+    for jobseeker in jobseekers:
+        assert matching_service.calculate_matches_batch(jobseeker, stored) == \
+            matching_service.calculate_matches_batch(jobseeker, jobs)
+        for job, stored_job in zip(jobs, stored):
+            assert matching_service._calculate_scores(jobseeker, stored_job) == \
+                matching_service._calculate_scores(jobseeker, job)
+
+    requirements = derive_job_requirements({'description': 'Requires 5+ years of experience and a Bachelor degree.',
+                                            'required_skills': ['Python', 'python', 'AWS']})
+    assert requirements['min_experience_years'] == 5
+    assert requirements['required_education_level'] == 60
+    assert requirements['required_skills'] == ['aws', 'python']
+    assert requirements['preferred_skills'] == []
+
+
+def test_stored_profile_features_score_like_raw_profiles(matching_service):
+    """Features stored at profile-update time give the scores of the raw profile"""
+    from app.services.semantic_model import SemanticModel
+    from app.utils.profile_features import derive_profile_features
+
+    rng = random.Random(13)
+    jobs = [make_job(rng) for _ in range(30)]
+    jobseekers = [make_jobseeker(rng, i) for i in range(15)]
+    SemanticModel.fit(jobs, jobseekers)
+    stored = [dict(jobseeker, features=derive_profile_features(jobseeker)) for jobseeker in jobseekers]
+
+    for _ in range(2):  # the second pass reuses the cached profile vectors
+        for jobseeker, stored_jobseeker in zip(jobseekers, stored):
+            assert matching_service.calculate_matches_batch(stored_jobseeker, jobs) == \
+                matching_service.calculate_matches_batch(jobseeker, jobs)
+            for job in jobs[:5]:
+                assert matching_service._calculate_scores(stored_jobseeker, job) == \
+                    matching_service._calculate_scores(jobseeker, job)
+
+    assert SemanticModel.score_jobseekers(stored, jobs[0]).tolist() == \
+        SemanticModel.score_jobseekers(jobseekers, jobs[0]).tolist()
+    assert SemanticModel._jobseeker_vectors.stats()['hits'] > 0
+
+
+def test_empty_semantic_model_is_not_persisted(matching_service, tmp_path, monkeypatch):
+    """Without a corpus nothing is saved and the model is fitted once jobs exist"""
+    from app.services.semantic_model import SemanticModel
+
+    path = str(tmp_path / 'semantic_model.joblib')
+    SemanticModel.fit([], [])
+    assert SemanticModel.save(path) is None
+    assert not SemanticModel.load(path)
+
+    rng = random.Random(17)
+    jobs = [make_job(rng) for _ in range(5)]
+    jobseeker = make_jobseeker(rng, 0)
+    original_fit = SemanticModel.fit.__func__
+
+    def fit_corpus(cls, *args):
+        # Stands in for fitting over the jobs now in the database
+        return original_fit(cls, jobs, [jobseeker])
+
+    monkeypatch.setattr(SemanticModel, 'fit', classmethod(fit_corpus))
+    monkeypatch.setattr(SemanticModel, 'save', classmethod(lambda cls, path=None: None))
+    assert SemanticModel.score_jobs(jobseeker, jobs).tolist() == [50.0] * 5
+
+    SemanticModel.update_job(jobs[0])
+    assert SemanticModel.score_jobs(jobseeker, jobs).tolist() != [50.0] * 5
+
+
+def test_job_vectors_are_replaced_and_compacted(matching_service, monkeypatch):
+    """Updated jobs do not grow the job matrix without bound and score like a fresh vectorization"""
+    from app.services.semantic_model import SemanticModel
+
+    rng = random.Random(19)
+    jobs = [make_job(rng) for _ in range(20)]
+    jobseeker = make_jobseeker(rng, 0)
+    SemanticModel.fit(jobs, [jobseeker])
+    monkeypatch.setattr(SemanticModel, 'PENDING_ROWS', 8)
+
+    for i in range(50):
+        job = jobs[i % len(jobs)]
+        job.update(description=rng.choice(DESCRIPTIONS), updated_at=datetime(2024, 1, 1) + timedelta(minutes=i))
+        SemanticModel.update_job(job)
+        rows = SemanticModel._job_matrix.shape[0]
+        if SemanticModel._pending_matrix is not None:
+            rows += SemanticModel._pending_matrix.shape[0]
+        assert rows < len(jobs) + 8
+
+    anonymous = {key: value for key, value in jobs[0].items() if key != '_id'}
+    expected = SemanticModel._vectorizer.transform([SemanticModel.job_text(job) for job in jobs + [anonymous]])
+    actual = SemanticModel._job_vectors(jobs + [anonymous])
+    assert abs(actual - expected).max() < 1e-12
+    assert len(SemanticModel._job_rows) == len(jobs)
@@ -0,0 +1,48 @@
+import pytest
+from app import create_app
+from app.utils.metrics import registry, stage
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.debug = True  # /metrics without a token
+    registry.clear()
+    with app.app_context():
+        yield app.test_client()
+
+
+def test_requests_get_server_timing_and_metrics(client):
+    client.application.config['SERVER_TIMING_ENABLED'] = True
+    response = client.get('/')
+    assert response.headers['Server-Timing'].startswith('app;dur=')
+    assert 'db;dur=0.0;desc="0 commands"' in response.headers['Server-Timing']
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'smartmatch_http_requests_total{endpoint="home",method="GET",status="200"} 1' in body
+    assert 'smartmatch_http_request_seconds_bucket{endpoint="home",le="+Inf"} 1' in body
+    assert 'smartmatch_request_mongo_commands_count{endpoint="home"} 1' in body
+
+
+def test_stage_timings_are_summed(client):
+    for _ in range(3):
+        with stage('score.skills'):
+            pass
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE smartmatch_stage_seconds summary' in body
+    assert 'smartmatch_stage_seconds_count{stage="score.skills"} 3' in body
+
+
+def test_metrics_token(client):
+    client.application.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+def test_production_defaults_expose_nothing(client, monkeypatch):
+    monkeypatch.delenv('FLASK_ENV', raising=False)
+    client.application.debug = False
+    assert 'Server-Timing' not in client.get('/').headers
+    assert client.get('/metrics').status_code == 403
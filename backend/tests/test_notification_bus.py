@@ -0,0 +1,23 @@
+from app.services.notification_bus import InMemoryNotificationBus
+
+
+def test_bus_delivers_to_recipient_and_cuts_off_slow_clients():
+    bus = InMemoryNotificationBus()
+    fast = bus.subscribe('user-1', max_queue=10)
+    slow = bus.subscribe('user-1', max_queue=1)
+    other = bus.subscribe('user-2', max_queue=10)
+
+    assert bus.publish('user-1', {'title': 'first'}) == 2
+    bus.publish('user-1', {'title': 'second'})
+
+    assert fast.get(timeout=0)['title'] == 'first'
+    assert fast.get(timeout=0)['title'] == 'second'
+    assert other.get(timeout=0) is None
+
+    # The slow client kept what fitted and is flagged to reconnect and resume
+    assert slow.overflowed and not fast.overflowed
+    assert slow.get(timeout=0)['title'] == 'first'
+
+    for subscription in (fast, slow, other):
+        bus.unsubscribe(subscription)
+    assert bus.subscriber_count() == 0
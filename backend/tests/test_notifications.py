@@ -0,0 +1,120 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def notification(monkeypatch):
+    import mongomock
+    app = create_app()
+    with app.app_context():
+        from app.models.notification import Notification
+
+        db = mongomock.MongoClient().db
+        monkeypatch.setattr(Notification, 'collection', db.notifications)
+        monkeypatch.setattr(Notification, 'counters', db.notification_counters)
+        yield Notification
+
+
+def stored_unread(notification, recipient_id):
+    return notification.counters.find_one({'_id': recipient_id})['unread']
+
+
+def seed_uncounted(notification, recipient_id, unread, read=0):
+    # Notifications written before the counters existed
+    notification.collection.insert_many(
+        [{'recipient_id': recipient_id, 'read': False} for _ in range(unread)] +
+        [{'recipient_id': recipient_id, 'read': True} for _ in range(read)]
+    )
+
+
+def test_create_seeds_counter_from_existing_notifications(notification):
+    seed_uncounted(notification, 'user-1', 3, read=2)
+
+    notification.create({'recipient_id': 'user-1', 'title': 'New match'})
+    assert stored_unread(notification, 'user-1') == 4
+    notification.create({'recipient_id': 'user-1', 'title': 'Another match'})
+    assert notification.get_unread_count('user-1') == 5
+
+
+def test_create_many_counts_each_recipient(notification):
+    seed_uncounted(notification, 'user-1', 2)
+
+    notification.create_many([
+        {'recipient_id': 'user-1', 'title': 'a'},
+        {'recipient_id': 'user-2', 'title': 'b'},
+        {'recipient_id': 'user-2', 'title': 'c'},
+        {'recipient_id': 'user-3', 'title': 'd', 'read': True}
+    ])
+    assert stored_unread(notification, 'user-1') == 3
+    assert stored_unread(notification, 'user-2') == 2
+    assert notification.counters.find_one({'_id': 'user-3'}) is None
+    assert notification.get_unread_count('user-3') == 0
+
+
+def test_mark_as_read_seeds_before_decrementing(notification):
+    seed_uncounted(notification, 'user-1', 3)
+    notification_id = str(notification.collection.find_one()['_id'])
+
+    assert notification.mark_as_read(notification_id)
+    assert stored_unread(notification, 'user-1') == 2
+    # Already read: no change
+    assert notification.mark_as_read(notification_id)
+    assert notification.get_unread_count('user-1') == 2
+    assert not notification.mark_as_read('0' * 24)
+
+
+def test_mark_all_as_read_seeds_before_decrementing(notification):
+    seed_uncounted(notification, 'user-1', 4, read=1)
+
+    assert notification.mark_all_as_read('user-1') == 4
+    assert stored_unread(notification, 'user-1') == 0
+    assert notification.mark_all_as_read('user-1') == 0
+    assert notification.get_unread_count('user-1') == 0
+
+
+def test_reconcile_repairs_drifted_counters(notification):
+    notification.create_many([{'recipient_id': 'user-1'}, {'recipient_id': 'user-1'}, {'recipient_id': 'user-2'}])
+    notification.counters.update_one({'_id': 'user-1'}, {'$set': {'unread': 7}})
+    notification.counters.insert_one({'_id': 'user-3', 'unread': 2})
+
+    assert notification.reconcile_counters() == 2
+    assert [notification.get_unread_count(user) for user in ('user-1', 'user-2', 'user-3')] == [2, 1, 0]
+    assert notification.reconcile_counters() == 0
+
+
+@pytest.fixture
+def stream(notification):
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+
+    app = current_app._get_current_object()
+    app.config.update(TESTING=True, NOTIFICATION_STREAM_HEARTBEAT=0.01, NOTIFICATION_STREAM_MAX_AGE=0.05)
+    client = app.test_client()
+
+    def get(user_id=None, token=None, **kwargs):
+        if token is None and user_id:
+            token = create_access_token(identity=user_id)
+        query = f'?jwt={token}' if token else ''
+        response = client.get(f'/api/notifications/stream{query}', **kwargs)
+        return response, response.get_data(as_text=True)
+    return get
+
+
+def test_stream_rejects_missing_and_invalid_tokens(stream):
+    assert stream()[0].status_code == 401
+    assert stream(token='not-a-jwt')[0].status_code == 422
+
+
+def test_stream_replays_notifications_after_last_event_id(notification, stream):
+    first, second, third = (notification.create({'recipient_id': 'user-1', 'title': title})
+                            for title in ('first', 'second', 'third'))
+    notification.create({'recipient_id': 'user-2', 'title': 'other'})
+
+    response, body = stream('user-1', headers={'Last-Event-ID': first})
+    assert response.status_code == 200 and response.mimetype == 'text/event-stream'
+    assert f'id: {first}' not in body
+    assert body.index(f'id: {second}') < body.index(f'id: {third}')
+    assert '"other"' not in body
+    assert ': heartbeat' in body
+
+    assert stream('user-1', headers={'Last-Event-ID': 'bogus'})[0].status_code == 400
@@ -0,0 +1,30 @@
+import base64
+from datetime import datetime
+from bson import ObjectId, json_util
+from app.utils.pagination import after_cursor, decode_cursor, encode_cursor, is_valid_cursor, next_cursor
+
+
+def test_cursor_round_trip_and_query():
+    doc = {'_id': ObjectId(), 'created_at': datetime(2024, 5, 1, 12, 30)}
+    token = encode_cursor(doc, 'created_at')
+
+    assert decode_cursor(token, 'created_at') == [doc['created_at'], doc['_id']]
+    assert after_cursor({'active': True}, token, 'created_at') == {'$and': [
+        {'active': True},
+        {'$or': [
+            {'created_at': {'$lt': doc['created_at']}},
+            {'created_at': doc['created_at'], '_id': {'$lt': doc['_id']}}
+        ]}
+    ]}
+    assert next_cursor([doc], 2, 'created_at') is None
+    assert next_cursor([doc, doc], 2, 'created_at') is not None
+
+
+def test_cursor_rejects_tampered_tokens():
+    """Cursor values are never allowed to smuggle query operators"""
+    injected = json_util.dumps([{'$ne': None}, ObjectId()])
+    token = base64.urlsafe_b64encode(injected.encode()).decode()
+
+    assert not is_valid_cursor(token, 'created_at')
+    assert not is_valid_cursor('not-a-cursor', 'created_at')
+    assert not is_valid_cursor(encode_cursor({'_id': ObjectId()}, '_id'), 'created_at')
@@ -0,0 +1,60 @@
+import pytest
+from app import create_app
+from app.utils.profile_features import derive_profile_features
+
+
+@pytest.fixture
+def matching_service():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        from app.services.matching_service import MatchingService
+        yield MatchingService
+
+
+def test_features_of_a_well_formed_profile():
+    features = derive_profile_features({
+        'skills': ['Python', 'AWS'], 'resume_skills': ['python', 'Docker'], 'experience': 4,
+        'education': "Bachelor's degree", 'location': 'Berlin, Germany', 'salary_expectation': [50000, 70000]
+    })
+    assert features['skills'] == ['aws', 'docker', 'python']
+    assert features['experience_years'] == 4.0
+    assert features['education_level'] == 60
+    assert features['location'] == 'berlin, germany'
+    assert features['salary_bounds'] == [50000.0, 70000.0]
+
+
+@pytest.mark.parametrize('profile, expected', [
+    ({'experience': '3 years'}, {'experience_years': 0.0}),
+    ({'experience': '3'}, {'experience_years': 3.0}),
+    ({'experience': [{'title': 'Developer'}]}, {'experience_years': 0.0}),
+    ({'experience': 'nan'}, {'experience_years': 0.0}),
+    ({'education': ['BSc', {'school': 'MIT'}]}, {'education_level': 0}),
+    ({'education': ['Master of Science']}, {'education_level': 80}),
+    ({'education': None, 'location': 42}, {'education_level': 0, 'location': ''}),
+    ({'skills': 'python'}, {'skills': ['python']}),
+    ({'skills': ['Go', 7, None], 'resume_skills': {'a': 1}}, {'skills': ['go']}),
+    ({'salary_expectation': '50000'}, {'salary_bounds': [50000.0, 50000.0]}),
+    ({'salary_expectation': ['40000', 'lots']}, {'salary_bounds': [40000.0, 0.0]}),
+    ({'salary_expectation': [60000]}, {'salary_bounds': None}),
+    ({'salary_expectation': 'negotiable'}, {'salary_bounds': None}),
+    ({'name': ['A'], 'resume_text': 12}, {}),
+])
+def test_features_of_malformed_profiles(profile, expected):
+    features = derive_profile_features(profile)
+    for field, value in expected.items():
+        assert features[field] == value
+
+
+def test_malformed_profiles_can_be_scored(matching_service):
+    from app.services.semantic_model import SemanticModel
+
+    job = {'_id': 'job-1', 'title': 'Developer', 'description': 'Requires 3+ years and a bachelor degree.',
+           'required_skills': ['Python'], 'location': 'Berlin', 'salary_range': [50000, 60000]}
+    jobseeker = {'skills': 'python', 'experience': '3 years', 'education': ['BSc'],
+                 'salary_expectation': '50000', 'location': None}
+    SemanticModel.fit([job], [jobseeker])
+
+    scores = matching_service._calculate_scores(jobseeker, job)
+    assert scores['skills'] == 70
+    assert matching_service.calculate_matches_batch(jobseeker, [job])[0] == matching_service._combine_scores(scores)
@@ -0,0 +1,101 @@
+import os
+import shutil
+import pytest
+from app.utils.resume_text import extract_text, UnsupportedResumeFormat
+from app.utils.helpers import extract_skills_from_text
+
+
+def test_extracts_text_and_skills(tmp_path):
+    resume = tmp_path / 'cv.txt'
+    resume.write_text('Senior engineer: Python, Django and Docker on AWS.')
+
+    text = extract_text(str(resume))
+    assert sorted(extract_skills_from_text(text)) == ['Aws', 'Django', 'Docker', 'Python']
+
+
+def test_unknown_format_is_unsupported(tmp_path):
+    resume = tmp_path / 'cv.odt'
+    resume.write_bytes(b'binary')
+
+    with pytest.raises(UnsupportedResumeFormat):
+        extract_text(str(resume))
+
+
+def test_extracts_pdf():
+    pytest.importorskip('pypdf')
+    text = extract_text(os.path.join(os.path.dirname(__file__), '..', 'Mercy_CV.pdf'))
+    assert {'React', 'Html', 'Css'} <= set(extract_skills_from_text(text))
+
+
+def test_missing_parser_is_not_cached(tmp_path, monkeypatch):
+    """A PDF parsed while pypdf is missing is parsed again once it is installed"""
+    pypdf = pytest.importorskip('pypdf')
+    import mongomock
+    from concurrent.futures import ThreadPoolExecutor
+    from app import create_app
+    from app.utils import resume_text
+
+    app = create_app()
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'Mercy_CV.pdf'), tmp_path / 'cv.pdf')
+
+    with app.app_context():
+        from app.models.user import User
+        from app.models.resume_extraction import ResumeExtraction
+        from app.services.matching_service import MatchingService
+        from app.services.resume_parser import ResumeParser
+
+        db = mongomock.MongoClient().db
+        monkeypatch.setattr(User, 'collection', db.users)
+        monkeypatch.setattr(ResumeExtraction, 'collection', db.resume_extractions)
+        monkeypatch.setattr(MatchingService, 'jobseeker_changed', lambda jobseeker_id, fields: None)
+        # Threads, so the patched parser is seen by the extraction
+        monkeypatch.setattr(ResumeParser, 'pool', classmethod(lambda cls: ThreadPoolExecutor(1)))
+        jobseeker_id = str(db.users.insert_one({'role': 'jobseeker', 'resume_url': 'cv.pdf'}).inserted_id)
+
+        monkeypatch.setattr(resume_text, 'PdfReader', None)
+        assert ResumeParser.extract_for_jobseekers([jobseeker_id]) == {jobseeker_id: None}
+        assert db.resume_extractions.count_documents({}) == 0
+
+        monkeypatch.setattr(resume_text, 'PdfReader', pypdf.PdfReader)
+        assert ResumeParser.extract_for_jobseekers([jobseeker_id]) == {jobseeker_id: None}
+        assert 'React' in User.find_by_id(jobseeker_id)['resume_skills']
+        assert db.resume_extractions.find_one()['error'] is None
+
+
+def hang(full_path):
+    import time
+    time.sleep(60)
+
+
+def test_timed_out_parse_recycles_the_pool(tmp_path, monkeypatch):
+    """A parse stuck past the timeout does not keep a worker of the pool busy"""
+    import mongomock
+    from app import create_app
+    from app.services import resume_parser
+
+    app = create_app()
+    app.config.update(UPLOAD_FOLDER=str(tmp_path), RESUME_PARSE_TIMEOUT=1, RESUME_PARSER_PROCESSES=1)
+    (tmp_path / 'cv.txt').write_text('Python')
+
+    with app.app_context():
+        from app.models.user import User
+        from app.models.resume_extraction import ResumeExtraction
+        ResumeParser = resume_parser.ResumeParser
+
+        db = mongomock.MongoClient().db
+        monkeypatch.setattr(User, 'collection', db.users)
+        monkeypatch.setattr(ResumeExtraction, 'collection', db.resume_extractions)
+        monkeypatch.setattr(resume_parser, 'extract_text', hang)
+        jobseeker_id = str(db.users.insert_one({'role': 'jobseeker', 'resume_url': 'cv.txt'}).inserted_id)
+
+        ResumeParser.pool().submit(str).result()  # start the worker
+        processes = list(ResumeParser.pool()._processes.values())
+        errors = ResumeParser.extract_for_jobseekers([jobseeker_id])
+        assert 'timed out' in errors[jobseeker_id]
+        assert db.resume_extractions.count_documents({}) == 0
+
+        assert ResumeParser._pool is None
+        for process in processes:
+            process.join(timeout=5)
+            assert not process.is_alive()
@@ -0,0 +1,32 @@
+# backend/worker.py
+import argparse
+import multiprocessing
+import os
+import socket
+from app import create_app
+
+def run_worker(index):
+    # Each process builds its own app so it gets its own MongoDB connection
+    app = create_app()
+    
+    with app.app_context():
+        from app.services.match_worker import MatchWorker
+        MatchWorker.run_forever(f'{socket.gethostname()}-{os.getpid()}-{index}')
+
+if __name__ == '__main__':
+    app = create_app()
+    parser = argparse.ArgumentParser(description='Background match precomputation worker')
+    parser.add_argument('--processes', type=int, default=app.config['MATCH_WORKER_PROCESSES'])
+    args = parser.parse_args()
+    
+    if app.config['MATCH_QUEUE_BACKEND'] != 'mongo':
+        raise SystemExit('The worker needs MATCH_QUEUE_BACKEND=mongo to share tasks with the API')
+    
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=run_worker, args=(i,)) for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    
+    print(f"Started {len(processes)} match worker process(es)")
+    for process in processes:
+        process.join()